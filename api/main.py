@@ -8,6 +8,7 @@ from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
+import asyncio
 import json
 import os
 import hashlib
@@ -15,6 +16,9 @@ import sqlite3
 from datetime import datetime
 from contextlib import contextmanager
 
+# RAG 인덱스 단일 쓰기: 기본 역할은 reader, API 프로세스만 writer로 동작
+os.environ.setdefault("RAG_INDEX_ROLE", "writer")
+
 # Initialize FastAPI
 app = FastAPI(
     title="Young & Home API",
@@ -72,6 +76,16 @@ def init_db():
             status TEXT
         )
         """)
+        
+        # 4. Digest Log Table (구독자별 발송한 매물 - 신규 매물 판별용)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS digest_log (
+            user_id TEXT,
+            listing_id TEXT,
+            sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, listing_id)
+        )
+        """)
         conn.commit()
 
 # Initialize DB on startup
@@ -109,6 +123,19 @@ class RAGUpsertRequest(BaseModel):
     content: str
     url: Optional[str] = None
 
+class RAGBatchUpsertRequest(BaseModel):
+    items: List[RAGUpsertRequest]
+
+class RAGSearchRequest(BaseModel):
+    query: str
+    n_results: int = 3
+    filters: Optional[Dict[str, Any]] = None
+
+class LegalConsultRequest(BaseModel):
+    question: str
+    language: str = "KO"
+    include_full_law: bool = False
+
 class SubscriptionRequest(BaseModel):
     user_id: str
     location: str
@@ -124,12 +151,46 @@ class NotifyRequest(BaseModel):
 # ===== Helper Functions =====
 
 def load_houses():
-    """매물 데이터 로드"""
-    try:
-        with open("data/housing/houses.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return []
+    """매물 데이터 로드 (불변 레코드, 프로세스 공용 캐시)"""
+    from src.housing.listings import load_listings
+    return load_listings()
+
+_chunker = None
+
+def get_chunker():
+    """공고 분할기 (RAG_CHUNK_STRATEGY=section|window|none, RAG_CHUNK_MAX_TOKENS, RAG_CHUNK_OVERLAP)"""
+    global _chunker
+    if _chunker is None:
+        from src.rag.chunker import TextChunker
+        
+        _chunker = TextChunker(
+            strategy=os.getenv("RAG_CHUNK_STRATEGY", "section"),
+            max_tokens=int(os.getenv("RAG_CHUNK_MAX_TOKENS", "128")),
+            overlap=int(os.getenv("RAG_CHUNK_OVERLAP", "24"))
+        )
+    return _chunker
+
+def announcement_to_chunks(request: RAGUpsertRequest):
+    """
+    공고 요청 -> (청크 id, 청크 텍스트, 메타데이터)
+    
+    긴 공고는 임베딩 모델 입력 길이에서 잘리므로 섹션/토큰 윈도우 단위로 나누고,
+    제목/유형/지역은 모든 청크 앞에 붙인다.
+    """
+    from src.rag.loader import open_eligibility_metadata
+    
+    metadata = {
+        "id": request.id,
+        "name": request.title,
+        "provider": request.provider,
+        "category": request.type,
+        "url": request.url or "",
+        # 공고에는 자격 정보가 없으므로 자격 필터에서 제외되지 않도록 개방형 조건 부여
+        **open_eligibility_metadata(),
+        "amount": "상세내용 확인 필요"
+    }
+    header = f"{request.title}\n{request.type}\n{request.location}"
+    return get_chunker().chunk_document(request.id, request.content, metadata, header=header)
 
 def compute_registry_hash(data: dict) -> str:
     """등기 데이터 해시 계산"""
@@ -147,8 +208,12 @@ async def root():
             "/api/monitoring/check",
             "/api/monitoring/alert",
             "/api/rag/upsert",
+            "/api/rag/upsert/batch",
+            "/api/rag/sync",
+            "/api/rag/search",
             "/api/subscription/create",
-            "/api/notify/user"
+            "/api/notify/user",
+            "/api/legal/consult/stream"
         ]
     }
 
@@ -243,32 +308,25 @@ async def monitoring_alert(request: MonitoringAlertRequest, background_tasks: Ba
 async def rag_upsert(request: RAGUpsertRequest):
     """
     공고 데이터를 VectorDB에 저장
+    
+    인덱스 쓰기는 API 프로세스가 담당 (Streamlit은 RAG_INDEX_ROLE=reader로 읽기만)
     """
-    from src.rag.retriever import BenefitRetriever
+    from src.rag.retriever import get_retriever
     
     try:
-        doc_content = f"{request.title}\n{request.type}\n{request.location}\n{request.content}"
-        retriever = BenefitRetriever()
+        retriever = get_retriever(role="writer")
         
         if retriever.collection is not None:
-            embedding = retriever._get_embedding(doc_content)
-            
-            retriever.collection.upsert(
-                ids=[request.id],
-                embeddings=[embedding],
-                metadatas=[{
-                    "id": request.id,
-                    "name": request.title,
-                    "provider": request.provider,
-                    "category": request.type,
-                    "url": request.url or ""
-                }],
-                documents=[doc_content]
+            ids, contents, metadatas = announcement_to_chunks(request)
+            # 쓰기 스레드에서 처리 (이벤트 루프/검색을 막지 않음)
+            await asyncio.wrap_future(
+                retriever.write_queue.submit(retriever.upsert_chunks, ids, contents, metadatas)
             )
             
             return {
                 "success": True,
                 "id": request.id,
+                "chunks": len(ids),
                 "message": "Document upserted to VectorDB"
             }
         else:
@@ -278,6 +336,106 @@ async def rag_upsert(request: RAGUpsertRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/rag/upsert/batch")
+async def rag_upsert_batch(request: RAGBatchUpsertRequest):
+    """
+    공고 데이터 일괄 저장 (배치 임베딩 + 단일 upsert)
+    
+    크롤러가 수집한 공고를 한 번의 요청으로 적재
+    """
+    from src.rag.retriever import get_retriever
+    
+    try:
+        retriever = get_retriever(role="writer")
+        
+        if retriever.collection is None:
+            return {"success": False, "message": "VectorDB not available"}
+        
+        # 같은 배치 안에서 id가 중복되면 마지막 항목 기준
+        items = {item.id: item for item in request.items}
+        ids, contents, metadatas = [], [], []
+        for item in items.values():
+            chunk_ids, chunk_contents, chunk_metadatas = announcement_to_chunks(item)
+            ids += chunk_ids
+            contents += chunk_contents
+            metadatas += chunk_metadatas
+        
+        # 모든 공고의 청크를 한 번에 임베딩 (쓰기 스레드에서 처리)
+        chunks = await asyncio.wrap_future(
+            retriever.write_queue.submit(retriever.upsert_chunks, ids, contents, metadatas)
+        )
+        
+        return {
+            "success": True,
+            "count": len(items),
+            "chunks": chunks,
+            "ids": list(items.keys()),
+            "message": f"{len(items)} documents upserted to VectorDB"
+        }
+            
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/rag/sync")
+async def rag_sync():
+    """
+    benefits.json 변경분을 VectorDB에 반영 (추가/변경/삭제된 혜택만)
+    """
+    from src.rag.retriever import get_retriever
+    
+    try:
+        retriever = get_retriever(role="writer")
+        
+        if retriever.collection is None:
+            return {"success": False, "message": "VectorDB not available"}
+        
+        stats = await asyncio.wrap_future(retriever.write_queue.submit(retriever.sync))
+        return {"success": True, **stats}
+            
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# 동시 검색 요청을 모아 encode 1회로 처리하는 배처 (첫 요청 시 생성)
+_rag_batcher = None
+
+def get_rag_batcher():
+    global _rag_batcher
+    if _rag_batcher is None:
+        from src.rag.batcher import QueryMicroBatcher
+        from src.rag.retriever import get_retriever
+        
+        _rag_batcher = QueryMicroBatcher(
+            get_retriever(role="writer").search_many,
+            max_batch_size=int(os.getenv("RAG_BATCH_MAX_SIZE", "32")),
+            max_wait_ms=float(os.getenv("RAG_BATCH_MAX_WAIT_MS", "5"))
+        )
+    return _rag_batcher
+
+
+@app.post("/api/rag/search")
+async def rag_search(request: RAGSearchRequest):
+    """
+    혜택/공고 검색 (마이크로 배치)
+    
+    동시에 들어온 요청은 최대 RAG_BATCH_MAX_WAIT_MS 동안 모아서 한 번에 임베딩·검색
+    """
+    try:
+        results = await get_rag_batcher().search(
+            request.query,
+            n_results=request.n_results,
+            filters=request.filters
+        )
+        return {
+            "query": request.query,
+            "total": len(results),
+            "results": results
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ----- 시나리오 3: 매물 알림 -----
 
 @app.get("/api/listings")
@@ -290,13 +448,13 @@ async def get_listings(
     filtered = []
     
     for h in houses:
-        if location and location not in h.get("address", "") and location not in h.get("location", ""):
+        if location and location not in h.address and location not in h.location:
             continue
-        if max_deposit and h.get("deposit", 0) > max_deposit:
+        if max_deposit and h.deposit > max_deposit:
             continue
-        if max_monthly and h.get("monthly", 0) > max_monthly:
+        if max_monthly and h.monthly > max_monthly:
             continue
-        filtered.append(h)
+        filtered.append(h.to_dict())
     
     return {
         "total": len(filtered),
@@ -365,9 +523,60 @@ async def notify_user(request: NotifyRequest):
     return {"success": True, "message": "Notification logged"}
 
 
+# ----- 법률 상담 -----
+
+@app.post("/api/legal/consult/stream")
+async def legal_consult_stream(request: LegalConsultRequest):
+    """
+    법률 상담 스트리밍 (Server-Sent Events)
+    
+    답변 조각마다 `data: {"delta": "..."}` 이벤트를 보내고,
+    끝나면 `event: done`, 실패하면 `event: error` 이벤트를 보낸다.
+    """
+    from fastapi.responses import StreamingResponse
+    from src.agents.legal import LegalAdvisorAgent
+    
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise HTTPException(status_code=503, detail="OPENAI_API_KEY is not configured")
+    agent = LegalAdvisorAgent(openai_api_key=api_key)
+    
+    def events():
+        # 동기 제너레이터 - Starlette가 스레드풀에서 순회하므로 이벤트 루프를 막지 않음
+        try:
+            for delta in agent.consult_stream(
+                request.question,
+                language=request.language,
+                include_full_law=request.include_full_law
+            ):
+                yield f"data: {json.dumps({'delta': delta}, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)}, ensure_ascii=False)}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    from src.rag.retriever import registry_status
+    from src.rag.model_holder import budget_stats
+    from src.legal.answer_cache import get_answer_cache
+    from src.legal.corpus import legal_corpus_stats
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "rag": registry_status(),
+        "rag_models": budget_stats(),
+        "rag_batcher": _rag_batcher.stats() if _rag_batcher else None,
+        "legal_answer_cache": get_answer_cache().stats(),
+        "legal_corpus": legal_corpus_stats()
+    }
 
 
 @app.get("/api/alerts")
@@ -452,6 +661,74 @@ async def run_monitoring_agent(background_tasks: BackgroundTasks):
     return {"status": "started", "message": "Monitoring agent started in background"}
 
 
+@app.post("/api/agent/alert/run")
+async def run_alert_agent(background_tasks: BackgroundTasks, top_k: int = 5):
+    """
+    [Super Agent] 맞춤 매물 알림 에이전트 (n8n 30분 주기)
+    
+    구독 목록, 발송 이력, 매물 인벤토리를 한 번씩만 읽고
+    전체 구독자의 top-k 신규 매물을 한 번에 계산
+    
+    다이제스트는 모니터링 알림과 같은 alerts 테이블로 전달하고 (/api/alerts),
+    전달과 발송 이력(digest_log) 기록을 한 트랜잭션으로 처리한다.
+    """
+    if top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1")
+    
+    def _digest_and_notify():
+        try:
+            from src.housing.digest import SubscriptionDigest
+            
+            with get_db() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT * FROM subscriptions")
+                subs = [dict(row) for row in cursor.fetchall()]
+                
+                cursor.execute("SELECT user_id, listing_id FROM digest_log")
+                sent = {}
+                for row in cursor.fetchall():
+                    sent.setdefault(row["user_id"], set()).add(row["listing_id"])
+
+            if not subs:
+                print("[SuperAgent] No subscriptions found.")
+                return
+            
+            digest = SubscriptionDigest(load_houses(), top_k=top_k)
+            digests = digest.build(subs, sent=sent)
+            
+            for user_id, picks in digests.items():
+                names = ", ".join(h["name"] for h in picks)
+                print(f"[SuperAgent] Digest to {user_id}: {len(picks)} new listings ({names})")
+            
+            # 전달(alerts)에 성공한 매물만 발송 이력에 남김 - 실패하면 둘 다 롤백되어 다음 주기에 다시 후보가 됨
+            locations = {sub["user_id"]: sub.get("location") or "" for sub in subs}
+            with get_db() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO alerts (user_id, address, change_type, details, risk_score, status)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (user_id, locations.get(user_id, ""), "listing_digest",
+                         json.dumps(picks, ensure_ascii=False, default=str), None, "sent")
+                        for user_id, picks in digests.items()
+                    ]
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO digest_log (user_id, listing_id) VALUES (?, ?)",
+                    [(user_id, str(h["id"])) for user_id, picks in digests.items() for h in picks]
+                )
+                conn.commit()
+            
+            print(f"[SuperAgent] Digest finished. {len(digests)}/{len(subs)} users notified.")
+            
+        except Exception as e:
+            print(f"[SuperAgent] Digest failed: {e}")
+
+    background_tasks.add_task(_digest_and_notify)
+    return {"status": "started", "message": "Alert digest agent started in background"}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,42 @@
+"""
+Benchmark Helpers - 벤치마크 스크립트 공용 측정 함수
+"""
+
+import multiprocessing
+import resource
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    return float(np.percentile(values, q)) if values else None
+
+
+def latency_summary(latencies: List[float], percentiles: Iterable[int] = (50, 95, 99)) -> Dict[str, float]:
+    """지연 목록(ms) -> {"p50": ..., "p95": ..., "mean": ...}"""
+    return {
+        **{f"p{q}": percentile(latencies, q) for q in percentiles},
+        "mean": statistics.fmean(latencies),
+    }
+
+
+def peak_rss_mb() -> float:
+    """현재 프로세스 최대 RSS (MB) - Linux는 KB, macOS는 byte 단위"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_isolated(fn: Callable[..., Any], *args) -> Any:
+    """
+    fn(*args)를 새 프로세스(spawn)에서 실행하고 결과 반환 (예외는 그대로 올림)
+
+    설정마다 새 프로세스에서 측정해야 최대 RSS, 인덱스 메모리, 모델/클라이언트 캐시가
+    다음 설정의 측정에 섞이지 않는다.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(fn, *args).result()
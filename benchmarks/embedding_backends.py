@@ -0,0 +1,135 @@
+"""
+Embedding Backend Benchmark - PyTorch(float) vs ONNX(int8) 비교
+
+측정 항목:
+- 모델 로드 시간
+- 쿼리 1건 임베딩 지연 (p50/p95)
+- 배치 처리량 (benefits.json 문서, texts/sec)
+- top-k 일치율 (float 모델 기준 혜택 검색 결과와의 겹침)
+
+실행:
+    python -m benchmarks.embedding_backends --output bench_embedding.json
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks._common import latency_summary
+from src.rag.loader import BenefitLoader
+from src.rag.embedders import OnnxEmbedder, ONNX_AVAILABLE
+
+
+QUERIES = [
+    "청년 월세 지원",
+    "전세 대출 저금리",
+    "대학생 신촌 월세 50만원 주거 지원",
+    "중기청",
+    "HUG 보증보험",
+    "LH 전세임대 신청 자격",
+    "행복주택 임대료",
+    "취업준비생 주거비",
+    "무주택 세대주 버팀목 대출",
+    "긴급 주거 지원",
+]
+
+
+def _top_k(doc_vectors: np.ndarray, query_vectors: np.ndarray, k: int):
+    docs = doc_vectors / np.linalg.norm(doc_vectors, axis=1, keepdims=True)
+    queries = query_vectors / np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    sims = queries @ docs.T
+    return [list(np.argsort(-row)[:k]) for row in sims]
+
+
+def benchmark_backend(name, load, documents, repeats):
+    started = time.perf_counter()
+    model = load()
+    load_seconds = time.perf_counter() - started
+
+    # 워밍업 후 쿼리 단건 지연 측정
+    model.encode(QUERIES[:2])
+    latencies = []
+    for _ in range(repeats):
+        for query in QUERIES:
+            t0 = time.perf_counter()
+            model.encode([query])
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    doc_vectors = np.asarray(model.encode(documents, batch_size=32))
+    batch_seconds = time.perf_counter() - t0
+
+    return {
+        "backend": name,
+        "load_seconds": load_seconds,
+        "query_latency_ms": latency_summary(latencies, (50, 95)),
+        "batch_throughput_per_sec": len(documents) / batch_seconds if batch_seconds else None,
+    }, doc_vectors, np.asarray(model.encode(QUERIES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare torch vs ONNX int8 embedding backends")
+    parser.add_argument("--model", default="jhgan/ko-sbert-nli")
+    parser.add_argument("--onnx-dir", default=None, help="ONNX export cache (default: temp dir)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--output", default=None, help="JSON 결과 저장 경로")
+    args = parser.parse_args()
+
+    documents = [doc.page_content for doc in BenefitLoader().load()]
+    onnx_dir = args.onnx_dir or tempfile.mkdtemp(prefix="onnx_")
+
+    from sentence_transformers import SentenceTransformer
+
+    backends = [("torch", lambda: SentenceTransformer(args.model))]
+    if ONNX_AVAILABLE:
+        # 내보내기 비용은 로드 시간과 분리해서 측정
+        t0 = time.perf_counter()
+        OnnxEmbedder(args.model, cache_dir=onnx_dir)
+        export_seconds = time.perf_counter() - t0
+        backends.append(("onnx-int8", lambda: OnnxEmbedder(args.model, cache_dir=onnx_dir)))
+    else:
+        export_seconds = None
+        print("onnxruntime not installed; benchmarking torch backend only")
+
+    results = []
+    rankings = {}
+    for name, load in backends:
+        result, doc_vectors, query_vectors = benchmark_backend(name, load, documents, args.repeats)
+        rankings[name] = _top_k(doc_vectors, query_vectors, args.top_k)
+        results.append(result)
+
+    reference = rankings["torch"]
+    for result in results:
+        ranking = rankings[result["backend"]]
+        overlaps = [len(set(a) & set(b)) / args.top_k for a, b in zip(reference, ranking)]
+        result[f"top{args.top_k}_agreement"] = statistics.fmean(overlaps)
+
+    report = {
+        "model": args.model,
+        "documents": len(documents),
+        "queries": len(QUERIES),
+        "onnx_export_seconds": export_seconds,
+        "results": results,
+    }
+
+    for r in results:
+        print(
+            f"[{r['backend']:>9}] load {r['load_seconds']:.2f}s | "
+            f"query p50 {r['query_latency_ms']['p50']:.1f}ms p95 {r['query_latency_ms']['p95']:.1f}ms | "
+            f"batch {r['batch_throughput_per_sec']:.1f} docs/s | "
+            f"top{args.top_k} agreement {r[f'top{args.top_k}_agreement']:.2f}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+HNSW Parameter Sweep - ChromaDB HNSW 설정별 빌드/메모리/지연/recall 비교
+
+합성 코퍼스(군집형 가우시안 벡터, 기본 10만 건)에 대해 설정마다 새 컬렉션을 만들고
+NumPy exact 검색 결과를 정답으로 recall@k를 계산한다.
+BenefitRetriever에 넘길 hnsw_m / hnsw_construction_ef / hnsw_search_ef 값을 고르는 용도.
+
+측정 항목:
+- 빌드 시간 (컬렉션 생성 ~ 전체 add 완료)
+- 메모리 (설정마다 별도 프로세스의 최대 RSS 증가분) + 디스크 사용량
+- 쿼리 지연 p50/p95/p99 (쿼리 1건씩)
+- recall@k (exact top-k 대비)
+
+실행:
+    python -m benchmarks.hnsw_sweep --output bench_hnsw.json
+    python -m benchmarks.hnsw_sweep --docs 20000 --m 16 32 --construction-ef 100 200 --search-ef 10 50 100
+"""
+
+import argparse
+import itertools
+import json
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks._common import latency_summary, peak_rss_mb, run_isolated
+from src.rag.retriever import hnsw_metadata
+
+
+def _dir_size_mb(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / (1024 * 1024)
+
+
+def synthetic_corpus(n_docs: int, n_queries: int, dim: int, seed: int = 42):
+    """
+    군집형 합성 임베딩 (실제 문장 임베딩처럼 주제별로 뭉친 분포)
+
+    Returns:
+        (문서 벡터, 쿼리 벡터) - 모두 L2 정규화된 float32
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = max(n_docs // 1000, 10)
+    centers = rng.normal(size=(n_clusters, dim)).astype(np.float32)
+
+    def sample(n):
+        labels = rng.integers(0, n_clusters, size=n)
+        vectors = centers[labels] + 0.5 * rng.normal(size=(n, dim)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    return sample(n_docs), sample(n_queries)
+
+
+def exact_top_k(docs: np.ndarray, queries: np.ndarray, k: int, block: int = 256):
+    """정답 top-k (cosine, 블록 단위 행렬곱)"""
+    results = []
+    for start in range(0, len(queries), block):
+        sims = queries[start:start + block] @ docs.T
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        for row, candidates in zip(sims, top):
+            results.append(set(candidates[np.argsort(-row[candidates])].tolist()))
+    return results
+
+
+def run_setting(setting, corpus, truth, k, batch_size):
+    """설정 1개 측정 (별도 프로세스에서 실행됨, 코퍼스는 같은 seed로 다시 생성)"""
+    import chromadb
+
+    docs, queries = synthetic_corpus(**corpus)
+    rss_before = peak_rss_mb()
+    with tempfile.TemporaryDirectory(prefix="hnsw_sweep_") as tmp:
+        directory = Path(tmp)
+        client = chromadb.PersistentClient(path=str(directory))
+        metadata = hnsw_metadata(setting["m"], setting["construction_ef"], setting["search_ef"])
+
+        started = time.perf_counter()
+        collection = client.create_collection(name="sweep", metadata=metadata)
+        if hasattr(client, "get_max_batch_size"):
+            batch_size = min(batch_size, client.get_max_batch_size())
+        for start in range(0, len(docs), batch_size):
+            end = min(start + batch_size, len(docs))
+            collection.add(
+                ids=[str(i) for i in range(start, end)],
+                embeddings=docs[start:end].tolist()
+            )
+        build_seconds = time.perf_counter() - started
+
+        latencies = []
+        recalls = []
+        for query, expected in zip(queries, truth):
+            t0 = time.perf_counter()
+            result = collection.query(query_embeddings=[query.tolist()], n_results=k, include=[])
+            latencies.append((time.perf_counter() - t0) * 1000)
+            found = {int(doc_id) for doc_id in result["ids"][0]}
+            recalls.append(len(found & expected) / k)
+
+        return {
+            **setting,
+            "build_seconds": build_seconds,
+            "rss_increase_mb": peak_rss_mb() - rss_before,
+            "disk_mb": _dir_size_mb(directory),
+            "query_latency_ms": latency_summary(latencies),
+            f"recall@{k}": statistics.fmean(recalls),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep ChromaDB HNSW parameters on a synthetic corpus")
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=768, help="ko-sbert-nli 임베딩 차원")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", nargs="+", type=int, default=[8, 16, 32])
+    parser.add_argument("--construction-ef", nargs="+", type=int, default=[100, 200])
+    parser.add_argument("--search-ef", nargs="+", type=int, default=[10, 50, 100])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="JSON 결과 저장 경로")
+    args = parser.parse_args()
+
+    try:
+        import chromadb  # noqa: F401
+    except ImportError:
+        print("chromadb is not installed; nothing to sweep")
+        return
+
+    print(f"Generating {args.docs} x {args.dim} synthetic corpus...")
+    corpus = dict(n_docs=args.docs, n_queries=args.queries, dim=args.dim, seed=args.seed)
+    docs, queries = synthetic_corpus(**corpus)
+    t0 = time.perf_counter()
+    truth = exact_top_k(docs, queries, args.k)
+    exact_ms = (time.perf_counter() - t0) * 1000 / len(queries)
+    del docs, queries
+
+    settings = [
+        {"m": m, "construction_ef": ef_c, "search_ef": ef_s}
+        for m, ef_c, ef_s in itertools.product(args.m, args.construction_ef, args.search_ef)
+    ]
+
+    results = []
+    for setting in settings:
+        try:
+            result = run_isolated(run_setting, setting, corpus, truth, args.k, args.batch_size)
+        except Exception as e:
+            result = {**setting, "error": f"{type(e).__name__}: {e}"}
+        results.append(result)
+
+        if "error" in result:
+            print(f"[M={setting['m']:>3} efC={setting['construction_ef']:>4} efS={setting['search_ef']:>4}] {result['error']}")
+            continue
+        latency = result["query_latency_ms"]
+        print(
+            f"[M={setting['m']:>3} efC={setting['construction_ef']:>4} efS={setting['search_ef']:>4}] "
+            f"build {result['build_seconds']:.1f}s | RSS +{result['rss_increase_mb']:.0f}MB disk {result['disk_mb']:.0f}MB | "
+            f"query p50 {latency['p50']:.2f}ms p95 {latency['p95']:.2f}ms p99 {latency['p99']:.2f}ms | "
+            f"recall@{args.k} {result[f'recall@{args.k}']:.3f}"
+        )
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "docs": args.docs,
+        "queries": args.queries,
+        "dim": args.dim,
+        "k": args.k,
+        "exact_numpy_query_ms": exact_ms,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Retrieval Quality Benchmark - BenefitRetriever 검색 품질/지연 측정
+
+benefits.json 위의 고정된 라벨 쿼리 세트로 인덱스 백엔드별 설정을 비교한다.
+
+측정 항목:
+- recall@k, MRR (라벨 쿼리 세트 기준)
+- 인덱스 빌드 시간 (빈 저장소에서 BenefitRetriever 생성 ~ 동기화 완료, 모델 로드 포함)
+- 검색 지연 p50/p95/p99 (쿼리 임베딩 LRU 비활성화 - 매 검색마다 임베딩)
+- 최대 RSS (설정마다 별도 프로세스에서 실행하여 서로 섞이지 않게 함)
+
+실행:
+    python -m benchmarks.retrieval_quality --output bench_retrieval.json
+    python -m benchmarks.retrieval_quality --configs numpy-hybrid fallback-bm25
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks._common import latency_summary, peak_rss_mb, run_isolated
+
+
+# (쿼리, 정답 혜택 id 목록) - 키워드 그대로의 쿼리 + 의미만 같은 쿼리를 섞음
+LABELLED_QUERIES = [
+    ("청년 월세 지원", ["benefit_001"]),
+    ("LH 전세임대 신청 자격", ["benefit_002"]),
+    ("행복주택 임대료", ["benefit_003"]),
+    ("역세권 청년주택", ["benefit_004"]),
+    ("중기청", ["benefit_005"]),
+    ("청년도약계좌", ["benefit_007"]),
+    ("디딤돌 전세자금대출", ["benefit_008"]),
+    ("청년 전월세 보증금 대출", ["benefit_009", "benefit_005"]),
+    ("서울시 청년수당", ["benefit_010"]),
+    ("청년희망적금", ["benefit_011"]),
+    ("청약 통장", ["benefit_012"]),
+    ("주거급여", ["benefit_013"]),
+    ("긴급 주거 지원", ["benefit_014"]),
+    ("HUG 보증보험", ["benefit_015"]),
+    ("안심소득", ["benefit_016"]),
+    ("집주인이 보증금을 안 돌려줄까 봐 걱정돼요", ["benefit_015"]),
+    ("중소기업 다니는 청년 전세 대출", ["benefit_005", "benefit_009"]),
+    ("저소득층 임대료 보조", ["benefit_013", "benefit_001"]),
+    ("목돈 모으기 적금", ["benefit_007", "benefit_011"]),
+    ("갑자기 살 곳이 없어졌어요", ["benefit_014"]),
+    ("취업준비생 생활비 지원", ["benefit_010"]),
+    ("공공임대 아파트", ["benefit_002", "benefit_003"]),
+]
+
+# 설정 이름 -> BenefitRetriever 인자
+CONFIGS = {
+    "chromadb-hybrid": {"index_backend": "chromadb", "hybrid": True},
+    "chromadb-vector": {"index_backend": "chromadb", "hybrid": False},
+    "numpy-hybrid": {"index_backend": "numpy", "hybrid": True},
+    "numpy-vector": {"index_backend": "numpy", "hybrid": False},
+    "fallback-bm25": {"index_backend": "fallback"},
+}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def evaluate(results, k_values):
+    """쿼리별 검색 결과 id 목록 -> recall@k, MRR"""
+    recall = {k: [] for k in k_values}
+    reciprocal_ranks = []
+    for (_, relevant), ids in zip(LABELLED_QUERIES, results):
+        for k in k_values:
+            recall[k].append(len(set(ids[:k]) & set(relevant)) / len(relevant))
+        rank = next((i + 1 for i, doc_id in enumerate(ids) if doc_id in relevant), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+
+    return {
+        **{f"recall@{k}": statistics.fmean(recall[k]) for k in k_values},
+        "mrr": statistics.fmean(reciprocal_ranks),
+    }
+
+
+def run_config(name, options, model, k_values, repeats):
+    """설정 1개 측정 (별도 프로세스에서 실행됨)"""
+    from src.rag.retriever import BenefitRetriever
+
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as persist_directory:
+        started = time.perf_counter()
+        retriever = BenefitRetriever(
+            persist_directory=persist_directory,
+            embedding_model=model,
+            use_embedding_cache=False,
+            query_cache_size=0,
+            **options
+        )
+        build_seconds = time.perf_counter() - started
+
+        if retriever.backend != options["index_backend"]:
+            return {"config": name, "skipped": f"{options['index_backend']} backend not available"}
+
+        n_results = max(k_values)
+        queries = [query for query, _ in LABELLED_QUERIES]
+
+        # 워밍업 (모델 lazy 로드, 스레드 풀 기동)
+        retriever.search(queries[0], n_results=n_results)
+
+        results = [[hit["id"] for hit in retriever.search(q, n_results=n_results)] for q in queries]
+
+        latencies = []
+        for _ in range(repeats):
+            for query in queries:
+                t0 = time.perf_counter()
+                retriever.search(query, n_results=n_results)
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        return {
+            "config": name,
+            "options": options,
+            "backend": retriever.backend,
+            "documents": len(retriever.get_all_benefits()),
+            **evaluate(results, k_values),
+            "build_seconds": build_seconds,
+            "model_load_seconds": retriever.model_load_seconds,
+            "search_latency_ms": latency_summary(latencies),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure BenefitRetriever retrieval quality and latency")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--model", default="jhgan/ko-sbert-nli")
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 3, 5])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default=None, help="JSON 결과 저장 경로")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.configs:
+        try:
+            results.append(run_isolated(run_config, name, CONFIGS[name], args.model, args.k, args.repeats))
+        except Exception as e:
+            results.append({"config": name, "error": f"{type(e).__name__}: {e}"})
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "model": args.model,
+        "queries": len(LABELLED_QUERIES),
+        "k": args.k,
+        "repeats": args.repeats,
+        "results": results,
+    }
+
+    for r in results:
+        if "skipped" in r or "error" in r:
+            print(f"[{r['config']:>15}] {r.get('skipped') or r.get('error')}")
+            continue
+        recalls = " ".join(f"R@{k} {r[f'recall@{k}']:.2f}" for k in args.k)
+        latency = r["search_latency_ms"]
+        print(
+            f"[{r['config']:>15}] {recalls} MRR {r['mrr']:.2f} | "
+            f"build {r['build_seconds']:.2f}s | "
+            f"search p50 {latency['p50']:.1f}ms p95 {latency['p95']:.1f}ms p99 {latency['p99']:.1f}ms | "
+            f"peak RSS {r['peak_rss_mb']:.0f}MB"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Saved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -66,7 +66,12 @@ if prompt:
             try:
                 from src.agents.legal import LegalAdvisorAgent
                 agent = LegalAdvisorAgent(openai_api_key=api_key)
-                response = agent.consult(prompt, language=st.session_state.language)
+                
+                # 생성되는 대로 표시 (첫 토큰부터 바로 보이도록)
+                response = ""
+                for chunk in agent.consult_stream(prompt, language=st.session_state.language):
+                    response += chunk
+                    message_placeholder.markdown(response + "▌")
                 
                 message_placeholder.markdown(response)
                 st.session_state.legal_messages.append({"role": "assistant", "content": response})
@@ -4,10 +4,12 @@ Legal Advisor Agent - 주택임대차보호법 기반 법률 상담 (Enhanced)
 
 import os
 import json
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from src.legal.corpus import LegalCorpus, get_legal_corpus, precedent_dicts
+
 
 class LegalAdvisorAgent:
     """
@@ -20,31 +22,60 @@ class LegalAdvisorAgent:
     4. explain_contract_clause() - 계약서 조항 해석
     """
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, law_top_k: int = 4, precedent_top_k: int = 3):
         self.llm = ChatOpenAI(
             model="gpt-4o",
             temperature=0,
             api_key=openai_api_key or os.getenv("OPENAI_API_KEY")
         )
-        self.law_text = self._load_law_text()
-        self.precedents = self._load_precedents()
-        
-    def _load_law_text(self) -> str:
-        """법령 텍스트 로드"""
-        try:
-            with open("data/legal/rental_protection_act.txt", "r", encoding="utf-8") as f:
-                return f.read()
-        except:
-            return "법령 데이터를 찾을 수 없습니다."
+        # 프로세스 공용 법령/판례 (파일이 바뀌었을 때만 다시 로드, 로드 실패 시 LegalCorpusError)
+        self.corpus: LegalCorpus = get_legal_corpus()
+        self.law_top_k = law_top_k  # 프롬프트에 넣을 관련 조/항 개수
+        self.precedent_top_k = precedent_top_k  # 프롬프트에 넣을 관련 판례 개수
+        
+    @property
+    def law_text(self) -> str:
+        """법령 전문"""
+        return self.corpus.law_text
     
-    def _load_precedents(self) -> List[Dict]:
-        """판례 데이터 로드"""
+    @property
+    def precedents(self):
+        """판례 목록 (읽기 전용)"""
+        return self.corpus.precedents
+    
+    def _relevant_law(self, query: str, include_full_law: bool = False) -> str:
+        """
+        질문과 관련된 조/항만 골라 프롬프트용 텍스트로 반환
+
+        include_full_law=True이거나 조항 검색이 불가능하면 법령 전문을 반환
+        """
+        if include_full_law:
+            return self.law_text
         try:
-            with open("data/legal/precedents.json", "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
+            from src.legal.articles import format_law_units, search_law_units
+
+            units = search_law_units(query, k=self.law_top_k)
+        except Exception as e:
+            print(f"Warning: law article search failed ({e}); using full law text")
+            return self.law_text
+        return format_law_units(units) if units else self.law_text
+
+    def _relevant_precedents(self, query: str) -> List[Dict]:
+        """
+        질문과 관련된 상위 precedent_top_k개 판례
+
+        판례 검색이 불가능하면 앞에서부터 precedent_top_k개를 반환
+        """
+        if not self.precedents:
             return []
-    
+        try:
+            from src.legal.precedents import search_precedents
+
+            return search_precedents(query, k=self.precedent_top_k)
+        except Exception as e:
+            print(f"Warning: precedent search failed ({e}); using first {self.precedent_top_k} precedents")
+            return precedent_dicts(self.precedents[:self.precedent_top_k])
+
     def get_case_precedents(self, situation: str, language: str = "KO") -> str:
         """
         상황에 맞는 관련 판례 검색
@@ -59,7 +90,8 @@ class LegalAdvisorAgent:
         if not self.precedents:
             return "판례 데이터를 불러올 수 없습니다."
         
-        precedents_text = json.dumps(self.precedents, ensure_ascii=False, indent=2)
+        # 전체 판례 대신 관련 판례 상위 k건만 (판례 수와 무관하게 프롬프트 크기 일정)
+        precedents_text = json.dumps(self._relevant_precedents(situation), ensure_ascii=False, indent=2)
         lang_instruction = "답변은 반드시 한국어로 작성하세요." if language == "KO" else "Please answer in English."
         
         system_prompt = f"""
@@ -91,46 +123,40 @@ class LegalAdvisorAgent:
         notice_type: str,
         sender_name: str,
         details: Dict,
-        language: str = "KO"
+        language: str = "KO",
+        polish: bool = False
     ) -> str:
         """
         통지서 생성
         
+        필수 항목이 모두 있으면 템플릿으로 바로 작성하고 (LLM 미호출),
+        polish=True이거나 필수 항목이 빠진 경우에만 LLM으로 작성/다듬는다.
+        
         Args:
             notice_type: "갱신거절", "수리요청", "보증금반환", "증액거부"
             sender_name: 발신자 이름
             details: 상세 정보 딕셔너리
             language: 언어 설정
+            polish: True면 템플릿 초안을 LLM으로 자연스럽게 다듬음
         
         Returns:
             통지서 내용
         """
-        notice_templates = {
-            "갱신거절": {
-                "title": "임대차계약 갱신거절 통지서",
-                "required_fields": ["contract_end_date", "reason"],
-                "legal_basis": "주택임대차보호법 제6조의3"
-            },
-            "수리요청": {
-                "title": "시설물 수리 요청서",
-                "required_fields": ["repair_items", "urgency"],
-                "legal_basis": "민법 제623조 (임대인의 수선의무)"
-            },
-            "보증금반환": {
-                "title": "임대차보증금 반환 청구서",
-                "required_fields": ["deposit_amount", "contract_end_date", "deadline"],
-                "legal_basis": "주택임대차보호법 제3조의2"
-            },
-            "증액거부": {
-                "title": "차임 증액 거부 통지서",
-                "required_fields": ["requested_increase", "legal_limit"],
-                "legal_basis": "주택임대차보호법 제7조 (5% 상한)"
-            }
-        }
-        
-        template = notice_templates.get(notice_type)
+        from src.legal.notices import NOTICE_TYPES, missing_fields, render_notice
+        
+        template = NOTICE_TYPES.get(notice_type)
         if not template:
-            return f"지원하지 않는 통지서 유형입니다. 지원 유형: {list(notice_templates.keys())}"
+            return f"지원하지 않는 통지서 유형입니다. 지원 유형: {list(NOTICE_TYPES.keys())}"
+        
+        missing = missing_fields(notice_type, details)
+        draft, problem = None, None
+        if not missing:
+            try:
+                draft = render_notice(notice_type, sender_name, details, language)
+            except ValueError as e:
+                problem = str(e)  # 값 형식 오류 (예: 비율 항목에 금액) -> LLM이 문맥으로 작성
+        if draft is not None and not polish:
+            return draft
         
         lang_instruction = "통지서는 한국어로 작성하세요." if language == "KO" else "Write the notice in English."
         
@@ -151,28 +177,57 @@ class LegalAdvisorAgent:
         {lang_instruction}
         """
         
-        details_text = "\n".join([f"- {k}: {v}" for k, v in details.items()])
+        if draft is not None:
+            # 다듬기: 템플릿 초안의 사실관계(날짜, 금액, 법적 근거)는 유지
+            content = f"아래 통지서 초안의 사실관계는 그대로 두고 문장만 자연스럽게 다듬어주세요.\n\n{draft}"
+        else:
+            details_text = "\n".join([f"- {k}: {v}" for k, v in details.items()])
+            if missing:
+                content = f"상세 정보:\n{details_text}\n\n누락된 항목({', '.join(missing)})은 [ ] 빈칸으로 표시해주세요."
+            else:
+                content = f"상세 정보:\n{details_text}\n\n확인이 필요한 항목: {problem}"
         
         messages = [
             SystemMessage(content=system_prompt),
-            HumanMessage(content=f"상세 정보:\n{details_text}")
+            HumanMessage(content=content)
         ]
         
         response = self.llm.invoke(messages)
         return response.content
     
-    def explain_contract_clause(self, clause: str, language: str = "KO") -> str:
+    def explain_contract_clause(
+        self,
+        clause: str,
+        language: str = "KO",
+        include_full_law: bool = False,
+        use_cache: bool = True
+    ) -> str:
         """
         계약서 조항 해석
         
+        같은 조항(공백/줄바꿈 차이 무시)의 해석은 SQLite 캐시에서 바로 반환한다.
+        (법령 전문을 참고하는 해석은 캐시하지 않음)
+        
         Args:
             clause: 해석이 필요한 계약서 조항 텍스트
             language: 언어 설정
+            include_full_law: True면 관련 조항 대신 법령 전문을 참고 자료로 사용
+            use_cache: False면 캐시를 조회/저장하지 않음
         
         Returns:
             조항 해석 및 주의사항
         """
+        cache = None
+        if use_cache and not include_full_law:
+            from src.legal.clause_cache import get_clause_cache
+
+            cache = get_clause_cache()
+            cached = cache.get(clause, language, self.corpus.version)
+            if cached is not None:
+                return cached
+        
         lang_instruction = "답변은 반드시 한국어로 작성하세요." if language == "KO" else "Please answer in English."
+        law_text = self._relevant_law(clause, include_full_law)
         
         system_prompt = f"""
         당신은 부동산 계약 전문 변호사입니다.
@@ -185,8 +240,8 @@ class LegalAdvisorAgent:
         4. 수정 권장 사항 (있다면)
         5. 주의사항
         
-        [참고 법령]
-        {self.law_text}
+        [참고 법령 - 주택임대차보호법 관련 조항]
+        {law_text}
         
         {lang_instruction}
         """
@@ -197,26 +252,26 @@ class LegalAdvisorAgent:
         ]
         
         response = self.llm.invoke(messages)
+        if cache is not None:
+            cache.put(clause, language, self.corpus.version, response.content)
         return response.content
             
-    def consult(self, user_question: str, language: str = "KO") -> str:
-        """
-        사용자 질문에 대해 법적 근거를 들어 답변 (Enhanced)
-        
-        법령 + 판례 데이터를 모두 활용하여 더 풍부한 답변 제공
-        """
+    def _consult_messages(self, user_question: str, language: str, include_full_law: bool) -> list:
+        """상담 프롬프트 (관련 조항 + 관련 판례)"""
         lang_instruction = "답변은 반드시 한국어로 작성하세요." if language == "KO" else "Please answer in English."
+        law_text = self._relevant_law(user_question, include_full_law)
         
-        # 판례 데이터 포함
+        # 질문과 관련된 판례만 포함
         precedents_summary = ""
-        if self.precedents:
-            precedents_summary = "\n\n[참고 판례]\n"
-            for p in self.precedents[:3]:  # 상위 3개만
-                precedents_summary += f"- {p['title']} ({p['case_number']}): {p['summary']}\n"
+        precedents = self._relevant_precedents(user_question)
+        if precedents:
+            from src.legal.precedents import format_precedents
+
+            precedents_summary = "\n\n[참고 판례]\n" + format_precedents(precedents)
         
         system_prompt = f"""
         당신은 'Young & Home'의 AI 주거 법률 상담사입니다.
-        아래 제공된 [주택임대차보호법] 원문과 [참고 판례]를 근거로 사용자의 질문에 전문적으로 답변하세요.
+        아래 제공된 [주택임대차보호법 관련 조항]과 [참고 판례]를 근거로 사용자의 질문에 전문적으로 답변하세요.
         
         [답변 원칙]
         1. 반드시 관련된 "제O조 O항"을 명시하여 법적 근거를 대세요.
@@ -227,18 +282,77 @@ class LegalAdvisorAgent:
         6. 말투는 정중하고 신뢰감 있게 하세요.
         7. {lang_instruction}
         
-        [주택임대차보호법 데이터]
-        {self.law_text}
+        [주택임대차보호법 관련 조항]
+        {law_text}
         {precedents_summary}
         """
         
-        messages = [
+        return [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_question)
         ]
+    
+    def _answer_cache(self, use_cache: bool, language: str, include_full_law: bool):
+        """(상담 답변 캐시 또는 None, 캐시 범위)"""
+        from src.legal.answer_cache import get_answer_cache
+
+        scope = (self.corpus.version, language, include_full_law)
+        return (get_answer_cache() if use_cache else None), scope
+    
+    def consult(
+        self,
+        user_question: str,
+        language: str = "KO",
+        include_full_law: bool = False,
+        use_cache: bool = True
+    ) -> str:
+        """
+        사용자 질문에 대해 법적 근거를 들어 답변 (Enhanced)
         
-        response = self.llm.invoke(messages)
+        법령 + 판례 데이터를 모두 활용하여 더 풍부한 답변 제공
+        법령은 질문과 관련된 상위 law_top_k개 조/항만 넣고,
+        include_full_law=True일 때만 전문을 넣는다.
+        같은(또는 충분히 비슷한) 질문의 답변은 의미 캐시에서 바로 반환한다.
+        """
+        cache, scope = self._answer_cache(use_cache, language, include_full_law)
+        if cache is not None:
+            cached = cache.get(user_question, scope)
+            if cached is not None:
+                return cached
+        
+        response = self.llm.invoke(self._consult_messages(user_question, language, include_full_law))
+        if cache is not None:
+            cache.put(user_question, scope, response.content)
         return response.content
+    
+    def consult_stream(
+        self,
+        user_question: str,
+        language: str = "KO",
+        include_full_law: bool = False,
+        use_cache: bool = True
+    ) -> Iterator[str]:
+        """
+        consult()의 스트리밍 버전 - 답변을 생성되는 대로 조각(str) 단위로 반환
+        
+        캐시 적중 시 저장된 답변 전체를 한 조각으로 반환하고,
+        끝까지 받은 답변만 캐시에 저장한다 (중간에 끊긴 답변은 저장하지 않음).
+        """
+        cache, scope = self._answer_cache(use_cache, language, include_full_law)
+        if cache is not None:
+            cached = cache.get(user_question, scope)
+            if cached is not None:
+                yield cached
+                return
+        
+        parts = []
+        for chunk in self.llm.stream(self._consult_messages(user_question, language, include_full_law)):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield chunk.content
+        
+        if cache is not None:
+            cache.put(user_question, scope, "".join(parts))
 
 
 # 자주 사용되는 통지서 템플릿
@@ -279,6 +393,12 @@ if __name__ == "__main__":
     print("=== 기본 상담 ===")
     print(agent.consult("집주인이 계약 만료 1달 전에 나가라고 하면 나가야 하나요?"))
     
+    # 스트리밍 상담 테스트
+    print("\n=== 스트리밍 상담 ===")
+    for chunk in agent.consult_stream("월세를 10% 올려달라고 하는데 거절할 수 있나요?"):
+        print(chunk, end="", flush=True)
+    print()
+    
     # 판례 검색 테스트
     print("\n=== 판례 검색 ===")
     print(agent.get_case_precedents("전세금을 돌려받지 못하고 있어요"))
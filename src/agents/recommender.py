@@ -8,6 +8,8 @@ from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langgraph.graph import StateGraph, END
 import operator
 
+from src.housing.listings import Listing
+
 
 class RecommenderState(TypedDict):
     """에이전트 상태 정의"""
@@ -96,8 +98,8 @@ class RecommenderAgent:
         
         # RAG Retriever 사용
         try:
-            from src.rag.retriever import BenefitRetriever
-            retriever = BenefitRetriever()
+            from src.rag.retriever import get_retriever
+            retriever = get_retriever()
             
             # 프로필 기반 검색 쿼리 생성
             status = profile.get("status", "청년")
@@ -106,75 +108,26 @@ class RecommenderAgent:
             
             query = f"{status} {location} 월세 {max_rent}만원 주거 지원"
             
-            # RAG 검색 (더 많이 가져와서 필터링)
-            search_results = retriever.search(query, n_results=10)
-            
-            # 자격 조건 검증을 위해 원본 JSON 로드
-            import json
-            benefits_db = {}
-            try:
-                with open("data/welfare/benefits.json", "r", encoding="utf-8") as f:
-                    all_benefits = json.load(f)
-                    benefits_db = {b["id"]: b for b in all_benefits}
-            except:
-                pass
+            # RAG 검색 (자격 조건은 인덱스 메타데이터 where 필터로 검색 시점에 적용)
+            from src.rag.loader import eligibility_filter
+            search_results = retriever.search(
+                query,
+                n_results=5,
+                filters=eligibility_filter(age=user_age, status=user_status)
+            )
             
-            # 결과를 혜택 리스트로 변환 + 자격 필터링
+            # 결과를 혜택 리스트로 변환 (금액은 로더가 메타데이터에 미리 포맷)
             matched_benefits = []
             for result in search_results:
                 metadata = result.get("metadata", {})
-                content = result.get("content", "")
-                benefit_id = metadata.get("id")
-                
-                # 자격 조건 검증
-                if benefit_id and benefit_id in benefits_db:
-                    elig = benefits_db[benefit_id].get("eligibility", {})
-                    
-                    # 나이 조건 검증
-                    age_min = elig.get("age_min", 0)
-                    age_max = elig.get("age_max") or 100
-                    if not (age_min <= user_age <= age_max):
-                        continue  # 나이 부적격 → 제외
-                    
-                    # 대상 상태 검증 (청년은 대부분 포함)
-                    required_status = elig.get("required_status", [])
-                    if required_status:
-                        status_match = any(
-                            s in user_status or user_status in s or s == "청년"
-                            for s in required_status
-                        )
-                        if not status_match and "무주택자" not in required_status:
-                            continue  # 상태 부적격 → 제외
-                
-                # 혜택 금액 파싱
-                amount = "상세내용 확인 필요"
-                if "지원금:" in content:
-                    try:
-                        amount = content.split("지원금:")[1].split("\n")[0].strip()
-                    except:
-                        pass
-                elif "대출한도:" in content:
-                    try:
-                        amount = content.split("대출한도:")[1].split("\n")[0].strip()
-                    except:
-                        pass
-                elif "임대료:" in content:
-                    try:
-                        amount = content.split("임대료:")[1].split("\n")[0].strip()
-                    except:
-                        pass
-                
                 matched_benefits.append({
                     "id": metadata.get("id"),
                     "name": metadata.get("name"),
                     "category": metadata.get("category"),
                     "provider": metadata.get("provider"),
-                    "amount": amount,
+                    "amount": metadata.get("amount", "상세내용 확인 필요"),
                     "url": metadata.get("url")
                 })
-                
-                if len(matched_benefits) >= 5:
-                    break
             
         except Exception as e:
             print(f"RAG search failed: {e}, falling back to JSON")
@@ -210,78 +163,25 @@ class RecommenderAgent:
             "messages": [AIMessage(content=f"{len(matched_benefits)}개의 맞춤 혜택을 찾았습니다.")]
         }
     
-    def _score_house(self, house: dict, profile: dict) -> float:
+    def _score_house(self, house: Listing, profile: dict) -> float:
         """매물 점수 계산 (높을수록 좋음)"""
-        score = 0.0
-        
-        # 1. 위험도 점수 (최우선)
-        risk_level = house.get("risk_level", "보통")
-        if risk_level == "안전":
-            score += 30
-        elif risk_level == "보통":
-            score += 15
-        elif risk_level == "주의":
-            score += 5
-        # 고위험은 0점
-        
-        # 2. 예산 적합도
-        max_monthly = profile.get("max_rent", 50)
-        monthly = house.get("monthly", 0)
-        if monthly <= max_monthly:
-            score += 25
-        elif monthly <= max_monthly * 1.1:
-            score += 15
-        elif monthly <= max_monthly * 1.2:
-            score += 5
-        
-        # 3. 통근 시간
-        max_commute = profile.get("max_commute", 30)
-        commute = house.get("commute_time", 999)
-        if commute <= max_commute * 0.5:
-            score += 20  # 목표의 절반 이하
-        elif commute <= max_commute:
-            score += 15
-        elif commute <= max_commute * 1.2:
-            score += 5
-        
-        # 4. 주거 타입 가산점
-        house_type = house.get("type", "")
-        if "공공" in house_type:
-            score += 10  # 공공임대 우선
-        
-        # 5. 특수 기능 가산점
-        features = house.get("features", [])
-        if "신축" in features:
-            score += 5
-        if "풀옵션" in features:
-            score += 5
-        
-        return score
+        from src.housing.scoring import score_house
+        return score_house(house, profile)
     
     def _recommend_houses(self, state: RecommenderState) -> dict:
         """조건에 맞는 매물 추천 (스코어링 + 위험 필터링)"""
         profile = state.get("user_profile", {})
         
-        # 1. 매물 데이터 로드
-        import json
-        import os
+        # 1. 매물 데이터 로드 (불변 레코드, 프로세스 공용 캐시)
+        from src.housing.listings import AnnotatedListing, load_listings
         
-        houses = []
-        try:
-            db_path = "data/housing/houses.json"
-            if os.path.exists(db_path):
-                with open(db_path, "r", encoding="utf-8") as f:
-                    houses = json.load(f)
-            else:
-                print(f"Warning: {db_path} not found.")
-        except Exception as e:
-            print(f"Error loading houses: {e}")
+        houses = load_listings()
             
         # 데이터가 없으면 빈 리스트
         if not houses:
             # Fallback mock data
             recommendations = [
-                {
+                Listing.from_dict({
                     "name": "SH 신촌 행복주택",
                     "type": "공공임대",
                     "deposit": 500,
@@ -289,12 +189,12 @@ class RecommenderAgent:
                     "location": "신촌역 도보 10분",
                     "commute_time": 15,
                     "risk_level": "안전"
-                }
+                })
             ]
         else:
             recommendations = houses
             
-        # 2. 필터링 + 스코어링
+        # 2. 필터링 + 스코어링 (점수/경고는 공유 레코드가 아닌 오버레이에 기록)
         scored_houses = []
         
         target_loc = profile.get("location_preference", "")
@@ -304,23 +204,23 @@ class RecommenderAgent:
         
         for house in recommendations:
             # 고위험 매물 자동 제외
-            if house.get("risk_level") == "고위험":
+            if house.risk_level == "고위험":
                 continue
             
             # 지역 필터링
             if target_loc:
-                loc_match = (target_loc in house.get("location", "")) or \
-                            (target_loc in house.get("address", "")) or \
-                            (target_loc in house.get("name", ""))
+                loc_match = (target_loc in house.location) or \
+                            (target_loc in house.address) or \
+                            (target_loc in house.name)
                 if not loc_match:
                     continue
             
             # 예산 필터링 (보증금: 자산의 150%까지 - 대출 고려)
-            if house.get("deposit", 0) > max_deposit * 1.5: 
+            if house.deposit > max_deposit * 1.5: 
                 continue
             
             # 월세 필터링 (희망 월세 + 30% 까지)
-            if house.get("monthly", 0) > max_monthly * 1.3:
+            if house.monthly > max_monthly * 1.3:
                 continue
             
             # 통근 시간 필터링 (50% 초과까지 허용)
@@ -331,22 +231,21 @@ class RecommenderAgent:
             score = self._score_house(house, profile)
             
             # 주의 매물 마킹
-            if house.get("risk_level") == "주의":
-                house["_warning"] = "⚠️ 안전 분석 권장"
+            warning = "⚠️ 안전 분석 권장" if house.risk_level == "주의" else None
             
-            scored_houses.append((score, house))
+            scored_houses.append(AnnotatedListing(house, score, warning))
         
         # 3. 점수 기반 정렬 (높은 점수 우선)
-        scored_houses.sort(key=lambda x: x[0], reverse=True)
+        scored_houses.sort(key=lambda x: x.score, reverse=True)
         
         # 조건에 맞는 매물 없으면 전체에서 상위 (고위험 제외)
         if not scored_houses:
-            safe_houses = [h for h in recommendations if h.get("risk_level") != "고위험"]
+            safe_houses = [h for h in recommendations if h.risk_level != "고위험"]
             for h in safe_houses[:3]:
-                scored_houses.append((0, h))
+                scored_houses.append(AnnotatedListing(h))
         
         # 상위 5개 추천 (더 많은 선택지 제공)
-        top_picks = [house for _, house in scored_houses[:5]]
+        top_picks = [item.to_dict() for item in scored_houses[:5]]
         
         return {
             "recommendations": top_picks,
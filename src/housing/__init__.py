@@ -0,0 +1,18 @@
+"""
+Housing Package - 매물 레코드, 스코어링 및 구독자 다이제스트
+"""
+
+from .listings import Listing, AnnotatedListing, load_listings
+from .scoring import score_house, static_score, budget_score, commute_score
+from .digest import SubscriptionDigest
+
+__all__ = [
+    "Listing",
+    "AnnotatedListing",
+    "load_listings",
+    "score_house",
+    "static_score",
+    "budget_score",
+    "commute_score",
+    "SubscriptionDigest"
+]
@@ -0,0 +1,103 @@
+"""
+Subscription Digest - 구독자 맞춤 매물 다이제스트 (일괄 처리)
+30분 주기 알림에서 구독자 수만큼 에이전트를 돌리지 않도록,
+구독 목록과 매물 인벤토리를 한 번씩만 읽고 전체 조합을 한 번에 평가
+"""
+
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Set
+
+from .listings import Listing, AnnotatedListing
+from .scoring import static_score, commute_score
+
+
+class SubscriptionDigest:
+    """
+    전체 구독자 대상 top-k 신규 매물 다이제스트
+    
+    - 구독자와 무관한 점수(위험도, 타입, 통근)는 매물당 한 번만 계산
+    - 지역별 후보 목록은 점수순으로 정렬해 같은 지역 구독자끼리 공유
+    - 구독자별로는 정렬된 후보를 앞에서부터 훑으며 예산/기발송 조건만 검사
+    """
+    
+    def __init__(
+        self,
+        houses: Sequence[Listing],
+        top_k: int = 5,
+        max_commute: int = 30
+    ):
+        if top_k < 1:
+            raise ValueError(f"top_k must be at least 1, got {top_k}")
+        self.top_k = top_k
+        # 고위험 매물은 알림 대상에서 제외
+        self.houses = [h for h in houses if h.risk_level != "고위험"]
+        self._scores = [
+            static_score(h) + commute_score(h.get("commute_time", 999), max_commute)
+            for h in self.houses
+        ]
+        self._candidates_by_location: Dict[str, List[int]] = {}
+    
+    def _candidates(self, location: str) -> List[int]:
+        """지역 조건에 맞는 매물 인덱스 (점수 내림차순, 지역별 캐싱)"""
+        candidates = self._candidates_by_location.get(location)
+        if candidates is None:
+            candidates = [
+                i for i, h in enumerate(self.houses)
+                if not location
+                or location in h.address
+                or location in h.location
+            ]
+            # 동점이면 원래 순서 유지 (sort는 stable)
+            candidates.sort(key=lambda i: self._scores[i], reverse=True)
+            self._candidates_by_location[location] = candidates
+        return candidates
+    
+    def build_one(
+        self,
+        subscription: Dict[str, Any],
+        sent: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """구독 하나에 대한 top-k 신규 매물"""
+        sent = sent or set()
+        max_deposit = subscription.get("max_deposit")
+        max_monthly = subscription.get("max_monthly")
+        
+        picks = []
+        for i in self._candidates(subscription.get("location") or ""):
+            house = self.houses[i]
+            if str(house.id) in sent:
+                continue
+            if max_deposit and house.deposit > max_deposit:
+                continue
+            if max_monthly and house.monthly > max_monthly:
+                continue
+            
+            picks.append(AnnotatedListing(house, self._scores[i]).to_dict())
+            if len(picks) >= self.top_k:
+                break
+        
+        return picks
+    
+    def build(
+        self,
+        subscriptions: Iterable[Dict[str, Any]],
+        sent: Optional[Dict[str, Set[str]]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        전체 구독자 다이제스트 생성 (단일 패스)
+        
+        Args:
+            subscriptions: subscriptions 테이블 행 목록 (user_id, location, max_deposit, max_monthly)
+            sent: 사용자별 이미 발송한 매물 id 집합 (문자열, 신규 매물만 추리기 위함)
+        
+        Returns:
+            {user_id: [매물, ...]} - 신규 매물이 없는 사용자는 제외
+        """
+        sent = sent or {}
+        digests = {}
+        
+        for sub in subscriptions:
+            picks = self.build_one(sub, sent.get(sub["user_id"]))
+            if picks:
+                digests[sub["user_id"]] = picks
+        
+        return digests
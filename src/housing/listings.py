@@ -0,0 +1,114 @@
+"""
+Housing Listings - 불변 매물 레코드 및 프로세스 공용 캐시
+매물은 읽기 전용 레코드로 공유하고, 요청별 점수/경고는 별도 오버레이에 기록
+"""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+DEFAULT_LISTINGS_PATH = Path(__file__).parent.parent.parent / "data" / "housing" / "houses.json"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """범주형 문자열(타입, 위험도, 특징)은 intern하여 레코드 간 공유"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Listing(NamedTuple):
+    """매물 레코드 (불변, 인스턴스 딕셔너리 없음)"""
+    id: Any
+    name: str
+    type: str
+    deposit: int
+    monthly: int
+    location: str
+    address: str
+    lat: Optional[float]
+    lon: Optional[float]
+    commute_time: Optional[int]
+    risk_level: str
+    features: Tuple[str, ...]
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Listing":
+        return cls(
+            id=data.get("id"),
+            name=data.get("name", ""),
+            type=_intern(data.get("type", "")),
+            deposit=data.get("deposit", 0),
+            monthly=data.get("monthly", 0),
+            location=data.get("location", ""),
+            address=data.get("address", ""),
+            lat=data.get("lat"),
+            lon=data.get("lon"),
+            commute_time=data.get("commute_time"),
+            risk_level=_intern(data.get("risk_level", "보통")),
+            features=tuple(_intern(f) for f in data.get("features", [])),
+        )
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """dict.get 호환 (기존 스코어링/필터 코드를 그대로 사용하기 위함)"""
+        # 필드만 조회 (getattr은 "count"/"index" 같은 tuple 메서드도 돌려줌)
+        if key not in self._fields:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = self._asdict()
+        data["features"] = list(self.features)
+        return data
+
+
+class AnnotatedListing(NamedTuple):
+    """요청별 오버레이 - 공유 레코드를 건드리지 않고 점수/경고를 덧붙임"""
+    listing: Listing
+    score: float = 0.0
+    warning: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = self.listing.to_dict()
+        data["score"] = self.score
+        if self.warning:
+            data["_warning"] = self.warning
+        return data
+
+
+_cache_lock = threading.Lock()
+_cache: Dict[str, Tuple[float, Tuple[Listing, ...]]] = {}
+
+
+def load_listings(path: str = None) -> Tuple[Listing, ...]:
+    """
+    매물 레코드 로드 (프로세스 공용 캐시)
+    
+    레코드가 불변이므로 요청 간 공유해도 안전하며,
+    파일이 수정된 경우(mtime 변경)에만 다시 파싱한다.
+    """
+    path = str(path or DEFAULT_LISTINGS_PATH)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        print(f"Warning: {path} not found.")
+        return ()
+    
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                listings = tuple(Listing.from_dict(h) for h in json.load(f))
+        except Exception as e:
+            print(f"Error loading houses: {e}")
+            return ()
+        
+        _cache[path] = (mtime, listings)
+        return listings
+
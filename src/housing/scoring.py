@@ -0,0 +1,58 @@
+"""
+Housing Scoring - 매물 점수 계산
+RecommenderAgent와 구독 다이제스트가 같은 기준으로 매물을 평가하도록 공용화
+"""
+
+from typing import Dict, Any
+
+
+RISK_SCORES = {"안전": 30, "보통": 15, "주의": 5}  # 고위험은 0점
+
+
+def static_score(house: Dict[str, Any]) -> float:
+    """사용자 조건과 무관한 점수 (위험도 + 주거 타입 + 특수 기능)"""
+    score = float(RISK_SCORES.get(house.get("risk_level", "보통"), 0))
+    
+    # 주거 타입 가산점 (공공임대 우선)
+    if "공공" in house.get("type", ""):
+        score += 10
+    
+    # 특수 기능 가산점
+    features = house.get("features", [])
+    if "신축" in features:
+        score += 5
+    if "풀옵션" in features:
+        score += 5
+    
+    return score
+
+
+def budget_score(monthly: float, max_monthly: float) -> float:
+    """예산 적합도 점수"""
+    if monthly <= max_monthly:
+        return 25
+    if monthly <= max_monthly * 1.1:
+        return 15
+    if monthly <= max_monthly * 1.2:
+        return 5
+    return 0
+
+
+def commute_score(commute: float, max_commute: float) -> float:
+    """통근 시간 점수"""
+    if commute <= max_commute * 0.5:
+        return 20  # 목표의 절반 이하
+    if commute <= max_commute:
+        return 15
+    if commute <= max_commute * 1.2:
+        return 5
+    return 0
+
+
+def score_house(house: Dict[str, Any], profile: Dict[str, Any]) -> float:
+    """매물 점수 계산 (높을수록 좋음)"""
+    return (
+        static_score(house)
+        + budget_score(house.get("monthly", 0), profile.get("max_rent", 50))
+        + commute_score(house.get("commute_time", 999), profile.get("max_commute", 30))
+    )
@@ -0,0 +1,31 @@
+"""
+Legal Package - 법령/판례 데이터 및 검색
+"""
+
+from .articles import LawUnit, LawArticleLoader, parse_law_articles, format_law_units, search_law_units
+from .precedents import PrecedentLoader, format_precedents, search_precedents
+from .answer_cache import SemanticAnswerCache, get_answer_cache
+from .corpus import LegalCorpus, LegalCorpusError, get_legal_corpus
+from .notices import NOTICE_TYPES, render_notice
+from .clause_cache import ClauseExplanationCache, get_clause_cache, warm_up_clause_cache
+
+__all__ = [
+    "LawUnit",
+    "LawArticleLoader",
+    "parse_law_articles",
+    "format_law_units",
+    "search_law_units",
+    "PrecedentLoader",
+    "format_precedents",
+    "search_precedents",
+    "SemanticAnswerCache",
+    "get_answer_cache",
+    "LegalCorpus",
+    "LegalCorpusError",
+    "get_legal_corpus",
+    "NOTICE_TYPES",
+    "render_notice",
+    "ClauseExplanationCache",
+    "get_clause_cache",
+    "warm_up_clause_cache"
+]
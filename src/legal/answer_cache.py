@@ -0,0 +1,154 @@
+"""
+Semantic Answer Cache - 법률 상담 답변 의미 기반 캐시
+보증금 반환, 차임 5% 상한, 수리 의무처럼 반복되는 질문에 매번 gpt-4o를 호출하지 않도록
+질문 임베딩이 이전 질문과 충분히 비슷하면 저장된 답변을 돌려준다.
+
+- 키 범위(scope): 법령/판례 데이터 버전(LegalCorpus.version) + 언어 (+ 법령 전문 포함 여부)
+  데이터 파일이 바뀌거나 언어가 다르면 같은 질문이라도 적중하지 않는다.
+- 정규화한 질문 텍스트가 같으면 임베딩 없이 바로 적중 (FAQ 버튼)
+- 저장/만료는 LRUCache (최대 항목 수 + TTL)
+"""
+
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from src.utils.cache import LRUCache
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """공백/대소문자/끝 문장부호 차이를 무시한 질문 키"""
+    return _WHITESPACE.sub(" ", question).strip().rstrip("?.!？。 ").lower()
+
+
+class SemanticAnswerCache:
+    """
+    질문 -> 답변 캐시 (정확 일치 + 임베딩 유사도)
+
+    Args:
+        encode: 질문 -> 임베딩 함수 (None이거나 None을 반환하면 정확 일치만 사용)
+        threshold: 유사 질문으로 볼 최소 코사인 유사도
+        maxsize: 최대 저장 답변 수
+        ttl: 답변 유효 시간(초), None이면 만료 없음
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[str], Optional[List[float]]] = None,
+        threshold: float = 0.92,
+        maxsize: int = 256,
+        ttl: Optional[float] = None
+    ):
+        self.encode = encode
+        self.threshold = threshold
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)  # (scope, 질문 키) -> (정규화 임베딩, 답변)
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.encode_errors = 0
+
+    def _embed(self, question: str) -> Optional[np.ndarray]:
+        if self.encode is None:
+            return None
+        try:
+            embedding = self.encode(question)
+        except Exception as e:
+            self.encode_errors += 1
+            print(f"Warning: answer cache embedding failed ({e}); exact match only")
+            return None
+        if embedding is None:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, question: str, scope: Hashable) -> Optional[str]:
+        """캐시된 답변 (없으면 None)"""
+        key = (scope, normalize_question(question))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._count("exact_hits")
+            return entry[1]
+
+        vector = self._embed(question)
+        if vector is not None:
+            candidates = [
+                (entry_key, entry_vector) for entry_key, (entry_vector, _) in self._entries.items()
+                if entry_key[0] == scope and entry_vector is not None
+            ]
+            if candidates:
+                similarities = np.stack([v for _, v in candidates]) @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    entry = self._entries.get(candidates[best][0])  # LRU 순서 갱신
+                    if entry is not None:
+                        self._count("semantic_hits")
+                        return entry[1]
+
+        self._count("misses")
+        return None
+
+    def put(self, question: str, scope: Hashable, answer: str):
+        self._entries.put((scope, normalize_question(question)), (self._embed(question), answer))
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries.stats()
+        hits = self.exact_hits + self.semantic_hits
+        total = hits + self.misses
+        return {
+            "size": entries["size"],
+            "maxsize": entries["maxsize"],
+            "ttl": entries["ttl"],
+            "evictions": entries["evictions"],
+            "threshold": self.threshold,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "encode_errors": self.encode_errors,
+            "hit_rate": hits / total if total else None,
+        }
+
+
+def _encode_with_law_index(question: str) -> Optional[List[float]]:
+    """법령 검색기와 같은 임베딩 모델/쿼리 LRU로 질문 임베딩"""
+    from .articles import get_law_index
+
+    return get_law_index().embed_query(question)
+
+
+_cache_lock = threading.Lock()
+_answer_cache: Optional[SemanticAnswerCache] = None
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    """
+    프로세스 공용 상담 답변 캐시 (페이지가 메시지마다 에이전트를 새로 만들어도 공유)
+
+    환경변수: LEGAL_ANSWER_CACHE_SIZE (0이면 비활성), LEGAL_ANSWER_CACHE_TTL (초, 0이면 만료 없음),
+    LEGAL_ANSWER_CACHE_THRESHOLD (코사인 유사도)
+    """
+    global _answer_cache
+    with _cache_lock:
+        if _answer_cache is None:
+            ttl = float(os.getenv("LEGAL_ANSWER_CACHE_TTL", "86400") or 0)
+            _answer_cache = SemanticAnswerCache(
+                encode=_encode_with_law_index,
+                threshold=float(os.getenv("LEGAL_ANSWER_CACHE_THRESHOLD", "0.92")),
+                maxsize=int(os.getenv("LEGAL_ANSWER_CACHE_SIZE", "256")),
+                ttl=ttl if ttl > 0 else None
+            )
+        return _answer_cache
@@ -0,0 +1,155 @@
+"""
+Law Articles - 주택임대차보호법 조/항 단위 분할 및 검색
+프롬프트에 법령 전문을 넣지 않고, 질문과 관련된 조항만 골라 넣기 위한 모듈
+
+- 조(제3조, 제3조의2 ...)를 항(①, ② ...) 단위로 나누고, 호(1. 2. ...)는 소속 항에 포함
+- 단위 id는 조/항 번호로만 만들어 법령 파일이 바뀌어도 같은 조항은 같은 id를 유지
+  (예: 제3조의2 제1항 -> "art3_2-p1", 항이 없는 조 -> "art7")
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+
+DEFAULT_LAW_PATH = Path(__file__).parent.parent.parent / "data" / "legal" / "rental_protection_act.txt"
+
+LAW_COLLECTION = "law_articles"
+
+# 조 제목 줄: "제6조의3(계약갱신 요구 등)" 또는 "제7조" 단독 (본문 속 "제3조제1항에 따른..."은 제외)
+_ARTICLE_HEADER = re.compile(r"^제\s*(\d+)\s*조(?:의\s*(\d+))?\s*(?:\((.+?)\)|$)")
+_PARAGRAPH_MARKS = "①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮⑯⑰⑱⑲⑳"
+
+
+class LawUnit(NamedTuple):
+    """법령 검색 단위 (조 또는 항)"""
+    id: str
+    article: str  # "제3조의2"
+    title: str  # "보증금의 회수"
+    paragraph: int  # 항 번호 (항이 없는 조는 0)
+    text: str
+
+    @property
+    def citation(self) -> str:
+        """인용 표기 (예: "제3조의2 제1항(보증금의 회수)")"""
+        paragraph = f" 제{self.paragraph}항" if self.paragraph else ""
+        title = f"({self.title})" if self.title else ""
+        return f"{self.article}{paragraph}{title}"
+
+    def to_document(self):
+        # src.rag는 임베딩 라이브러리를 불러오므로 인덱싱할 때만 import
+        from src.rag.loader import BenefitDocument
+
+        return BenefitDocument(
+            f"{self.citation}\n{self.text}",
+            {
+                "id": self.id,
+                "article": self.article,
+                "title": self.title,
+                "paragraph": self.paragraph,
+                "citation": self.citation,
+            }
+        )
+
+
+def parse_law_articles(text: str) -> List[LawUnit]:
+    """
+    법령 텍스트 -> 조/항 단위 리스트
+
+    조 제목 줄("제6조의3(계약갱신 요구 등)") 이전의 머리말은 버린다.
+    """
+    units: List[LawUnit] = []
+    article = title = article_id = None
+    paragraph = 0
+    lines: List[str] = []
+
+    def flush():
+        if article is not None and lines:
+            unit_id = f"{article_id}-p{paragraph}" if paragraph else article_id
+            units.append(LawUnit(unit_id, article, title, paragraph, "\n".join(lines)))
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+
+        header = _ARTICLE_HEADER.match(line)
+        if header:
+            flush()
+            number, sub, title = header.group(1), header.group(2), header.group(3) or ""
+            article = f"제{number}조" + (f"의{sub}" if sub else "")
+            article_id = f"art{number}" + (f"_{sub}" if sub else "")
+            paragraph = 0
+            lines = []
+            rest = line[header.end():].strip()
+            if not rest:
+                continue
+            line = rest
+
+        if article is None:
+            continue
+
+        if line[0] in _PARAGRAPH_MARKS:
+            flush()
+            paragraph = _PARAGRAPH_MARKS.index(line[0]) + 1
+            lines = [line]
+        else:
+            # 호(1. 2. ...)와 이어지는 문장은 현재 항에 포함
+            lines.append(line)
+
+    flush()
+    return units
+
+
+def format_law_units(units: List[LawUnit]) -> str:
+    """프롬프트용 조항 목록 (주어진 순서 = 관련도 순)"""
+    return "\n\n".join(f"[{unit.citation}]\n{unit.text}" for unit in units)
+
+
+def unit_from_hit(hit: Dict[str, Any]) -> LawUnit:
+    """검색 결과 -> LawUnit (문서 본문 첫 줄은 인용 표기)"""
+    metadata = hit["metadata"]
+    text = hit["content"].split("\n", 1)[-1]
+    return LawUnit(metadata["id"], metadata["article"], metadata["title"], metadata["paragraph"], text)
+
+
+class LawArticleLoader:
+    """
+    법령 텍스트 -> 조/항 단위 문서 (CorpusManager 로더)
+
+    data_path를 주지 않으면 프로세스 공용 LegalCorpus의 파싱 결과를 그대로 쓴다.
+    """
+
+    def __init__(self, data_path: str = None):
+        self.data_path = Path(data_path) if data_path else None
+
+    def load_units(self) -> List[LawUnit]:
+        if self.data_path is None:
+            from .corpus import get_legal_corpus
+
+            return list(get_legal_corpus().law_units)
+        if not self.data_path.exists():
+            print(f"Warning: {self.data_path} not found")
+            return []
+        return parse_law_articles(self.data_path.read_text(encoding="utf-8"))
+
+    def load(self) -> list:
+        return [unit.to_document() for unit in self.load_units()]
+
+
+def get_law_index():
+    """조/항 단위 법령 검색기 (프로세스 공용 CorpusManager의 law_articles 컬렉션)"""
+    from src.rag.corpus import get_corpus_manager
+    from .corpus import sync_on_change
+
+    return sync_on_change(get_corpus_manager().register(LAW_COLLECTION, LawArticleLoader()))
+
+
+def search_law_units(query: str, k: int = 4) -> List[LawUnit]:
+    """질문과 관련된 상위 k개 조/항"""
+    return [unit_from_hit(hit) for hit in get_law_index().search(query, n_results=k)]
+
+
+if __name__ == "__main__":
+    for unit in LawArticleLoader().load_units():
+        print(f"{unit.id:>10} | {unit.citation} | {unit.text[:40]}...")
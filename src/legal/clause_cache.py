@@ -0,0 +1,181 @@
+"""
+Clause Explanation Cache - 계약서 조항 해석 영구 캐시
+사용자가 붙여넣는 조항은 대부분 표준 문구(COMMON_SPECIAL_CLAUSES 등)이므로
+(정규화한 조항 텍스트, 언어, 법령 데이터 버전) -> 해석을 SQLite에 저장해 같은 조항은 모델 호출 없이 답한다.
+해석은 법령 조문을 인용하므로 LegalCorpus.version이 바뀌면(법령/판례 파일 수정) 적중하지 않는다.
+
+오프라인 워밍업 (번들된 특약 조항 해석을 미리 계산):
+    python -m src.legal.clause_cache --languages KO EN
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+
+DEFAULT_CLAUSE_CACHE_PATH = Path(__file__).parent.parent.parent / "data" / "legal" / "clause_explanations.db"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_clause(clause: str) -> str:
+    """유니코드(NFC)/줄바꿈/공백 차이를 무시한 조항 텍스트"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", clause)).strip()
+
+
+class ClauseExplanationCache:
+    """SQLite 기반 조항 해석 캐시"""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(clause_explanations)")}
+            if columns and "version" not in columns:
+                # 버전 없이 저장된 해석은 어떤 법령 기준인지 알 수 없으므로 버림 (캐시일 뿐)
+                conn.execute("DROP TABLE clause_explanations")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS clause_explanations (
+                clause_hash TEXT,
+                language TEXT,
+                version TEXT,
+                clause TEXT,
+                explanation TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (clause_hash, language, version)
+            )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        # 호출마다 연결을 열어 스레드/프로세스 간 공유 문제를 피함
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:  # 정상 종료 시 commit
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def clause_hash(clause: str) -> str:
+        return hashlib.sha256(normalize_clause(clause).encode("utf-8")).hexdigest()
+
+    def get(self, clause: str, language: str, version: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT explanation FROM clause_explanations WHERE clause_hash = ? AND language = ? AND version = ?",
+                (self.clause_hash(clause), language, version)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, clause: str, language: str, version: str, explanation: str):
+        """해석 저장 (이미 있으면 덮어씀)"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO clause_explanations (clause_hash, language, version, clause, explanation) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.clause_hash(clause), language, version, normalize_clause(clause), explanation)
+            )
+
+    def prune(self, version: str) -> int:
+        """다른 법령 데이터 버전의 해석 삭제 -> 삭제 건수"""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM clause_explanations WHERE version != ?", (version,)).rowcount
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM clause_explanations").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None
+        }
+
+
+_cache_lock = threading.Lock()
+_clause_cache: Optional[ClauseExplanationCache] = None
+
+
+def get_clause_cache() -> ClauseExplanationCache:
+    """프로세스 공용 조항 해석 캐시 (경로: LEGAL_CLAUSE_CACHE_PATH)"""
+    global _clause_cache
+    with _cache_lock:
+        if _clause_cache is None:
+            _clause_cache = ClauseExplanationCache(os.getenv("LEGAL_CLAUSE_CACHE_PATH") or DEFAULT_CLAUSE_CACHE_PATH)
+        return _clause_cache
+
+
+def warm_up_clause_cache(
+    agent,
+    clauses: Iterable[str] = None,
+    languages: Iterable[str] = ("KO", "EN"),
+    force: bool = False
+) -> Dict[str, int]:
+    """
+    조항 해석 미리 계산 (현재 법령 버전으로 이미 캐시된 조항은 건너뜀)
+
+    이전 법령 버전의 해석은 먼저 정리한다.
+
+    Args:
+        agent: LegalAdvisorAgent
+        clauses: 조항 목록 (None이면 COMMON_SPECIAL_CLAUSES 전체)
+        languages: 미리 계산할 언어
+        force: True면 캐시 여부와 관계없이 다시 계산해 덮어씀
+
+    Returns:
+        {"computed": n, "skipped": n, "pruned": n}
+    """
+    if clauses is None:
+        from src.agents.negotiator import COMMON_SPECIAL_CLAUSES
+
+        clauses = COMMON_SPECIAL_CLAUSES.values()
+
+    cache = get_clause_cache()
+    version = agent.corpus.version
+    result = {"computed": 0, "skipped": 0, "pruned": cache.prune(version)}
+    for clause in clauses:
+        for language in languages:
+            if not force and cache.get(clause, language, version) is not None:
+                result["skipped"] += 1
+                continue
+            explanation = agent.explain_contract_clause(clause, language=language, use_cache=False)
+            cache.put(clause, language, version, explanation)
+            result["computed"] += 1
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute explanations for the bundled special clauses")
+    parser.add_argument("--languages", nargs="+", default=["KO", "EN"])
+    parser.add_argument("--force", action="store_true", help="이미 캐시된 조항도 다시 계산")
+    args = parser.parse_args()
+
+    from src.agents.legal import LegalAdvisorAgent
+
+    result = warm_up_clause_cache(LegalAdvisorAgent(), languages=args.languages, force=args.force)
+    print(f"Clause cache warm-up: {result['computed']} computed, {result['skipped']} already cached, "
+          f"{result['pruned']} stale pruned "
+          f"({len(get_clause_cache())} entries in {get_clause_cache().path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Legal Corpus - 프로세스 공용 법령/판례 데이터 (읽기 전용)
+에이전트를 만들 때마다 법령·판례 파일을 다시 읽지 않도록 프로세스에서 한 번만 로드하고,
+파일이 바뀌었을 때(mtime 변경)만 다시 로드한다.
+
+- 경로는 모듈 기준 절대 경로 (실행 위치와 무관)
+- 데이터 버전은 파일 내용 해시 (체크아웃/복사로 mtime만 바뀌면 버전은 그대로)
+- 파일이 없거나 깨졌으면 LegalCorpusError (자리표시 문자열로 대체하지 않음)
+- 다시 로드가 실패하면 경고와 함께 마지막으로 정상 로드된 데이터를 계속 사용
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from .articles import DEFAULT_LAW_PATH, LawUnit, parse_law_articles
+from .precedents import DEFAULT_PRECEDENTS_PATH
+
+
+class LegalCorpusError(Exception):
+    """법령/판례 데이터 로드 실패"""
+
+
+class LegalCorpus(NamedTuple):
+    """
+    파싱된 법령 + 판례 스냅샷 (불변)
+
+    version은 두 파일 내용의 sha256으로 만들어, 내용이 바뀔 때만 답변/조항 캐시 키 등이 함께 바뀐다.
+    (mtime은 다시 로드할지 판단하는 데만 사용 - 새 체크아웃, Docker COPY, touch로는 캐시가 무효화되지 않음)
+    """
+    law_text: str
+    law_units: Tuple[LawUnit, ...]
+    precedents: Tuple[Mapping[str, Any], ...]
+    version: str
+    loaded_at: float
+
+
+def _freeze(item: Dict[str, Any]) -> Mapping[str, Any]:
+    """판례 항목을 읽기 전용으로 (리스트 필드는 튜플로)"""
+    return MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in item.items()
+    })
+
+
+def _file_versions(law_path: Path, precedents_path: Path) -> Tuple[int, int]:
+    try:
+        return law_path.stat().st_mtime_ns, precedents_path.stat().st_mtime_ns
+    except FileNotFoundError as e:
+        raise LegalCorpusError(f"Legal data file not found: {e.filename}") from e
+
+
+def content_version(law_bytes: bytes, precedents_bytes: bytes) -> str:
+    """법령/판례 파일 내용 -> 데이터 버전 (파일별 sha256을 다시 해시)"""
+    digest = hashlib.sha256()
+    for data in (law_bytes, precedents_bytes):
+        digest.update(hashlib.sha256(data).digest())
+    return digest.hexdigest()[:16]
+
+
+def load_legal_corpus(law_path: str = None, precedents_path: str = None) -> LegalCorpus:
+    """법령/판례 파일 -> LegalCorpus (실패 시 LegalCorpusError)"""
+    law_path = Path(law_path or DEFAULT_LAW_PATH)
+    precedents_path = Path(precedents_path or DEFAULT_PRECEDENTS_PATH)
+    _file_versions(law_path, precedents_path)  # 없는 파일은 "not found" 오류로
+
+    try:
+        law_bytes = law_path.read_bytes()
+        precedents_bytes = precedents_path.read_bytes()
+        law_text = law_bytes.decode("utf-8")
+        precedents = json.loads(precedents_bytes.decode("utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise LegalCorpusError(f"Failed to read legal data: {e}") from e
+
+    if not isinstance(precedents, list):
+        raise LegalCorpusError(f"{precedents_path} must contain a JSON array of precedents")
+    law_units = parse_law_articles(law_text)
+    if not law_units:
+        raise LegalCorpusError(f"No articles found in {law_path}")
+
+    return LegalCorpus(
+        law_text=law_text,
+        law_units=tuple(law_units),
+        precedents=tuple(_freeze(p) for p in precedents),
+        version=content_version(law_bytes, precedents_bytes),
+        loaded_at=time.time()
+    )
+
+
+_corpus_lock = threading.Lock()
+_corpus: Optional[LegalCorpus] = None
+_corpus_mtimes: Optional[Tuple[int, int]] = None
+_stats: Dict[str, Any] = {"loads": 0, "reload_failures": 0, "last_error": None}
+
+
+def get_legal_corpus() -> LegalCorpus:
+    """
+    프로세스 공용 LegalCorpus (파일이 바뀌었으면 다시 로드)
+
+    처음 로드가 실패하면 LegalCorpusError를 그대로 올린다.
+    """
+    global _corpus, _corpus_mtimes
+    with _corpus_lock:
+        try:
+            mtimes = _file_versions(Path(DEFAULT_LAW_PATH), Path(DEFAULT_PRECEDENTS_PATH))
+            if _corpus is not None and mtimes == _corpus_mtimes:
+                return _corpus
+            corpus = load_legal_corpus()
+        except LegalCorpusError as e:
+            _stats["last_error"] = str(e)
+            if _corpus is None:
+                raise
+            _stats["reload_failures"] += 1
+            print(f"Warning: legal corpus reload failed ({e}); keeping version {_corpus.version}")
+            return _corpus
+
+        if _corpus is not None and corpus.version != _corpus.version:
+            print(f"Reloaded legal corpus: version {_corpus.version} -> {corpus.version}")
+        _corpus, _corpus_mtimes = corpus, mtimes
+        _stats["loads"] += 1
+        _stats["last_error"] = None
+        return _corpus
+
+
+def legal_corpus_stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "version": _corpus.version if _corpus else None,
+        "law_units": len(_corpus.law_units) if _corpus else 0,
+        "precedents": len(_corpus.precedents) if _corpus else 0,
+    }
+
+
+_synced_versions: Dict[str, str] = {}
+_sync_lock = threading.Lock()
+
+
+def sync_on_change(index):
+    """
+    법령/판례가 다시 로드됐으면 해당 검색 인덱스도 증분 동기화 (쓰기 역할 프로세스만)
+
+    코퍼스 스냅샷을 먼저 받아 코퍼스 락을 놓은 뒤 동기화한다.
+    (동기화는 인덱스 쓰기 락을 기다리고, 쓰기 락을 잡은 검색기 생성은 로더에서 코퍼스 락을 기다리므로
+    두 락을 겹쳐 잡으면 교착) 동시에 들어온 첫 요청들의 중복 동기화는 별도의 동기화 락으로 막는다.
+    """
+    version = get_legal_corpus().version
+    with _sync_lock:
+        if _synced_versions.get(index.collection_name) != version:
+            if index.role == "writer":
+                index.sync()
+            _synced_versions[index.collection_name] = version
+    return index
+
+
+def precedent_dicts(precedents: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """읽기 전용 판례 -> JSON 직렬화 가능한 dict 목록"""
+    return [dict(p) for p in precedents]
@@ -0,0 +1,212 @@
+"""
+Notice Templates - 통지서 로컬 렌더링
+통지서 유형마다 제목·법적 근거·필수 항목이 정해져 있으므로
+필수 항목이 모두 있으면 LLM 호출 없이 템플릿으로 바로 작성한다.
+(문장 다듬기를 요청했거나 항목이 빠진 경우에만 LLM 사용 - LegalAdvisorAgent.generate_notice_letter)
+"""
+
+from datetime import date
+from typing import Any, Dict, List
+
+
+NOTICE_TYPES: Dict[str, Dict[str, Any]] = {
+    "갱신거절": {
+        "title": "임대차계약 갱신거절 통지서",
+        "title_en": "Notice of Refusal to Renew Lease",
+        "required_fields": ["contract_end_date", "reason"],
+        "legal_basis": "주택임대차보호법 제6조의3",
+        "legal_basis_en": "Article 6-3 of the Housing Lease Protection Act",
+        "body": (
+            "본인은 {contract_end_date} 만료 예정인 임대차계약과 관련하여\n"
+            "{legal_basis}에 따라 계약을 갱신하지 않음을 통지합니다.\n\n"
+            "사유: {reason}\n\n"
+            "계약 만료일에 맞추어 주택 인도 및 보증금 반환 절차를 진행하여 주시기 바랍니다."
+        ),
+        "body_en": (
+            "Regarding the lease agreement expiring on {contract_end_date}, I hereby give notice\n"
+            "under {legal_basis} that the lease will not be renewed.\n\n"
+            "Reason: {reason}\n\n"
+            "Please proceed with the handover of the premises and the return of the deposit on the expiry date."
+        ),
+    },
+    "수리요청": {
+        "title": "시설물 수리 요청서",
+        "title_en": "Request for Repairs",
+        "required_fields": ["repair_items", "urgency"],
+        "legal_basis": "민법 제623조 (임대인의 수선의무)",
+        "legal_basis_en": "Article 623 of the Civil Act (landlord's duty to repair)",
+        "body": (
+            "임차 주택의 아래 시설물에 하자가 있어 수리를 요청합니다.\n\n"
+            "수리 대상: {repair_items}\n"
+            "긴급도: {urgency}\n\n"
+            "{legal_basis}에 따라 임대인은 임차인이 주택을 사용·수익할 수 있는 상태를 유지할 의무가 있습니다.\n"
+            "조속히 수리하여 주시기 바라며, 수리가 지연될 경우 임차인이 직접 수리한 후\n"
+            "그 비용(필요비)의 상환을 청구할 수 있음을 알려드립니다."
+        ),
+        "body_en": (
+            "I request repairs to the following defects in the leased premises.\n\n"
+            "Items: {repair_items}\n"
+            "Urgency: {urgency}\n\n"
+            "Under {legal_basis}, the landlord must keep the premises fit for use.\n"
+            "Please carry out the repairs promptly. If they are delayed, I may have them done myself\n"
+            "and claim reimbursement of the necessary costs."
+        ),
+    },
+    "보증금반환": {
+        "title": "임대차보증금 반환 청구서",
+        "title_en": "Demand for Return of Lease Deposit",
+        "required_fields": ["deposit_amount", "contract_end_date", "deadline"],
+        "field_types": {"deposit_amount": "amount"},
+        "legal_basis": "주택임대차보호법 제3조의2",
+        "legal_basis_en": "Article 3-2 of the Housing Lease Protection Act",
+        "body": (
+            "본 임차인은 {contract_end_date}자로 임대차계약이 종료되었음에도\n"
+            "아직까지 보증금 {deposit_amount}을(를) 반환받지 못하였습니다.\n\n"
+            "{legal_basis}에 따라 {deadline}까지 보증금 전액을 반환하여 주시기 바랍니다.\n"
+            "기한 내 이행되지 않을 경우 임차권등기명령 신청, 지연손해금 청구 등\n"
+            "법적 조치를 취할 수 있음을 알려드립니다."
+        ),
+        "body_en": (
+            "Although the lease ended on {contract_end_date}, the deposit of {deposit_amount}\n"
+            "has not yet been returned.\n\n"
+            "Under {legal_basis}, please return the full deposit by {deadline}.\n"
+            "If it is not returned by then, I may take legal action, including applying for\n"
+            "a lease registration order and claiming damages for the delay."
+        ),
+    },
+    "증액거부": {
+        "title": "차임 증액 거부 통지서",
+        "title_en": "Notice of Refusal of Rent Increase",
+        "required_fields": ["requested_increase", "legal_limit"],
+        # 요청 증액은 금액일 수도 비율일 수도 있으므로 단위를 정하지 않음 (requested_increase_unit으로 지정)
+        "field_types": {"legal_limit": "percent"},
+        "legal_basis": "주택임대차보호법 제7조 (5% 상한)",
+        "legal_basis_en": "Article 7 of the Housing Lease Protection Act (5% cap)",
+        "body": (
+            "임대인께서 요청하신 차임(보증금) 증액 {requested_increase}에 대하여 회신드립니다.\n\n"
+            "{legal_basis}에 따라 증액 청구는 약정한 차임 등의 20분의 1을 초과할 수 없으므로\n"
+            "법정 상한인 {legal_limit}을(를) 넘는 증액 요청에는 응할 수 없음을 통지합니다."
+        ),
+        "body_en": (
+            "This is my response to your request to increase the rent (deposit) by {requested_increase}.\n\n"
+            "Under {legal_basis}, an increase may not exceed one-twentieth of the agreed rent,\n"
+            "so I cannot accept any increase beyond the legal limit of {legal_limit}."
+        ),
+    },
+}
+
+
+# details의 "{항목}_unit" 값 -> 표기 타입 (템플릿의 field_types보다 우선)
+UNIT_FIELD_TYPES = {"%": "percent", "원": "amount", "만원": "amount_10k"}
+
+
+def missing_fields(notice_type: str, details: Dict[str, Any]) -> List[str]:
+    """필수 항목 중 비어 있는 것"""
+    return [
+        field for field in NOTICE_TYPES[notice_type]["required_fields"]
+        if details.get(field) in (None, "", [])
+    ]
+
+
+def _format_value(field: str, value: Any, field_type: str = None, english: bool = False) -> str:
+    """
+    항목 값 표기 (숫자는 field_types에 정해진 항목만 단위를 붙임)
+
+    - "amount": 금액 (200000000 -> "200,000,000원" / "KRW 200,000,000")
+    - "amount_10k": 만원 단위 금액 (5 -> "5만원" / "KRW 50,000")
+    - "percent": 비율 (5 -> "5%", 0~100 밖이면 ValueError)
+    단위가 정해지지 않은 숫자와 문자열은 그대로, 리스트는 쉼표로 연결한다.
+    """
+    is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if is_number and field_type == "amount":
+        return f"KRW {value:,}" if english else f"{value:,}원"
+    if is_number and field_type == "amount_10k":
+        return f"KRW {value * 10000:,}" if english else f"{value:,}만원"
+    if is_number and field_type == "percent":
+        if not 0 <= value <= 100:
+            raise ValueError(f"{field} must be a percentage between 0 and 100, got {value}")
+        return f"{value:g}%"
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+
+def render_notice(
+    notice_type: str,
+    sender_name: str,
+    details: Dict[str, Any],
+    language: str = "KO",
+    issued_on: date = None
+) -> str:
+    """
+    템플릿으로 통지서 작성 (LLM 미사용)
+
+    Args:
+        notice_type: NOTICE_TYPES 키
+        sender_name: 발신자 이름
+        details: 필수 항목 + 선택 항목(recipient_name, address, "{항목}_unit": "%"/"원"/"만원")
+        language: "KO"가 아니면 영문
+        issued_on: 작성일 (None이면 오늘)
+
+    Raises:
+        ValueError: 필수 항목이 빠졌거나, 단위가 UNIT_FIELD_TYPES에 없거나, 비율 항목 값이 0~100 밖인 경우
+    """
+    template = NOTICE_TYPES[notice_type]
+    missing = missing_fields(notice_type, details)
+    if missing:
+        raise ValueError(f"Missing required fields for {notice_type}: {missing}")
+
+    # 에이전트와 같은 규칙: KO가 아니면 영문
+    english = language != "KO"
+    issued_on = issued_on or date.today()
+    field_types = dict(template.get("field_types", {}))
+    for key in template["required_fields"]:
+        unit = details.get(f"{key}_unit")
+        if unit is None:
+            continue
+        if unit not in UNIT_FIELD_TYPES:
+            raise ValueError(f"Unknown unit for {key}: {unit} (supported: {list(UNIT_FIELD_TYPES)})")
+        field_types[key] = UNIT_FIELD_TYPES[unit]
+    values = {
+        key: _format_value(key, value, field_types.get(key), english)
+        for key, value in details.items()
+    }
+    legal_basis = template["legal_basis_en"] if english else template["legal_basis"]
+    body = template["body_en" if english else "body"].format(**{**values, "legal_basis": legal_basis})
+
+    if english:
+        recipient = details.get("recipient_name") or "Landlord"
+        lines = [
+            f"[{template['title_en']}]",
+            "",
+            f"To: {recipient}",
+            f"From: {sender_name}",
+        ]
+        address_label, date_line, sign_off = "Property", issued_on.strftime("%B %d, %Y"), f"Sender: {sender_name}"
+    else:
+        recipient = details.get("recipient_name") or "임대인"
+        lines = [
+            f"[{template['title']}]",
+            "",
+            f"수신: {recipient} 귀하",
+            f"발신: {sender_name}",
+        ]
+        address_label, date_line, sign_off = "목적물", f"{issued_on.year}년 {issued_on.month}월 {issued_on.day}일", f"발신인 {sender_name} (인)"
+
+    if details.get("address"):
+        lines.append(f"{address_label}: {details['address']}")
+    lines += ["", body, "", date_line, sign_off]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(render_notice(
+        "보증금반환",
+        "홍길동",
+        {"deposit_amount": 200000000, "contract_end_date": "2025-01-31", "deadline": "2025-02-14"}
+    ))
+
+    # 증액거부: 법정 상한은 %로, 요청 증액은 지정한 단위로 표기
+    notice = render_notice("증액거부", "홍길동", {"requested_increase": 5, "requested_increase_unit": "만원", "legal_limit": 5})
+    assert "법정 상한인 5%" in notice and "증액 5만원" in notice, notice
+    print("\n" + notice)
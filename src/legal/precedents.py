@@ -0,0 +1,90 @@
+"""
+Precedents - 판례 인덱싱 및 검색
+판례 전체를 프롬프트에 넣지 않고, 질문과 관련된 상위 k건만 골라 넣기 위한 모듈
+
+검색 텍스트는 분류(category) + 제목 + 판결 요지(summary) + 핵심 쟁점(key_points)으로 만든다.
+판례가 수천 건으로 늘어나도 프롬프트에는 k건만 들어가므로 프롬프트 크기는 일정하다.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+DEFAULT_PRECEDENTS_PATH = Path(__file__).parent.parent.parent / "data" / "legal" / "precedents.json"
+
+PRECEDENT_COLLECTION = "precedents"
+
+# ChromaDB 메타데이터는 리스트를 허용하지 않으므로 key_points는 줄바꿈으로 이어 저장
+_KEY_POINTS_SEPARATOR = "\n"
+
+
+def precedent_content(item: Dict[str, Any]) -> str:
+    """판례 -> 검색용 텍스트"""
+    key_points = " ".join(item.get("key_points", []))
+    return f"[{item.get('category', '')}] {item.get('title', '')}\n{item.get('summary', '')}\n{key_points}"
+
+
+def precedent_metadata(item: Dict[str, Any]) -> Dict[str, Any]:
+    """판례 -> 메타데이터 (스칼라 필드 + 이어 붙인 key_points)"""
+    metadata = {
+        key: value for key, value in item.items()
+        if isinstance(value, (str, int, float, bool))
+    }
+    metadata["key_points"] = _KEY_POINTS_SEPARATOR.join(item.get("key_points", []))
+    return metadata
+
+
+def precedent_from_hit(hit: Dict[str, Any]) -> Dict[str, Any]:
+    """검색 결과 -> precedents.json 항목 형태"""
+    precedent = dict(hit["metadata"])
+    key_points = precedent.get("key_points") or ""
+    precedent["key_points"] = key_points.split(_KEY_POINTS_SEPARATOR) if key_points else []
+    return precedent
+
+
+class PrecedentLoader:
+    """
+    precedents.json -> 판례 문서 (CorpusManager 로더)
+
+    data_path를 주지 않으면 프로세스 공용 LegalCorpus의 판례를 그대로 쓴다.
+    """
+
+    def __init__(self, data_path: str = None):
+        self.data_path = Path(data_path) if data_path else None
+
+    def load(self) -> list:
+        # src.rag는 임베딩 라이브러리를 불러오므로 인덱싱할 때만 import
+        from src.rag.loader import BenefitDocument, JsonDocumentLoader
+
+        if self.data_path is not None:
+            return JsonDocumentLoader(self.data_path, precedent_content, precedent_metadata).load()
+
+        from .corpus import get_legal_corpus
+
+        return [
+            BenefitDocument(precedent_content(item), {**precedent_metadata(item), "id": str(item["id"])})
+            for item in get_legal_corpus().precedents
+        ]
+
+
+def get_precedent_index():
+    """판례 검색기 (프로세스 공용 CorpusManager의 precedents 컬렉션)"""
+    from src.rag.corpus import get_corpus_manager
+    from .corpus import sync_on_change
+
+    return sync_on_change(get_corpus_manager().register(PRECEDENT_COLLECTION, PrecedentLoader()))
+
+
+def search_precedents(query: str, k: int = 3) -> List[Dict[str, Any]]:
+    """질문과 관련된 상위 k개 판례"""
+    return [precedent_from_hit(hit) for hit in get_precedent_index().search(query, n_results=k)]
+
+
+def format_precedents(precedents: List[Dict[str, Any]]) -> str:
+    """프롬프트용 판례 요약 목록 (한 줄에 1건)"""
+    return "".join(f"- {p['title']} ({p['case_number']}): {p['summary']}\n" for p in precedents)
+
+
+if __name__ == "__main__":
+    for precedent in search_precedents("전세금을 돌려받지 못하고 있어요"):
+        print(f"{precedent['id']} | {precedent['category']} | {precedent['title']}")
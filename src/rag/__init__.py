@@ -2,7 +2,27 @@
 RAG Package - 벡터 기반 검색 파이프라인
 """
 
-from .loader import BenefitLoader, BenefitDocument
-from .retriever import BenefitRetriever
+from .loader import BenefitLoader, BenefitDocument, JsonDocumentLoader, eligibility_filter
+from .retriever import BenefitRetriever, get_retriever, registry_status
+from .vector_index import VectorIndex
+from .bm25 import BM25Index, char_ngrams
+from .batcher import QueryMicroBatcher
+from .corpus import CorpusManager, get_corpus_manager
+from .chunker import TextChunker
 
-__all__ = ["BenefitLoader", "BenefitDocument", "BenefitRetriever"]
+__all__ = [
+    "BenefitLoader",
+    "BenefitDocument",
+    "JsonDocumentLoader",
+    "eligibility_filter",
+    "BenefitRetriever",
+    "get_retriever",
+    "registry_status",
+    "VectorIndex",
+    "BM25Index",
+    "char_ngrams",
+    "QueryMicroBatcher",
+    "CorpusManager",
+    "get_corpus_manager",
+    "TextChunker"
+]
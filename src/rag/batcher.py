@@ -0,0 +1,131 @@
+"""
+Query Micro-Batcher - 동시 검색 요청을 짧게 모아 한 번에 처리
+Streamlit/n8n에서 동시에 들어오는 검색을 encode 1회 + 인덱스 조회 1회로 묶어 처리량을 높임
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+
+class QueryMicroBatcher:
+    """
+    asyncio 기반 검색 마이크로 배처
+
+    첫 요청이 들어오면 최대 max_wait_ms 동안(또는 max_batch_size개가 찰 때까지) 요청을 모은 뒤
+    같은 필터끼리 묶어 search_many를 스레드 풀에서 한 번 호출한다.
+    max_wait_ms가 배치로 인해 추가되는 지연의 상한이다.
+
+    Args:
+        search_many: (queries, n_results, filters) -> 쿼리별 결과 리스트
+        max_batch_size: 한 배치의 최대 쿼리 수
+        max_wait_ms: 배치를 모으는 최대 대기 시간 (밀리초)
+    """
+
+    def __init__(
+        self,
+        search_many: Callable[[List[str], int, Optional[Dict[str, Any]]], List[List[Dict[str, Any]]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        self.search_many = search_many
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.batches = 0
+        self.queries = 0
+
+    async def search(
+        self,
+        query: str,
+        n_results: int = 3,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """검색 요청 (다른 동시 요청과 묶여서 실행됨)"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            # 이벤트 루프 안에서 큐/워커를 생성 (서버 시작 루프에 바인딩)
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        # put_nowait: 워커 생존 확인과 큐 삽입 사이에 다른 코루틴이 끼어들지 않도록 (큐는 무제한)
+        self._queue.put_nowait((query, n_results, filters, future))
+        return await future
+
+    async def _collect(self, batch: list):
+        """첫 요청 이후 max_wait_ms 동안 요청 수집 (워커가 중단돼도 실패 처리할 수 있도록 batch에 바로 추가)"""
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self):
+        batch: list = []
+        try:
+            while True:
+                batch = []
+                await self._collect(batch)
+                await self._process(batch)
+        except BaseException as e:
+            # 워커가 죽으면(취소, 예기치 않은 오류) 처리 중이던 요청과 큐에 남은 요청을 모두 실패 처리
+            # (다음 search 호출이 새 큐/워커를 띄움)
+            error = e if isinstance(e, Exception) else RuntimeError(f"Search batcher stopped ({type(e).__name__})")
+            pending = [item[3] for item in batch]
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait()[3])
+            for future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+
+    async def _process(self, batch: list):
+        loop = asyncio.get_running_loop()
+
+        # 같은 필터끼리 묶음 (where 조건은 배치 단위로만 지정 가능)
+        groups: Dict[str, list] = {}
+        for item in batch:
+            key = json.dumps(item[2], sort_keys=True, ensure_ascii=False)
+            groups.setdefault(key, []).append(item)
+
+        for items in groups.values():
+            queries = [item[0] for item in items]
+            n_results = max(item[1] for item in items)
+            filters = items[0][2]
+            try:
+                results = await loop.run_in_executor(None, self.search_many, queries, n_results, filters)
+            except Exception as e:
+                for *_, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, n, _, future), hits in zip(items, results):
+                if not future.done():
+                    future.set_result(hits[:n])
+            for *_, future in items[len(results):]:
+                if not future.done():
+                    future.set_exception(RuntimeError("search_many returned fewer results than queries"))
+
+        self.batches += 1
+        self.queries += len(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "queries": self.queries,
+            "avg_batch_size": self.queries / self.batches if self.batches else None
+        }
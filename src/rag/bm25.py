@@ -0,0 +1,130 @@
+"""
+BM25 Index - 한국어 문자 n-gram 기반 키워드 검색
+"중기청", "HUG" 같은 짧은 약어 쿼리는 dense 검색에서 순위가 낮게 나오므로
+형태소 분석기 없이 문자 n-gram BM25로 보완 (벡터 검색 결과와 RRF로 결합)
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .vector_index import matches_where
+
+
+_TOKEN_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+def char_ngrams(text: str, n_values: Iterable[int] = (2, 3)) -> List[str]:
+    """
+    문자 n-gram 토큰화
+
+    공백/구두점으로 어절을 나눈 뒤 어절 안에서만 n-gram을 만든다.
+    n보다 짧은 어절("월", "HUG" 등)은 어절 자체를 토큰으로 쓴다.
+    """
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        for n in n_values:
+            if len(word) < n:
+                if n == min(n_values):
+                    tokens.append(word)
+                continue
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+class BM25Index:
+    """
+    증분 갱신 가능한 BM25 (Okapi) 인덱스
+
+    문서별 term frequency와 역색인을 함께 유지하여
+    upsert/delete 시 해당 문서만 갱신한다.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, n_values: Tuple[int, ...] = (2, 3)):
+        self.k1 = k1
+        self.b = b
+        self.n_values = n_values
+
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {doc_id: tf}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._metadatas: Dict[str, Dict[str, Any]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def _remove(self, doc_id: str):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._metadatas.pop(doc_id, None)
+
+    def upsert(self, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]] = None):
+        metadatas = metadatas or [None] * len(ids)
+        with self._lock:
+            for doc_id, text, metadata in zip(ids, texts, metadatas):
+                self._remove(doc_id)
+                terms = Counter(char_ngrams(text or "", self.n_values))
+                self._doc_terms[doc_id] = terms
+                self._doc_lengths[doc_id] = sum(terms.values())
+                self._total_length += self._doc_lengths[doc_id]
+                if metadata:
+                    self._metadatas[doc_id] = metadata
+                for term, tf in terms.items():
+                    self._postings.setdefault(term, {})[doc_id] = tf
+
+    def delete(self, ids: List[str]):
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, float]]:
+        """BM25 점수 상위 문서 [(doc_id, score), ...]"""
+        query_terms = Counter(char_ngrams(query, self.n_values))
+        with self._lock:
+            n_docs = len(self._doc_lengths)
+            if n_docs == 0 or not query_terms:
+                return []
+            avg_length = self._total_length / n_docs
+
+            scores: Dict[str, float] = {}
+            for term, query_tf in query_terms.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length_norm = 1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length
+                    scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+
+            if where:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if matches_where(self._metadatas.get(doc_id, {}), where)
+                }
+
+        return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:n_results]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """여러 순위 목록을 RRF로 결합 -> [(doc_id, fused_score), ...] (내림차순)"""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused.items(), key=lambda x: x[1], reverse=True)
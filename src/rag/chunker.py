@@ -0,0 +1,176 @@
+"""
+Document Chunker - 긴 공고문을 임베딩 모델 입력 길이에 맞게 분할
+ko-sbert 계열은 128 토큰 이후를 잘라내므로, 긴 공모 공고는 뒷부분 자격/일정이 검색에 반영되지 않는다.
+
+- section: 공고문 제목 기호(1., 가., ■, □, ○, [ ], < >, 제N조)와 빈 줄 기준으로 나누고
+           긴 섹션만 토큰 윈도우로 다시 분할
+- window: 겹침(overlap)이 있는 고정 토큰 윈도우
+- 한도는 모델 토큰 기준: 청크 앞에 붙는 header와 [CLS]/[SEP]까지 포함해 max_seq_length(128) 안에 들어가게 자름
+  (토크나이저를 주지 않으면 어절당 서브워드 3개로 넉넉히 추정)
+- 청크 id는 "{parent_id}#c{n}", 메타데이터에 parent_id/chunk_index/chunk_count 기록
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+CHUNK_STRATEGIES = ("section", "window", "none")
+
+# BERT 계열 입력에 항상 붙는 [CLS]/[SEP]
+_SPECIAL_TOKENS = 2
+
+# 공고문 섹션 제목 줄
+_SECTION_HEADING = re.compile(
+    r"^\s*("
+    r"\d+\s*[.)]"            # 1.  2)
+    r"|[가-하]\s*[.)]"        # 가.  나)
+    r"|[■□◆◇○●▶※]"          # 기호 목록
+    r"|\[[^\]]+\]"            # [신청자격]
+    r"|<[^>]+>"               # <모집일정>
+    r"|제\s*\d+\s*조"          # 제3조
+    r")"
+)
+
+
+def chunk_id(parent_id: str, index: int) -> str:
+    return f"{parent_id}#c{index}"
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 서브워드 토큰 수 추정 (한국어 어절은 보통 서브워드 2~3개 -> 어절당 3개)"""
+    return 3 * len(text.split())
+
+
+class TextChunker:
+    """
+    텍스트 분할기
+
+    Args:
+        strategy: "section" / "window" / "none"
+        max_tokens: 청크당 최대 모델 토큰 수 (header와 [CLS]/[SEP] 포함, 기본은 ko-sbert max_seq_length)
+        overlap: 윈도우 간 겹치는 토큰 수
+        count_tokens: 텍스트 -> 토큰 수 (None이면 estimate_tokens, 정확히 세려면 모델 토크나이저 사용)
+    """
+
+    def __init__(
+        self,
+        strategy: str = "section",
+        max_tokens: int = 128,
+        overlap: int = 24,
+        count_tokens: Callable[[str], int] = None
+    ):
+        if strategy not in CHUNK_STRATEGIES:
+            raise ValueError(f"Unknown chunk strategy: {strategy} (supported: {CHUNK_STRATEGIES})")
+        if not 0 <= overlap < max_tokens - _SPECIAL_TOKENS:
+            raise ValueError(f"overlap must be smaller than max_tokens - {_SPECIAL_TOKENS}")
+
+        self.strategy = strategy
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        self.count_tokens = count_tokens or estimate_tokens
+
+    def _budget(self, header: Optional[str] = None) -> int:
+        """
+        본문에 쓸 수 있는 토큰 수 (한도 - 특수 토큰 - header)
+
+        header가 한도의 절반을 넘으면 본문에 절반은 남긴다 (이때 header 뒷부분은 모델에서 잘릴 수 있음).
+        """
+        budget = self.max_tokens - _SPECIAL_TOKENS
+        header_tokens = self.count_tokens(header) if header else 0
+        return max(budget - header_tokens, budget // 2, self.overlap + 1)
+
+    def split(self, text: str, budget: int = None) -> List[str]:
+        """텍스트 -> 청크 문자열 리스트 (빈 텍스트면 빈 리스트, budget: 청크당 토큰 수)"""
+        text = (text or "").strip()
+        if not text:
+            return []
+        budget = budget or self._budget()
+        if self.strategy == "none":
+            return [text]
+        if self.strategy == "window":
+            return self._window(text, budget)
+
+        chunks = []
+        current: List[str] = []
+        current_tokens = 0
+        for section in self._sections(text):
+            tokens = self.count_tokens(section)
+            if tokens > budget:
+                # 긴 섹션은 단독으로 윈도우 분할
+                if current:
+                    chunks.append("\n".join(current))
+                    current, current_tokens = [], 0
+                chunks.extend(self._window(section, budget))
+            elif current_tokens + tokens > budget:
+                chunks.append("\n".join(current))
+                current, current_tokens = [section], tokens
+            else:
+                # 짧은 섹션은 한도 안에서 이어 붙임
+                current.append(section)
+                current_tokens += tokens
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+
+    def _sections(self, text: str) -> List[str]:
+        sections, current = [], []
+        for line in text.splitlines():
+            if not line.strip():
+                if current:
+                    sections.append("\n".join(current))
+                    current = []
+                continue
+            if _SECTION_HEADING.match(line) and current:
+                sections.append("\n".join(current))
+                current = []
+            current.append(line.strip())
+        if current:
+            sections.append("\n".join(current))
+        return sections
+
+    def _window(self, text: str, budget: int) -> List[str]:
+        """어절 단위로 budget 토큰까지 채운 윈도우 (다음 윈도우는 overlap 토큰만큼 되돌아가 시작)"""
+        words = text.split()
+        costs = [self.count_tokens(word) for word in words]
+        if sum(costs) <= budget:
+            return [text]
+
+        chunks = []
+        start = 0
+        while start < len(words):
+            end, used = start, 0
+            # 어절 하나가 한도를 넘더라도 최소 1어절은 담음
+            while end < len(words) and (end == start or used + costs[end] <= budget):
+                used += costs[end]
+                end += 1
+            chunks.append(" ".join(words[start:end]))
+            if end >= len(words):
+                break
+            next_start, overlapped = end, 0
+            while next_start - 1 > start and overlapped + costs[next_start - 1] <= self.overlap:
+                next_start -= 1
+                overlapped += costs[next_start]
+            start = next_start
+        return chunks
+
+    def chunk_document(
+        self,
+        parent_id: str,
+        text: str,
+        metadata: Dict[str, Any],
+        header: Optional[str] = None
+    ) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """
+        문서 1건 -> (청크 id, 청크 텍스트, 청크 메타데이터)
+
+        header(제목/유형/지역 등)는 모든 청크 앞에 붙여 청크만으로도 어떤 공고인지 드러나게 하고,
+        그만큼 청크 본문의 토큰 한도에서 뺀다.
+        """
+        pieces = self.split(text, self._budget(header)) or [""]
+        contents = [f"{header}\n{piece}".strip() if header else piece for piece in pieces]
+        ids = [chunk_id(parent_id, i) for i in range(len(contents))]
+        metadatas = [
+            {**metadata, "id": ids[i], "parent_id": parent_id, "chunk_index": i, "chunk_count": len(contents)}
+            for i in range(len(contents))
+        ]
+        return ids, contents, metadatas
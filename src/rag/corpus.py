@@ -0,0 +1,112 @@
+"""
+Corpus Manager - 여러 이름의 컬렉션을 하나의 임베딩 모델 위에서 운영
+혜택, 판례, 법 조문, 크롤링 공고를 각각의 로더/콘텐츠 빌더로 인덱싱하되
+임베딩 모델과 ChromaDB 클라이언트는 프로세스에 하나만 둔다.
+"""
+
+import os
+import threading
+from typing import Any, Dict, List
+
+from .loader import BenefitLoader
+from .retriever import BenefitRetriever, _get_or_create
+
+
+class CorpusManager:
+    """
+    이름 -> 검색기(BenefitRetriever) 관리자
+
+    컬렉션마다 로더(load() -> List[BenefitDocument])만 다르고
+    임베딩 모델·ChromaDB 클라이언트·검색기 레지스트리는 get_retriever와 공유한다.
+    따라서 코퍼스를 추가해도 모델이 메모리에 다시 올라가지 않는다.
+
+    Args:
+        persist_directory: 인덱스 저장 경로 (None이면 .chroma_db)
+        embedding_model: 모든 컬렉션이 쓰는 임베딩 모델
+        embedding_backend: "torch" 또는 "onnx" (None이면 RAG_EMBEDDING_BACKEND)
+        role: "writer" 또는 "reader" (None이면 RAG_INDEX_ROLE, 기본 "reader")
+    """
+
+    def __init__(
+        self,
+        persist_directory: str = None,
+        embedding_model: str = "jhgan/ko-sbert-nli",
+        embedding_backend: str = None,
+        role: str = None
+    ):
+        self.persist_directory = persist_directory
+        self.embedding_model = embedding_model
+        self.embedding_backend = embedding_backend or os.getenv("RAG_EMBEDDING_BACKEND", "torch")
+        self.role = role or os.getenv("RAG_INDEX_ROLE", "reader")
+        self._corpora: Dict[str, BenefitRetriever] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader=None, **options) -> BenefitRetriever:
+        """
+        컬렉션 등록 (이미 있으면 기존 검색기 반환)
+
+        Args:
+            name: 컬렉션 이름 (ChromaDB 컬렉션명으로도 사용)
+            loader: 문서 로더 (None이면 BenefitLoader)
+            **options: BenefitRetriever 추가 인자 (hybrid, rrf_k 등)
+
+        Raises:
+            ValueError: 같은 이름이 다른 loader/옵션으로 이미 등록된 경우
+        """
+        # 이미 등록된 이름도 레지스트리에서 설정을 비교 (다른 설정이면 ValueError)
+        # 생성은 레지스트리의 키별 락에서 (관리자 락을 잡은 채 만들면 다른 컬렉션 등록이 첫 빌드를 기다림)
+        key = (name, self.persist_directory, self.embedding_model, self.embedding_backend, self.role)
+        retriever = _get_or_create(
+            key,
+            collection_name=name,
+            persist_directory=self.persist_directory,
+            embedding_model=self.embedding_model,
+            embedding_backend=self.embedding_backend,
+            role=self.role,
+            loader=loader or BenefitLoader(),
+            **options
+        )
+        with self._lock:
+            return self._corpora.setdefault(name, retriever)
+
+    def get(self, name: str) -> BenefitRetriever:
+        try:
+            return self._corpora[name]
+        except KeyError:
+            raise KeyError(f"Unknown corpus: {name} (registered: {self.names()})") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._corpora
+
+    def names(self) -> List[str]:
+        return list(self._corpora)
+
+    def search(
+        self,
+        name: str,
+        query: str,
+        n_results: int = 3,
+        filters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        return self.get(name).search(query, n_results=n_results, filters=filters)
+
+    def sync(self, name: str = None) -> Dict[str, Dict[str, int]]:
+        """로더 -> 인덱스 증분 동기화 (name 미지정 시 전체)"""
+        names = [name] if name else self.names()
+        return {n: self.get(n).sync() for n in names}
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {name: retriever.status() for name, retriever in list(self._corpora.items())}
+
+
+_manager_lock = threading.Lock()
+_manager: CorpusManager = None
+
+
+def get_corpus_manager() -> CorpusManager:
+    """프로세스 공용 CorpusManager (기본 저장 경로/모델)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = CorpusManager()
+        return _manager
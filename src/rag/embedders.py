@@ -0,0 +1,150 @@
+"""
+Embedding Backends - CPU 전용 서버용 ONNX / int8 양자화 임베딩
+sentence-transformers(PyTorch)와 같은 encode() 인터페이스를 제공
+"""
+
+import time
+from pathlib import Path
+from typing import List
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+
+EMBEDDING_BACKENDS = ("torch", "onnx")
+
+
+class OnnxEmbedder:
+    """
+    ONNX Runtime + 동적 int8 양자화 임베딩 모델
+
+    최초 1회 PyTorch 모델을 ONNX로 내보내고 가중치를 int8로 양자화해 캐시 디렉토리에 저장한다.
+    이후에는 PyTorch 없이 ONNX Runtime 세션만 로드한다.
+    ko-sbert-nli와 같이 mean pooling을 쓰는 sentence-transformers 모델을 기준으로 한다.
+
+    Args:
+        model_name: Hugging Face 모델 이름
+        cache_dir: 내보낸 ONNX 모델 저장 경로
+        quantize: int8 동적 양자화 여부 (False면 float32 ONNX)
+        max_length: 토큰 최대 길이
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str,
+        quantize: bool = True,
+        max_length: int = 128
+    ):
+        if not ONNX_AVAILABLE:
+            raise ImportError("onnxruntime and transformers are required for the onnx backend")
+
+        self.model_name = model_name
+        self.quantize = quantize
+        self.max_length = max_length
+        self.model_dir = Path(cache_dir) / model_name.replace("/", "__")
+        self.export_seconds = None
+
+        model_path = self._ensure_exported()
+        self.model_path = model_path
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    @property
+    def _float_path(self) -> Path:
+        return self.model_dir / "model.onnx"
+
+    @property
+    def _int8_path(self) -> Path:
+        return self.model_dir / "model.int8.onnx"
+
+    def _ensure_exported(self) -> Path:
+        """ONNX 모델이 없으면 내보내기(+양자화) 후 경로 반환"""
+        target = self._int8_path if self.quantize else self._float_path
+        if target.exists():
+            return target
+
+        started = time.perf_counter()
+        if not self._float_path.exists():
+            self._export()
+        if self.quantize:
+            quantize_dynamic(str(self._float_path), str(self._int8_path), weight_type=QuantType.QInt8)
+        self.export_seconds = time.perf_counter() - started
+        print(f"Exported {self.model_name} to ONNX in {self.export_seconds:.1f}s")
+        return target
+
+    def _export(self):
+        """PyTorch 트랜스포머 본체를 ONNX로 내보내기 (pooling은 encode에서 수행)"""
+        import torch
+        from transformers import AutoModel
+
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        model = AutoModel.from_pretrained(self.model_name)
+        model.eval()
+
+        sample = tokenizer(["임베딩 내보내기 샘플"], return_tensors="pt")
+        input_names = list(sample.keys())
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+        export_kwargs = dict(
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+        class _Encoder(torch.nn.Module):
+            """토크나이저 출력 순서대로 위치 인자를 받아 키워드 인자로 넘기는 래퍼"""
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+            
+            def forward(self, *inputs):
+                return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+        
+        with torch.no_grad():
+            model = _Encoder(model)
+            args = tuple(sample[name] for name in input_names)
+            try:
+                # torch 2.5+: TorchScript 기반 exporter 사용 (dynamo exporter는 onnxscript 필요)
+                torch.onnx.export(model, args, str(self._float_path), dynamo=False, **export_kwargs)
+            except TypeError:
+                torch.onnx.export(model, args, str(self._float_path), **export_kwargs)
+        tokenizer.save_pretrained(str(self.model_dir))
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> "np.ndarray":
+        """sentence-transformers와 같은 mean pooling 임베딩"""
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        outputs: List["np.ndarray"] = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            tokens = self.tokenizer(
+                batch,
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            feed = {name: value.astype(np.int64) for name, value in tokens.items() if name in self._input_names}
+            hidden = self.session.run(["last_hidden_state"], feed)[0]
+
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            outputs.append(pooled.astype(np.float32))
+
+        embeddings = np.concatenate(outputs, axis=0) if outputs else np.zeros((0, 0), dtype=np.float32)
+        return embeddings[0] if single else embeddings
@@ -0,0 +1,95 @@
+"""
+Embedding Cache - 텍스트 임베딩 영구 캐시
+(모델명, sha256(text)) -> float32 벡터를 SQLite에 저장하여
+재인덱싱/재시작/중복 upsert 시 같은 텍스트를 다시 임베딩하지 않음
+"""
+
+import hashlib
+import sqlite3
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# SQLite 바인딩 변수 개수 제한(기본 999) 이하로 나눠서 조회
+_QUERY_CHUNK = 500
+
+
+class EmbeddingCache:
+    """SQLite 기반 임베딩 캐시"""
+    
+    def __init__(self, path: str):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT,
+                text_hash TEXT,
+                dim INTEGER,
+                vector BLOB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (model, text_hash)
+            )
+            """)
+    
+    @contextmanager
+    def _connect(self):
+        # 호출마다 연결을 열어 스레드/프로세스 간 공유 문제를 피함
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:  # 정상 종료 시 commit
+                yield conn
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """캐시된 임베딩 조회 (text_hash 목록) -> {text_hash: vector}"""
+        hashes = list(set(hashes))
+        found: Dict[str, List[float]] = {}
+        
+        with self._connect() as conn:
+            for start in range(0, len(hashes), _QUERY_CHUNK):
+                chunk = hashes[start:start + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[text_hash] = vector.tolist()
+        
+        self.hits += len(found)
+        self.misses += len(hashes) - len(found)
+        return found
+    
+    def put_many(self, model: str, hashes: List[str], vectors: List[List[float]]):
+        """임베딩 저장 (이미 있으면 덮어씀)"""
+        rows = [
+            (model, h, len(v), array("f", v).tobytes())
+            for h, v in zip(hashes, vectors)
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+    
+    def stats(self) -> Dict[str, Optional[float]]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None
+        }
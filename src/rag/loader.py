@@ -5,10 +5,18 @@ RAG Document Loader - 혜택 데이터 로더
 
 import json
 import os
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from pathlib import Path
 
 
+# 앱에서 선택 가능한 신분 (스마트 검색 페이지 STATUS_KEYS + 기본값 "청년")
+# 신분별 자격 여부를 인덱싱 시점에 미리 계산해 status_<신분> 플래그로 저장한다.
+USER_STATUSES = ("대학생", "직장인", "취업준비생", "창업자", "청년")
+
+# 나이 상한이 없는 혜택의 age_max 값
+AGE_MAX_UNBOUNDED = 100
+
+
 class BenefitDocument:
     """혜택 문서 클래스"""
     def __init__(self, content: str, metadata: Dict[str, Any]):
@@ -21,6 +29,9 @@ class BenefitLoader:
     복지/혜택 JSON 데이터를 RAG용 문서로 변환
     """
     
+    # benefits.json의 id 형식 (같은 컬렉션에 API로 넣은 공고와 구분)
+    ID_PREFIX = "benefit_"
+    
     def __init__(self, data_path: str = None):
         if data_path is None:
             # 프로젝트 루트 기준 경로
@@ -42,19 +53,68 @@ class BenefitLoader:
             # 검색용 텍스트 생성
             content = self._create_content(benefit)
             
-            # 메타데이터 추출
+            # 메타데이터 추출 (자격 조건은 검색 시 where 필터로 사용)
             metadata = {
                 "id": benefit.get("id"),
                 "name": benefit.get("name"),
                 "category": benefit.get("category"),
                 "provider": benefit.get("provider"),
                 "url": benefit.get("url"),
+                **self._create_eligibility_metadata(benefit),
+                "amount": self._format_amount(benefit),
             }
             
             documents.append(BenefitDocument(content, metadata))
         
         return documents
     
+    def owns(self, doc_id: str) -> bool:
+        """이 loader가 만드는 문서 id인지 (manifest 없는 기존 인덱스 정리 시 사용)"""
+        return doc_id.startswith(self.ID_PREFIX)
+    
+    def default_metadata(self) -> Dict[str, Any]:
+        """
+        자격 메타데이터가 없는 문서(API로 넣은 공고 등)에 채울 기본값
+        
+        키가 없으면 where 필터에서 빠지므로, 검색기가 upsert 시점에(이전에 인덱싱된 문서는 sync에서)
+        개방형 조건으로 채운다.
+        """
+        return open_eligibility_metadata()
+    
+    def _create_eligibility_metadata(self, benefit: Dict) -> Dict[str, Any]:
+        """자격 조건 메타데이터 (ChromaDB 메타데이터는 None을 허용하지 않으므로 기본값 사용)"""
+        eligibility = benefit.get("eligibility", {})
+        required_status = eligibility.get("required_status", [])
+        
+        metadata = {
+            "age_min": eligibility.get("age_min") or 0,
+            "age_max": eligibility.get("age_max") or AGE_MAX_UNBOUNDED,
+        }
+        for status in USER_STATUSES:
+            metadata[f"status_{status}"] = self._status_eligible(status, required_status)
+        return metadata
+    
+    @staticmethod
+    def _status_eligible(user_status: str, required_status: List[str]) -> bool:
+        """신분 자격 판정 (무주택자 대상이거나 청년 대상이면 신분 무관)"""
+        if not required_status or "무주택자" in required_status:
+            return True
+        return any(
+            s in user_status or user_status in s or s == "청년"
+            for s in required_status
+        )
+    
+    def _format_amount(self, benefit: Dict) -> str:
+        """대표 혜택 금액 문자열 (지원금 > 대출한도 > 임대료 순)"""
+        benefit_info = benefit.get("benefit", {})
+        if benefit_info.get("amount"):
+            return f"{benefit_info['amount']:,}{benefit_info.get('unit', '')}"
+        if benefit_info.get("loan_max"):
+            return f"{benefit_info['loan_max']:,}{benefit_info.get('loan_unit', '만원')}"
+        if benefit_info.get("rent_ratio"):
+            return str(benefit_info["rent_ratio"])
+        return "상세내용 확인 필요"
+    
     def _create_content(self, benefit: Dict) -> str:
         """검색용 텍스트 콘텐츠 생성"""
         eligibility = benefit.get("eligibility", {})
@@ -100,6 +160,84 @@ class BenefitLoader:
         return content
 
 
+class JsonDocumentLoader:
+    """
+    임의의 JSON 배열 -> RAG용 문서 (판례, 크롤링 공고 등 혜택 외 코퍼스용)
+    
+    Args:
+        data_path: JSON 파일 경로 (객체 배열)
+        content_builder: 항목 -> 검색용 텍스트
+        metadata_builder: 항목 -> 메타데이터 (None이면 None이 아닌 스칼라 필드만 사용)
+        id_field: 문서 id로 쓸 필드
+    """
+    
+    def __init__(
+        self,
+        data_path: str,
+        content_builder: Callable[[Dict[str, Any]], str],
+        metadata_builder: Callable[[Dict[str, Any]], Dict[str, Any]] = None,
+        id_field: str = "id"
+    ):
+        self.data_path = Path(data_path)
+        self.content_builder = content_builder
+        self.metadata_builder = metadata_builder or self._scalar_metadata
+        self.id_field = id_field
+    
+    @staticmethod
+    def _scalar_metadata(item: Dict[str, Any]) -> Dict[str, Any]:
+        """ChromaDB 메타데이터는 리스트/None을 허용하지 않으므로 스칼라 필드만"""
+        return {
+            key: value for key, value in item.items()
+            if isinstance(value, (str, int, float, bool))
+        }
+    
+    def load(self) -> List[BenefitDocument]:
+        if not self.data_path.exists():
+            print(f"Warning: {self.data_path} not found")
+            return []
+        
+        with open(self.data_path, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        
+        documents = []
+        for item in items:
+            metadata = {**self.metadata_builder(item), "id": str(item[self.id_field])}
+            documents.append(BenefitDocument(self.content_builder(item), metadata))
+        return documents
+
+
+def open_eligibility_metadata() -> Dict[str, Any]:
+    """자격 조건이 없는 문서(크롤링 공고 등)용 메타데이터 - 모든 자격 필터를 통과"""
+    metadata = {
+        "age_min": 0,
+        "age_max": AGE_MAX_UNBOUNDED,
+    }
+    for status in USER_STATUSES:
+        metadata[f"status_{status}"] = True
+    return metadata
+
+
+def eligibility_filter(age: int = None, status: str = None) -> Optional[Dict[str, Any]]:
+    """
+    사용자 나이/신분 -> 메타데이터 where 필터 (ChromaDB 문법)
+    
+    앱에서 알 수 없는 신분이면 신분 조건은 생략한다.
+    소득 조건은 혜택마다 단위(중위소득 %, 만원/년)가 달라 메타데이터로 두지 않고 본문에만 남긴다.
+    """
+    conditions = []
+    if age is not None:
+        conditions.append({"age_min": {"$lte": age}})
+        conditions.append({"age_max": {"$gte": age}})
+    if status in USER_STATUSES:
+        conditions.append({f"status_{status}": True})
+    
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and": conditions}
+
+
 if __name__ == "__main__":
     loader = BenefitLoader()
     docs = loader.load()
@@ -0,0 +1,141 @@
+"""
+Index Write Coordination - .chroma_db 단일 쓰기 조정
+FastAPI(공고 upsert)와 Streamlit(혜택 검색)이 같은 인덱스 디렉토리를 열 때
+쓰기는 한 번에 한 프로세스·한 스레드만 하도록 하고, 읽기는 락 없이 진행한다.
+
+- InterProcessLock: 인덱스 디렉토리의 락 파일에 대한 fcntl.flock (재진입 가능)
+- IndexWriteQueue: 프로세스당 쓰기 스레드 1개 - 쓰기 요청을 순서대로 실행
+- generation 파일: 쓰기 완료마다 카운터 증가, 다른 프로세스는 값이 바뀌면 스냅샷을 다시 연다
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+
+
+LOCK_FILENAME = ".index.lock"
+GENERATION_FILENAME = ".index.generation"
+
+
+class InterProcessLock:
+    """
+    프로세스 간 배타 락 (fcntl.flock) + 프로세스 내 스레드 락
+
+    같은 스레드에서 중첩 획득이 가능하다 (sync 안에서 upsert 호출 등).
+    fcntl이 없는 환경(Windows)에서는 프로세스 내 락만 적용된다.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+        self.wait_seconds = 0.0  # 다른 프로세스를 기다린 누적 시간
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0 and FCNTL_AVAILABLE:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a+")
+                started = time.perf_counter()
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                self.wait_seconds += time.perf_counter() - started
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class IndexWriteQueue:
+    """
+    인덱스 쓰기 전용 단일 스레드 큐
+
+    크롤러가 공고를 몰아서 보내도 쓰기는 이 스레드에서 차례로 처리되고,
+    요청 스레드(이벤트 루프)와 검색은 막지 않는다.
+    """
+
+    def __init__(self, name: str = "index"):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"rag-writer-{name}")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            self.pending += 1
+        return self._executor.submit(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn: Callable, *args, **kwargs) -> Any:
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": self.pending, "completed": self.completed, "failed": self.failed}
+
+
+def bump_generation(directory: str) -> int:
+    """
+    쓰기 완료 표시 (generation 카운터 +1) -> 새 generation
+
+    호출자가 쓰기 락을 보유한 상태에서 호출한다 (읽기-증가-쓰기가 다른 쓰기와 겹치지 않도록).
+    mtime은 파일시스템에 따라 해상도가 낮아(overlayfs, NFS 등) 같은 시각의 두 쓰기를 구분하지 못하므로
+    파일에 저장된 카운터 값으로 비교한다.
+    """
+    path = Path(directory) / GENERATION_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    generation = (read_generation(directory) or 0) + 1
+    # 원자적 교체 (읽는 쪽이 빈 파일/쓰다 만 값을 보지 않도록)
+    tmp_path = path.with_name(f"{GENERATION_FILENAME}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(str(generation))
+    os.replace(tmp_path, path)
+    return generation
+
+
+def read_generation(directory: str) -> Optional[int]:
+    """마지막 쓰기의 generation (쓰기 기록이 없으면 None)"""
+    try:
+        with open(Path(directory) / GENERATION_FILENAME, "r") as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
@@ -0,0 +1,275 @@
+"""
+Model Holder - 임베딩 모델 유휴 해제 + 메모리 예산
+검색이 한 시간에 몇 번뿐인 프로세스(Streamlit, API)가 모델 가중치를 계속 들고 있지 않도록
+일정 시간 쓰지 않으면 내려놓고, 다음 사용 시 다시 로드한다 (콜드 스타트 비용은 메트릭으로 기록).
+
+- idle_timeout: 마지막 사용 후 이 시간(초)이 지나면 해제 (None이면 해제하지 않음)
+- memory budget: 프로세스 안 모든 홀더의 모델 크기 합 상한 (MB)
+  새 모델을 올릴 때 예산을 넘으면 가장 오래 쓰지 않은 다른 모델부터 해제
+"""
+
+import ctypes
+import gc
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+def estimate_model_mb(model: Any) -> Optional[float]:
+    """모델 가중치 크기 추정 (MB) - PyTorch 파라미터 또는 ONNX 모델 파일 크기"""
+    if hasattr(model, "parameters"):
+        try:
+            return sum(p.numel() * p.element_size() for p in model.parameters()) / (1024 * 1024)
+        except Exception:
+            return None
+    model_path = getattr(model, "model_path", None)
+    if model_path and Path(model_path).exists():
+        return Path(model_path).stat().st_size / (1024 * 1024)
+    return None
+
+
+def _release_memory():
+    """해제된 가중치 메모리를 OS에 반환 (glibc malloc_trim, 가능할 때만)"""
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class ModelHolder:
+    """
+    필요할 때 로드하고 유휴 시 해제하는 모델 보관자
+
+    Args:
+        name: 메트릭/로그용 이름
+        loader: 모델 로드 함수 (매 로드마다 호출)
+        idle_timeout: 유휴 해제 시간(초), None이면 해제하지 않음
+        budget: 메모리 예산 (None이면 예산 관리 없음)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        idle_timeout: Optional[float] = None,
+        budget: "MemoryBudget" = None
+    ):
+        self.name = name
+        self.loader = loader
+        self.idle_timeout = idle_timeout
+        self.budget = budget
+
+        self._model = None
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self.last_used = time.monotonic()
+
+        self.loads = 0
+        self.unloads = 0
+        self.idle_unloads = 0
+        self.budget_unloads = 0
+        self.last_load_seconds: Optional[float] = None
+        self.total_load_seconds = 0.0
+        self.size_mb: Optional[float] = None
+
+        if budget is not None:
+            budget.register(self)
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    @contextmanager
+    def use(self):
+        """모델 사용 구간 (사용 중에는 해제되지 않음)"""
+        with self._lock:
+            if self._model is None:
+                self._load()
+            self._in_use += 1
+            self.last_used = time.monotonic()
+            model = self._model
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self.last_used = time.monotonic()
+
+    def get(self) -> Any:
+        """모델 반환 (없으면 로드) - 오래 쓰는 경우 use() 권장"""
+        with self.use() as model:
+            return model
+
+    def _load(self):
+        if self.budget is not None:
+            self.budget.make_room(self)
+
+        started = time.perf_counter()
+        self._model = self.loader()
+        self.last_load_seconds = time.perf_counter() - started
+        self.total_load_seconds += self.last_load_seconds
+        self.size_mb = estimate_model_mb(self._model)
+        cold = " (cold start after unload)" if self.loads else ""
+        self.loads += 1
+        print(f"Loaded {self.name} in {self.last_load_seconds:.2f}s{cold}")
+
+        if self.idle_timeout is not None:
+            _start_reaper()
+
+    def unload(self, reason: str = "manual", blocking: bool = True) -> bool:
+        """
+        가중치 해제 (사용 중이거나 로드 중이면 해제하지 않음)
+
+        blocking=False면 다른 스레드가 이 홀더를 쓰는 중일 때 기다리지 않고 포기한다
+        (예산 확보 중 두 홀더가 서로를 기다리는 교착 방지).
+        """
+        if not self._lock.acquire(blocking=blocking):
+            return False
+        try:
+            if self._model is None or self._in_use:
+                return False
+            self._model = None
+            self.unloads += 1
+            if reason == "idle":
+                self.idle_unloads += 1
+            elif reason == "budget":
+                self.budget_unloads += 1
+        finally:
+            self._lock.release()
+        _release_memory()
+        print(f"Unloaded {self.name} ({reason})")
+        return True
+
+    def unload_if_idle(self) -> bool:
+        if self.idle_timeout is None or not self.loaded:
+            return False
+        if time.monotonic() - self.last_used < self.idle_timeout:
+            return False
+        return self.unload("idle")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "loaded": self.loaded,
+            "in_use": self._in_use,
+            "idle_seconds": time.monotonic() - self.last_used,
+            "idle_timeout": self.idle_timeout,
+            "size_mb": self.size_mb,
+            "loads": self.loads,
+            "cold_starts": max(self.loads - 1, 0),
+            "unloads": self.unloads,
+            "idle_unloads": self.idle_unloads,
+            "budget_unloads": self.budget_unloads,
+            "last_load_seconds": self.last_load_seconds,
+            "total_load_seconds": self.total_load_seconds,
+        }
+
+
+class MemoryBudget:
+    """
+    프로세스 내 모델 메모리 예산
+
+    크기를 모르는 모델(처음 로드 전)은 예산 계산에서 0으로 취급하고,
+    한 모델이 예산보다 크면 다른 모델을 모두 내린 뒤 경고와 함께 로드한다.
+    """
+
+    def __init__(self, limit_mb: Optional[float]):
+        self.limit_mb = limit_mb
+        self._holders: List[ModelHolder] = []
+        self._lock = threading.Lock()
+
+    def register(self, holder: ModelHolder):
+        with self._lock:
+            self._holders.append(holder)
+
+    def used_mb(self) -> float:
+        return sum(h.size_mb or 0 for h in list(self._holders) if h.loaded)
+
+    def make_room(self, holder: ModelHolder):
+        """holder를 올리기 전에 예산을 넘지 않도록 다른 모델을 LRU 순으로 해제"""
+        if self.limit_mb is None:
+            return
+        needed = holder.size_mb or 0
+        with self._lock:
+            others = sorted(
+                (h for h in self._holders if h is not holder and h.loaded),
+                key=lambda h: h.last_used
+            )
+        for other in others:
+            if self.used_mb() + needed <= self.limit_mb:
+                break
+            other.unload("budget", blocking=False)
+        if needed > self.limit_mb:
+            print(f"Warning: {holder.name} ({needed:.0f}MB) exceeds model memory budget ({self.limit_mb:.0f}MB)")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"limit_mb": self.limit_mb, "used_mb": self.used_mb()}
+
+
+# ===== 유휴 해제 스레드 (프로세스당 1개) =====
+
+_holders_lock = threading.Lock()
+_all_holders: List[ModelHolder] = []
+_reaper: Optional[threading.Thread] = None
+
+REAPER_INTERVAL = 30.0
+
+
+def _track(holder: ModelHolder):
+    with _holders_lock:
+        _all_holders.append(holder)
+
+
+def _start_reaper():
+    global _reaper
+    with _holders_lock:
+        if _reaper is not None and _reaper.is_alive():
+            return
+        _reaper = threading.Thread(target=_reap_forever, name="rag-model-reaper", daemon=True)
+        _reaper.start()
+
+
+def _reap_forever():
+    while True:
+        with _holders_lock:
+            holders = list(_all_holders)
+        timeouts = [h.idle_timeout for h in holders if h.idle_timeout is not None]
+        # 가장 짧은 idle_timeout의 절반 간격으로 확인 (최대 REAPER_INTERVAL)
+        time.sleep(min([REAPER_INTERVAL] + [t / 2 for t in timeouts]))
+        for holder in holders:
+            holder.unload_if_idle()
+
+
+def env_idle_timeout() -> Optional[float]:
+    """RAG_MODEL_IDLE_TIMEOUT (초, 0 또는 미설정이면 해제하지 않음)"""
+    value = float(os.getenv("RAG_MODEL_IDLE_TIMEOUT", "0") or 0)
+    return value if value > 0 else None
+
+
+def env_memory_budget() -> Optional[float]:
+    """RAG_MODEL_MEMORY_BUDGET_MB (0 또는 미설정이면 제한 없음)"""
+    value = float(os.getenv("RAG_MODEL_MEMORY_BUDGET_MB", "0") or 0)
+    return value if value > 0 else None
+
+
+_budget = MemoryBudget(env_memory_budget())
+
+
+def configure_budget(limit_mb: Optional[float]):
+    """프로세스 모델 메모리 예산 설정 (MB, None이면 제한 없음)"""
+    _budget.limit_mb = limit_mb
+
+
+def create_holder(name: str, loader: Callable[[], Any], idle_timeout: Optional[float] = None) -> ModelHolder:
+    """프로세스 공용 예산/유휴 해제 스레드에 등록된 홀더 생성"""
+    holder = ModelHolder(name, loader, idle_timeout=idle_timeout, budget=_budget)
+    _track(holder)
+    return holder
+
+
+def budget_stats() -> Dict[str, Any]:
+    return {**_budget.stats(), "models": [h.stats() for h in list(_all_holders)]}
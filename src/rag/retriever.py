@@ -3,7 +3,13 @@ RAG Retriever - 벡터 기반 혜택 검색
 비용 최소화: sentence-transformers (무료, 로컬) + ChromaDB
 """
 
+import hashlib
+import json
 import os
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
@@ -20,7 +26,22 @@ try:
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
+from src.utils.cache import LRUCache
+
 from .loader import BenefitLoader, BenefitDocument
+from .embedding_cache import EmbeddingCache
+from .vector_index import VectorIndex, NUMPY_AVAILABLE
+from .bm25 import BM25Index, reciprocal_rank_fusion
+from .embedders import OnnxEmbedder, ONNX_AVAILABLE, EMBEDDING_BACKENDS
+from .model_holder import ModelHolder, create_holder, env_idle_timeout
+from .locking import InterProcessLock, IndexWriteQueue, LOCK_FILENAME, bump_generation, read_generation
+
+
+INDEX_BACKENDS = ("chromadb", "numpy", "fallback")
+INDEX_ROLES = ("writer", "reader")
+
+# 하이브리드 검색에서 벡터 검색을 BM25와 동시에 돌리기 위한 공용 스레드 풀
+_search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-search")
 
 
 class BenefitRetriever:
@@ -29,16 +50,46 @@ class BenefitRetriever:
     
     비용 최소화:
     - sentence-transformers: 무료 로컬 임베딩
-    - ChromaDB: 무료 로컬 벡터 DB
+    - ChromaDB: 무료 로컬 벡터 DB (없으면 NumPy exact 인덱스, 그마저 없으면 키워드 검색)
+    
+    검색 품질:
+    - 문자 n-gram BM25를 벡터 검색과 동시에 조회하고 RRF로 결합 (hybrid=True)
     """
     
     def __init__(
         self,
         collection_name: str = "benefits",
         persist_directory: str = None,
-        embedding_model: str = "jhgan/ko-sbert-nli"  # 한국어 특화 모델
+        embedding_model: str = "jhgan/ko-sbert-nli",  # 한국어 특화 모델
+        embedding_batch_size: int = 32,
+        use_embedding_cache: bool = True,
+        query_cache_size: int = 1024,
+        query_cache_ttl: Optional[float] = None,
+        hybrid: bool = True,
+        rrf_k: int = 60,
+        embedding_backend: str = "torch",  # "torch" 또는 "onnx" (int8 양자화)
+        index_backend: Optional[str] = None,  # "chromadb" / "numpy" / "fallback" (None이면 자동 선택)
+        loader=None,  # load() -> List[BenefitDocument] (None이면 BenefitLoader)
+        collapse_chunks: bool = True,
+        chunk_overfetch: int = 3,
+        hnsw_m: Optional[int] = None,  # 이하 HNSW 설정은 ChromaDB에만 적용 (None이면 Chroma 기본값)
+        hnsw_construction_ef: Optional[int] = None,
+        hnsw_search_ef: Optional[int] = None,
+        role: str = "writer",  # "reader"면 인덱스에 쓰지 않음 (최초 빌드 제외)
+        refresh_interval: float = 2.0  # 다른 프로세스의 쓰기 확인 주기 (초)
     ):
+        if embedding_backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {embedding_backend} (supported: {EMBEDDING_BACKENDS})")
+        if embedding_backend == "onnx" and not ONNX_AVAILABLE:
+            print("Warning: onnxruntime not available, using sentence-transformers")
+            embedding_backend = "torch"
+        if index_backend not in (None,) + INDEX_BACKENDS:
+            raise ValueError(f"Unknown index backend: {index_backend} (supported: {INDEX_BACKENDS})")
+        if role not in INDEX_ROLES:
+            raise ValueError(f"Unknown index role: {role} (supported: {INDEX_ROLES})")
+        
         self.collection_name = collection_name
+        self.loader = loader or BenefitLoader()
         
         # 저장 경로 설정
         if persist_directory is None:
@@ -47,94 +98,566 @@ class BenefitRetriever:
         
         self.persist_directory = persist_directory
         self.embedding_model_name = embedding_model
+        self.embedding_backend = embedding_backend
+        self.index_backend = index_backend
+        self.embedding_batch_size = embedding_batch_size
+        # 실제 임베딩 모델 사용 가능 여부 (없으면 해시 fallback 임베딩)
+        self._model_available = embedding_backend == "onnx" or SENTENCE_TRANSFORMERS_AVAILABLE
+        self.hybrid = hybrid
+        self.rrf_k = rrf_k
+        # 청크 문서는 부모 문서 단위로 묶어 반환 (부모당 최고 순위 청크 1개)
+        self.collapse_chunks = collapse_chunks
+        self.chunk_overfetch = chunk_overfetch
+        self.hnsw = hnsw_metadata(hnsw_m, hnsw_construction_ef, hnsw_search_ef)
+        
+        # 쓰기 조정: 프로세스 간 파일 락 + 프로세스당 쓰기 스레드 1개 (저장 경로 단위로 공유)
+        self.role = role
+        self.refresh_interval = refresh_interval
+        self._write_lock = get_write_lock(persist_directory)
+        self.write_queue = get_write_queue(persist_directory)
+        self._seen_generation = None
+        self._refresh_checked = time.monotonic()
+        self._refresh_lock = threading.Lock()
+        self._metadata_backfilled = False
+        
+        # 임베딩 영구 캐시 (실제 모델 임베딩만 저장 - 해시 fallback 벡터는 캐싱하지 않음)
+        self.embedding_cache = None
+        if use_embedding_cache and self._model_available:
+            self.embedding_cache = EmbeddingCache(
+                str(Path(persist_directory) / "embedding_cache.db")
+            )
+        
+        # 쿼리 임베딩 LRU (프로필 기반 쿼리는 같은 문자열이 반복됨)
+        self.query_cache = LRUCache(maxsize=query_cache_size, ttl=query_cache_ttl)
+        
+        # 임베딩 모델은 첫 사용 시점에 로드 (lazy), 유휴 시 해제 (RAG_MODEL_IDLE_TIMEOUT)
+        self.model_holder = None
+        if self._model_available:
+            self.model_holder = get_model_holder(
+                self.embedding_model_name,
+                self.embedding_backend,
+                cache_dir=str(Path(persist_directory) / "onnx")
+            )
+        else:
+            print("Warning: sentence-transformers not available, using fallback")
         
         # 초기화
-        self._init_embedding_model()
+        self._seen_generation = read_generation(self.persist_directory)
         self._init_chromadb()
         self._ensure_indexed()
+        self._build_keyword_index()
     
-    def _init_embedding_model(self):
-        """임베딩 모델 초기화"""
-        if SENTENCE_TRANSFORMERS_AVAILABLE:
-            self.embedding_model = SentenceTransformer(self.embedding_model_name)
-        else:
-            print("Warning: sentence-transformers not available, using fallback")
-            self.embedding_model = None
+    @property
+    def embedding_model(self):
+        """임베딩 모델 (해제된 상태면 다시 로드)"""
+        return self.model_holder.get() if self.model_holder else None
+    
+    @property
+    def model_loaded(self) -> bool:
+        return self.model_holder is not None and self.model_holder.loaded
+    
+    @property
+    def model_load_seconds(self) -> Optional[float]:
+        return self.model_holder.last_load_seconds if self.model_holder else None
+    
+    @property
+    def embedding_cache_key(self) -> str:
+        """임베딩 캐시 키용 모델 이름 (양자화 임베딩은 float 모델과 구분)"""
+        if self.embedding_backend == "onnx":
+            return f"{self.embedding_model_name}@onnx-int8"
+        return self.embedding_model_name
+    
+    def status(self) -> Dict[str, Any]:
+        """모델 로드 상태 (헬스체크용)"""
+        return {
+            "collection": self.collection_name,
+            "embedding_model": self.embedding_model_name,
+            "embedding_backend": self.embedding_backend,
+            "model_loaded": self.model_loaded,
+            "model_load_seconds": self.model_load_seconds,
+            "model": self.model_holder.stats() if self.model_holder else None,
+            "embedding_cache": self.embedding_cache.stats() if self.embedding_cache else None,
+            "query_cache": self.query_cache.stats(),
+            "backend": self.backend,
+            "hnsw": self.collection.metadata if self.backend == "chromadb" else None,
+            "role": self.role,
+            "write_queue": self.write_queue.stats(),
+            "write_lock_wait_seconds": self._write_lock.wait_seconds
+        }
+    
+    def embed_query(self, query: str) -> Optional[List[float]]:
+        """
+        쿼리 임베딩 (질문 캐시 등 검색 외 유사도 비교용, 쿼리 LRU 공유)
+        
+        임베딩 모델을 쓸 수 없으면 None
+        """
+        if not self.model_holder:
+            return None
+        return self._get_query_embeddings([query])[0]
     
     def _get_embedding(self, text: str) -> List[float]:
         """텍스트 임베딩 생성"""
-        if self.embedding_model:
-            return self.embedding_model.encode(text).tolist()
+        return self._get_embeddings([text])[0]
+    
+    def _get_query_embeddings(self, queries: List[str]) -> List[List[float]]:
+        """
+        검색 쿼리 임베딩 (메모리 LRU 우선, 미적중 쿼리만 모아 한 번에 임베딩)
+        
+        사용자 쿼리는 영구 임베딩 캐시(SQLite)에 저장하지 않는다 - 쿼리 종류만큼 DB가 계속 커지므로
+        문서 임베딩만 영구 캐시하고 쿼리는 크기 제한이 있는 메모리 LRU만 사용
+        """
+        embeddings = [self.query_cache.get(q) for q in queries]
+        missing = list(dict.fromkeys(q for q, e in zip(queries, embeddings) if e is None))
+        if missing:
+            computed = dict(zip(missing, self._encode(missing)))
+            for query, embedding in computed.items():
+                self.query_cache.put(query, embedding)
+            embeddings = [e if e is not None else computed[q] for q, e in zip(queries, embeddings)]
+        return embeddings
+    
+    def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        텍스트 목록 임베딩
+        
+        영구 캐시를 먼저 조회하고, 없는 텍스트만 모아 encode 한 번에
+        batch_size 단위로 처리한다. 전부 캐시 적중이면 모델도 로드하지 않는다.
+        """
+        if not texts:
+            return []
+        if self.embedding_cache is None:
+            return self._encode(texts)
+        
+        cache = self.embedding_cache
+        hashes = [cache.text_hash(t) for t in texts]
+        cached = cache.get_many(self.embedding_cache_key, hashes)
+        
+        # 캐시에 없는 텍스트만 (중복 제거) 임베딩
+        missing = {h: t for h, t in zip(hashes, texts) if h not in cached}
+        if missing:
+            vectors = self._encode(list(missing.values()))
+            cache.put_many(self.embedding_cache_key, list(missing.keys()), vectors)
+            cached.update(zip(missing.keys(), vectors))
+        
+        return [cached[h] for h in hashes]
+    
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        """모델 임베딩 (캐시 미적용)"""
+        if self.model_holder:
+            # 인코딩 중에는 유휴 해제되지 않도록 use() 구간 안에서 실행
+            with self.model_holder.use() as model:
+                return model.encode(
+                    texts,
+                    batch_size=self.embedding_batch_size
+                ).tolist()
         else:
             # Fallback: 간단한 해시 기반 임베딩 (데모용)
             import hashlib
-            hash_val = hashlib.md5(text.encode()).hexdigest()
-            return [int(hash_val[i:i+2], 16) / 255.0 for i in range(0, 32, 2)]
+            embeddings = []
+            for text in texts:
+                hash_val = hashlib.md5(text.encode()).hexdigest()
+                embeddings.append([int(hash_val[i:i+2], 16) / 255.0 for i in range(0, 32, 2)])
+            return embeddings
     
     def _init_chromadb(self):
         """ChromaDB 초기화 (0.4+ 호환)"""
-        if CHROMADB_AVAILABLE:
-            try:
-                # ChromaDB 0.4+ 방식 (PersistentClient)
-                self.client = chromadb.PersistentClient(path=self.persist_directory)
-            except (TypeError, AttributeError):
-                # 구버전 fallback (0.3.x)
-                self.client = chromadb.Client(Settings(
-                    chroma_db_impl="duckdb+parquet",
-                    persist_directory=self.persist_directory,
-                    anonymized_telemetry=False
-                ))
-            
+        use_chromadb = CHROMADB_AVAILABLE and self.index_backend in (None, "chromadb")
+        use_numpy = NUMPY_AVAILABLE and self._model_available and self.index_backend in (None, "numpy")
+        if self.index_backend == "chromadb" and not use_chromadb:
+            print("Warning: ChromaDB not available")
+        elif self.index_backend == "numpy" and not use_numpy:
+            print("Warning: NumPy vector index requires numpy and an embedding model")
+        
+        if use_chromadb:
+            # 같은 저장 경로의 컬렉션들은 클라이언트 하나를 공유
+            self.client = get_chroma_client(self.persist_directory, self._seen_generation)
             self.collection = self.client.get_or_create_collection(
                 name=self.collection_name,
-                metadata={"hnsw:space": "cosine"}
+                metadata=self.hnsw
             )
+            self._apply_hnsw_settings()
+            self.backend = "chromadb"
+        elif use_numpy:
+            # ChromaDB 없이도 의미 검색: NumPy exact 인덱스 (Collection과 같은 인터페이스)
+            if self.index_backend is None:
+                print("Warning: ChromaDB not available, using NumPy vector index")
+            self.client = None
+            self.collection = VectorIndex(self._vector_index_path)
+            self.backend = "numpy"
         else:
-            print("Warning: ChromaDB not available, using in-memory fallback")
+            if self.index_backend != "fallback":
+                print("Warning: ChromaDB not available, using in-memory fallback")
             self.client = None
             self.collection = None
             self._fallback_docs = []
+            self.backend = "fallback"
+    
+    def _apply_hnsw_settings(self):
+        """
+        기존 컬렉션과 HNSW 설정 비교
+        
+        M/construction_ef는 인덱스 생성 시 고정되므로 다르면 경고만 하고,
+        search_ef는 기존 컬렉션에도 반영한다.
+        """
+        current = self.collection.metadata or {}
+        fixed = [
+            key for key in ("hnsw:M", "hnsw:construction_ef")
+            if key in self.hnsw and current.get(key) != self.hnsw[key]
+        ]
+        if fixed:
+            print(
+                f"Warning: {', '.join(fixed)} of collection '{self.collection_name}' are fixed at creation "
+                f"(current: {current}); delete the collection to rebuild with new settings"
+            )
+        
+        search_ef = self.hnsw.get("hnsw:search_ef")
+        if search_ef is not None and current.get("hnsw:search_ef") != search_ef:
+            try:
+                self.collection.modify(metadata={**current, "hnsw:search_ef": search_ef})
+            except Exception as e:
+                print(f"Warning: could not update hnsw:search_ef ({e})")
     
     def _ensure_indexed(self):
-        """혜택 데이터가 인덱싱되어 있는지 확인하고, 없으면 인덱싱"""
+        """혜택 데이터를 인덱스와 동기화 (변경분만 반영)"""
         if self.collection is not None:
-            # ChromaDB 사용
-            if self.collection.count() == 0:
-                self._index_benefits()
+            # ChromaDB / NumPy 인덱스 사용
+            if self.role == "writer":
+                self.sync()
+            else:
+                # 읽기 전용: 아직 아무 프로세스도 인덱싱하지 않았을 때만 락을 잡고 최초 빌드
+                with self._writing():
+                    if self._load_manifest() is None:
+                        self._sync_locked()
         else:
             # Fallback: 메모리에 로드
             if not self._fallback_docs:
-                loader = BenefitLoader()
-                self._fallback_docs = loader.load()
+                self._fallback_docs = self.loader.load()
+    
+    @property
+    def _vector_index_path(self) -> str:
+        return str(Path(self.persist_directory) / "vector_index" / self.collection_name)
+    
+    @property
+    def _manifest_path(self) -> Path:
+        return Path(self.persist_directory) / "manifests" / f"{self.collection_name}.json"
     
-    def _index_benefits(self):
-        """혜택 데이터를 벡터 DB에 인덱싱"""
-        loader = BenefitLoader()
-        documents = loader.load()
+    def _load_manifest(self) -> Optional[Dict[str, str]]:
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
+    def _save_manifest(self, manifest: Dict[str, str]):
+        self._manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._manifest_path)
+    
+    @staticmethod
+    def _document_hash(doc: BenefitDocument) -> str:
+        payload = doc.page_content + json.dumps(doc.metadata, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def sync(self) -> Dict[str, int]:
+        """
+        loader 문서(기본: benefits.json) -> 인덱스 증분 동기화
         
-        if not documents:
-            print("No documents to index")
-            return
+        문서별 콘텐츠 해시를 manifest(컬렉션 옆에 저장)와 비교하여
+        추가/변경된 문서만 임베딩·upsert하고, 사라진 문서만 삭제한다.
+        manifest에 없는 id(예: /api/rag/upsert로 들어온 공고)는 건드리지 않는다.
+        
+        Returns:
+            {"added", "updated", "deleted", "unchanged"} 문서 수
+        """
+        self._check_writable()
+        # manifest 비교 ~ 저장까지 다른 프로세스의 동기화와 겹치지 않도록 락 보유
+        with self._writing():
+            return self._sync_locked()
+    
+    def _sync_locked(self) -> Dict[str, int]:
+        documents = self.loader.load()
+        current = {doc.metadata["id"]: (doc, self._document_hash(doc)) for doc in documents}
+        
+        manifest = self._load_manifest()
+        removed = [doc_id for doc_id in manifest or {} if doc_id not in current]
+        if manifest is None and self.collection.count() > 0:
+            # manifest 도입 이전 인덱스: 전부 다시 upsert (임베딩 캐시로 대부분 재사용)하고,
+            # 그 전에 소스에서 사라진 문서는 manifest로 알 수 없으므로 인덱스에 있는 id와 비교해 삭제
+            print(f"No index manifest found, re-syncing all {self.collection_name} documents")
+            removed = self._orphaned_ids(current)
+        manifest = manifest or {}
+        
+        changed = [doc for doc_id, (doc, h) in current.items() if manifest.get(doc_id) != h]
+        stats = {
+            "added": sum(1 for doc in changed if doc.metadata["id"] not in manifest),
+            "updated": sum(1 for doc in changed if doc.metadata["id"] in manifest),
+            "deleted": len(removed),
+            "unchanged": len(current) - len(changed)
+        }
+        
+        if changed:
+            contents = [doc.page_content for doc in changed]
+            self.collection.upsert(
+                ids=[doc.metadata["id"] for doc in changed],
+                embeddings=self._get_embeddings(contents),
+                metadatas=[doc.metadata for doc in changed],
+                documents=contents
+            )
+        if removed:
+            self.collection.delete(ids=removed)
+        
+        if changed or removed or manifest.keys() != current.keys():
+            self._save_manifest({doc_id: h for doc_id, (_, h) in current.items()})
+        
+        if changed or removed:
+            self._bump_generation()
+            print(f"Synced {self.collection_name} index: {stats}")
+            # 초기화 이후 동기화라면 BM25도 같은 변경분으로 갱신
+            if getattr(self, "keyword_index", None) is not None:
+                self.keyword_index.upsert(
+                    [doc.metadata["id"] for doc in changed],
+                    [doc.page_content for doc in changed],
+                    [doc.metadata for doc in changed]
+                )
+                self.keyword_index.delete(removed)
+        
+        self._backfill_metadata()
+        return stats
+    
+    def _orphaned_ids(self, current: Dict[str, Any]) -> List[str]:
+        """
+        manifest 없는 기존 인덱스에서 loader가 더 이상 만들지 않는 문서 id
+        
+        청크 문서(parent_id)는 API로 들어온 공고이므로 제외하고, loader가 owns(doc_id)를 제공하면
+        그 loader의 id만 대상으로 한다 (같은 컬렉션에 API로 넣은 공고는 삭제하지 않음).
+        """
+        owns = getattr(self.loader, "owns", None)
+        existing = self.collection.get()
+        return [
+            doc_id for doc_id, metadata in zip(existing["ids"], existing["metadatas"])
+            if doc_id not in current
+            and "parent_id" not in (metadata or {})
+            and (owns is None or owns(doc_id))
+        ]
+    
+    def _backfill_metadata(self) -> int:
+        """
+        loader 기본 메타데이터(default_metadata) 키가 빠진 기존 문서에 기본값 채우기 (프로세스당 1회)
+        
+        새로 쓰는 문서는 upsert 시점에 채워지지만(_with_default_metadata), 그 전에 인덱싱된
+        manifest 밖 문서(/api/rag/upsert로 들어온 공고)는 sync가 다시 임베딩하지 않으므로
+        여기서 임베딩은 그대로 두고 메타데이터만 갱신한다.
+        
+        Returns:
+            기본값을 채운 문서 수
+        """
+        default_metadata = getattr(self.loader, "default_metadata", None)
+        if self._metadata_backfilled or default_metadata is None or self.collection is None:
+            return 0
+        self._metadata_backfilled = True
+        
+        defaults = default_metadata()
+        existing = self.collection.get()
+        stale = [
+            i for i, metadata in enumerate(existing["metadatas"])
+            if not defaults.keys() <= (metadata or {}).keys()
+        ]
+        if not stale:
+            return 0
         
-        ids = []
-        embeddings = []
-        metadatas = []
-        contents = []
-        
-        for doc in documents:
-            ids.append(doc.metadata["id"])
-            embeddings.append(self._get_embedding(doc.page_content))
-            metadatas.append(doc.metadata)
-            contents.append(doc.page_content)
-        
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            metadatas=metadatas,
-            documents=contents
+        ids = [existing["ids"][i] for i in stale]
+        metadatas = [{**defaults, **(existing["metadatas"][i] or {})} for i in stale]
+        self.collection.update(ids=ids, metadatas=metadatas)
+        if getattr(self, "keyword_index", None) is not None:
+            self.keyword_index.upsert(ids, [existing["documents"][i] for i in stale], metadatas)
+        self._bump_generation()
+        print(f"Backfilled default metadata for {len(ids)} {self.collection_name} documents")
+        return len(ids)
+    
+    def _build_keyword_index(self):
+        """현재 인덱스 전체로 BM25 인덱스 구성 (이후에는 upsert 시 증분 갱신)"""
+        keyword_index = BM25Index()
+        docs = self.get_all_benefits()
+        keyword_index.upsert(
+            ids=[d["id"] for d in docs],
+            texts=[d["content"] for d in docs],
+            metadatas=[d["metadata"] for d in docs]
         )
+        # 다 만든 뒤 교체 (갱신 중에도 검색은 이전 인덱스 사용)
+        self.keyword_index = keyword_index
+    
+    def upsert_documents(
+        self,
+        ids: List[str],
+        contents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> int:
+        """
+        문서 일괄 upsert (배치 임베딩 + 단일 upsert 호출)
+        
+        임베딩은 락 밖에서 계산하고, 인덱스 쓰기 구간만 프로세스 간 락을 잡는다.
+        
+        Returns:
+            저장된 문서 수
+        """
+        if not ids:
+            return 0
+        self._check_writable()
+        
+        metadatas = self._with_default_metadata(metadatas)
+        embeddings = self._get_embeddings(contents) if self.collection is not None else None
+        with self._writing():
+            self._write(ids, contents, metadatas, embeddings)
+        return len(ids)
+    
+    def delete_documents(self, ids: List[str]):
+        """문서 삭제 (인덱스 + BM25)"""
+        if not ids:
+            return
+        self._check_writable()
+        with self._writing():
+            self._write([], [], [], None, delete_ids=ids)
+    
+    def upsert_chunks(
+        self,
+        ids: List[str],
+        contents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> int:
+        """
+        청크 문서 일괄 upsert (모든 청크를 한 번에 임베딩)
+        
+        같은 부모의 기존 청크 중 이번에 없는 것(공고가 짧아진 경우)과
+        청크 도입 이전의 부모 id 문서는 함께 삭제한다.
+        """
+        if not ids:
+            return 0
+        self._check_writable()
+        
+        metadatas = self._with_default_metadata(metadatas)
+        parent_ids = list(dict.fromkeys(m["parent_id"] for m in metadatas))
+        keep = set(ids)
+        embeddings = self._get_embeddings(contents) if self.collection is not None else None
         
-        print(f"Indexed {len(documents)} benefit documents")
+        # 기존 청크 조회 ~ 교체를 한 번의 락 구간에서 처리
+        with self._writing():
+            if self.collection is not None:
+                existing = self.collection.get(where={"parent_id": {"$in": parent_ids}})["ids"]
+            else:
+                existing = [
+                    d.metadata["id"] for d in self._fallback_docs
+                    if d.metadata.get("parent_id") in parent_ids
+                ]
+            stale = [doc_id for doc_id in existing + parent_ids if doc_id not in keep]
+            self._write(ids, contents, metadatas, embeddings, delete_ids=stale)
+        return len(ids)
+    
+    def _with_default_metadata(self, metadatas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """loader 기본 메타데이터(default_metadata) 중 빠진 키 채우기 (필터 검색에서 빠지지 않도록)"""
+        default_metadata = getattr(self.loader, "default_metadata", None)
+        if default_metadata is None:
+            return metadatas
+        defaults = default_metadata()
+        return [{**defaults, **(metadata or {})} for metadata in metadatas]
+    
+    def _check_writable(self):
+        if self.role == "reader":
+            raise PermissionError(
+                f"Retriever for '{self.collection_name}' is read-only (role=reader); "
+                "send writes to the writer process (API)"
+            )
+    
+    def _write(
+        self,
+        ids: List[str],
+        contents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: Optional[List[List[float]]],
+        delete_ids: List[str] = ()
+    ):
+        """인덱스 + BM25 쓰기 (호출자가 쓰기 락 보유)"""
+        if delete_ids:
+            if self.collection is not None:
+                self.collection.delete(ids=list(delete_ids))
+            else:
+                removed = set(delete_ids)
+                self._fallback_docs = [d for d in self._fallback_docs if d.metadata["id"] not in removed]
+            self.keyword_index.delete(delete_ids)
+        
+        if ids:
+            if self.collection is not None:
+                self.collection.upsert(
+                    ids=ids,
+                    embeddings=embeddings,
+                    metadatas=metadatas,
+                    documents=contents
+                )
+            else:
+                # Fallback: 메모리 문서 목록 갱신
+                replaced = set(ids)
+                self._fallback_docs = [d for d in self._fallback_docs if d.metadata["id"] not in replaced]
+                self._fallback_docs.extend(
+                    BenefitDocument(content, metadata)
+                    for content, metadata in zip(contents, metadatas)
+                )
+            self.keyword_index.upsert(ids, contents, metadatas)
+        
+        # 다른 프로세스(읽기 전용 UI 등)에 변경 알림
+        self._bump_generation()
+    
+    def _bump_generation(self):
+        """쓰기 완료 표시 - 이 프로세스의 ChromaDB 클라이언트는 자기 쓰기를 이미 보고 있음"""
+        self._seen_generation = bump_generation(self.persist_directory)
+        if self.backend == "chromadb":
+            mark_chroma_generation(self.persist_directory, self._seen_generation)
+    
+    @contextmanager
+    def _writing(self):
+        """쓰기 구간: 프로세스 간 락 획득 후 다른 프로세스의 변경부터 반영 (덮어쓰기 방지)"""
+        with self._write_lock:
+            self._reload_if_changed()
+            yield
+    
+    def refresh(self, force: bool = False) -> bool:
+        """
+        다른 프로세스의 쓰기를 반영 (refresh_interval마다 generation 파일 확인)
+        
+        Returns:
+            갱신 여부
+        """
+        now = time.monotonic()
+        if not force and now - self._refresh_checked < self.refresh_interval:
+            return False
+        self._refresh_checked = now
+        return self._reload_if_changed()
+    
+    def _reload_if_changed(self) -> bool:
+        """
+        generation 파일이 바뀌었으면 스냅샷 다시 열기
+        
+        NumPy 인덱스는 디스크에서 다시 로드하고, BM25는 현재 인덱스로 다시 만든다.
+        ChromaDB는 HNSW 세그먼트를 클라이언트 메모리에 들고 있어 다른 프로세스의 쓰기가 보이지 않으므로
+        해당 generation의 클라이언트로 컬렉션을 다시 연다 (같은 경로의 컬렉션들이 새 클라이언트를 공유).
+        """
+        with self._refresh_lock:
+            generation = read_generation(self.persist_directory)
+            if generation == self._seen_generation:
+                return False
+            self._seen_generation = generation
+            if self.backend == "numpy":
+                self.collection = VectorIndex(self._vector_index_path)
+            elif self.backend == "chromadb":
+                client = get_chroma_client(self.persist_directory, generation)
+                if client is not self.client:
+                    self.client = client
+                    self.collection = client.get_or_create_collection(
+                        name=self.collection_name,
+                        metadata=self.hnsw
+                    )
+            if self.collection is not None:
+                self._build_keyword_index()
+            return True
     
     def search(
         self,
@@ -153,56 +676,136 @@ class BenefitRetriever:
         Returns:
             검색 결과 리스트
         """
-        if self.collection is not None:
-            # ChromaDB 검색
-            query_embedding = self._get_embedding(query)
-            
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                where=filters
-            )
+        return self.search_many([query], n_results, filters)[0]
+    
+    def search_many(
+        self,
+        queries: List[str],
+        n_results: int = 3,
+        filters: Dict[str, Any] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        여러 쿼리 일괄 검색 (임베딩 encode 1회 + 인덱스 조회 1회)
+        
+        Returns:
+            쿼리 순서대로 검색 결과 리스트
+        """
+        if not queries:
+            return []
+        self.refresh()
+        
+        # 한 부모의 청크 여러 개가 상위를 차지할 수 있으므로 넉넉히 가져온 뒤 부모 단위로 묶음
+        fetch = n_results * self.chunk_overfetch if self.collapse_chunks else n_results
+        
+        if self.collection is None:
+            # Fallback: 키워드(BM25) 검색 (임베딩 모델/NumPy 모두 없을 때)
+            results = [self._fallback_search(q, fetch, filters) for q in queries]
+        elif not self.hybrid:
+            results = self._vector_search(queries, fetch, filters)
+        else:
+            # 하이브리드: 벡터 검색(스레드 풀)과 BM25(현재 스레드)를 동시에 조회 후 RRF 결합
+            candidates = max(fetch * 4, 20)
+            vector_future = _search_executor.submit(self._vector_search, queries, candidates, filters)
+            keyword_hits = [self.keyword_index.search(q, candidates, filters) for q in queries]
+            vector_hits = vector_future.result()
             
-            # 결과 포맷팅
-            formatted = []
-            for i, doc_id in enumerate(results["ids"][0]):
-                formatted.append({
+            results = [
+                self._fuse(vector, keyword, fetch)
+                for vector, keyword in zip(vector_hits, keyword_hits)
+            ]
+        
+        if self.collapse_chunks:
+            return [self._collapse(hits, n_results) for hits in results]
+        return [hits[:n_results] for hits in results]
+    
+    @staticmethod
+    def _collapse(hits: List[Dict[str, Any]], n_results: int) -> List[Dict[str, Any]]:
+        """청크 결과 -> 부모 문서별 최고 순위 청크 (id는 부모 id, chunk_id에 청크 id)"""
+        collapsed = []
+        seen = set()
+        for hit in hits:
+            if len(collapsed) >= n_results:
+                break
+            parent_id = (hit.get("metadata") or {}).get("parent_id")
+            if parent_id is None:
+                collapsed.append(hit)
+            elif parent_id not in seen:
+                seen.add(parent_id)
+                collapsed.append({**hit, "id": parent_id, "chunk_id": hit["id"]})
+        return collapsed
+    
+    def _fuse(
+        self,
+        vector_hits: List[Dict[str, Any]],
+        keyword_hits: List[tuple],
+        n_results: int
+    ) -> List[Dict[str, Any]]:
+        """벡터/BM25 결과 RRF 결합"""
+        fused = reciprocal_rank_fusion(
+            [[h["id"] for h in vector_hits], [doc_id for doc_id, _ in keyword_hits]],
+            k=self.rrf_k
+        )[:n_results]
+        
+        by_id = {h["id"]: h for h in vector_hits}
+        missing = [doc_id for doc_id, _ in fused if doc_id not in by_id]
+        if missing:
+            # BM25에서만 나온 문서는 본문/메타데이터를 따로 조회
+            extra = self.collection.get(ids=missing)
+            for i, doc_id in enumerate(extra["ids"]):
+                by_id[doc_id] = {
+                    "id": doc_id,
+                    "content": extra["documents"][i],
+                    "metadata": extra["metadatas"][i],
+                    "distance": None
+                }
+        
+        return [{**by_id[doc_id], "score": score} for doc_id, score in fused if doc_id in by_id]
+    
+    def _vector_search(
+        self,
+        queries: List[str],
+        n_results: int,
+        filters: Dict[str, Any] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """다중 쿼리 벡터 검색 (ChromaDB 또는 NumPy 인덱스)"""
+        results = self.collection.query(
+            query_embeddings=self._get_query_embeddings(queries),
+            n_results=n_results,
+            where=filters
+        )
+        
+        # 결과 포맷팅
+        formatted = []
+        for q in range(len(queries)):
+            hits = []
+            for i, doc_id in enumerate(results["ids"][q]):
+                hits.append({
                     "id": doc_id,
-                    "content": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i],
-                    "distance": results["distances"][0][i] if results.get("distances") else None
+                    "content": results["documents"][q][i],
+                    "metadata": results["metadatas"][q][i],
+                    "distance": results["distances"][q][i] if results.get("distances") else None
                 })
-            
-            return formatted
-        else:
-            # Fallback: 키워드 기반 검색
-            return self._fallback_search(query, n_results)
+            formatted.append(hits)
+        
+        return formatted
     
-    def _fallback_search(self, query: str, n_results: int) -> List[Dict]:
-        """ChromaDB 없을 때 키워드 기반 검색"""
+    def _fallback_search(self, query: str, n_results: int, filters: Dict[str, Any] = None) -> List[Dict]:
+        """벡터 인덱스가 없을 때 BM25 키워드 검색"""
+        docs = {d.metadata["id"]: d for d in self._fallback_docs}
         results = []
-        query_lower = query.lower()
         
-        for doc in self._fallback_docs:
-            score = 0
-            content_lower = doc.page_content.lower()
-            
-            # 키워드 매칭 점수
-            for word in query_lower.split():
-                if word in content_lower:
-                    score += 1
-            
-            if score > 0:
-                results.append({
-                    "id": doc.metadata["id"],
-                    "content": doc.page_content,
-                    "metadata": doc.metadata,
-                    "score": score
-                })
+        for doc_id, score in self.keyword_index.search(query, n_results, filters):
+            doc = docs.get(doc_id)
+            if doc is None:
+                continue
+            results.append({
+                "id": doc_id,
+                "content": doc.page_content,
+                "metadata": doc.metadata,
+                "score": score
+            })
         
-        # 점수순 정렬
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:n_results]
+        return results
     
     def get_all_benefits(self) -> List[Dict[str, Any]]:
         """모든 혜택 데이터 반환"""
@@ -223,8 +826,199 @@ class BenefitRetriever:
             ]
 
 
+# ===== Process-wide Registry =====
+# 요청마다 BenefitRetriever를 만들면 모델 가중치를 매번 다시 로드하므로,
+# 같은 설정의 검색기는 프로세스 안에서 하나만 만들어 재사용한다.
+# 임베딩 모델과 ChromaDB 클라이언트는 컬렉션(검색기)이 달라도 공유한다.
+
+_registry_lock = threading.Lock()
+_retrievers: Dict[tuple, BenefitRetriever] = {}
+_creation_locks: Dict[tuple, threading.Lock] = {}  # 키 -> 생성 락 (같은 설정의 검색기는 한 번만 생성)
+_configs: Dict[tuple, Dict[str, Any]] = {}  # 키 -> 생성 인자 (같은 키를 다른 설정으로 요청하면 오류)
+
+_shared_lock = threading.Lock()
+_models: Dict[tuple, ModelHolder] = {}  # (backend, model_name) -> 모델 홀더
+_clients: Dict[str, tuple] = {}  # 절대 경로 -> (본 generation, ChromaDB 클라이언트)
+_write_locks: Dict[str, InterProcessLock] = {}  # 절대 경로 -> 쓰기 락
+_write_queues: Dict[str, IndexWriteQueue] = {}  # 절대 경로 -> 쓰기 스레드
+
+
+def hnsw_metadata(
+    m: Optional[int] = None,
+    construction_ef: Optional[int] = None,
+    search_ef: Optional[int] = None,
+    space: str = "cosine"
+) -> Dict[str, Any]:
+    """
+    ChromaDB HNSW 컬렉션 메타데이터
+    
+    None인 항목은 Chroma 기본값 사용 (M=16, construction_ef=100, search_ef=10).
+    M/construction_ef를 키우면 빌드 시간·메모리가 늘고 recall이 오르며,
+    search_ef를 키우면 쿼리 지연이 늘고 recall이 오른다.
+    """
+    metadata = {"hnsw:space": space}
+    for key, value in (("hnsw:M", m), ("hnsw:construction_ef", construction_ef), ("hnsw:search_ef", search_ef)):
+        if value is not None:
+            metadata[key] = value
+    return metadata
+
+
+def get_model_holder(model_name: str, backend: str = "torch", cache_dir: str = None) -> ModelHolder:
+    """
+    프로세스 공용 임베딩 모델 홀더 (모델당 1개)
+    
+    RAG_MODEL_IDLE_TIMEOUT(초)이 지나도록 쓰지 않으면 가중치를 내리고 다음 검색 때 다시 로드하며,
+    RAG_MODEL_MEMORY_BUDGET_MB를 넘으면 오래 쓰지 않은 다른 모델부터 내린다.
+    """
+    key = (backend, model_name)
+    with _shared_lock:
+        if key not in _models:
+            if backend == "onnx":
+                name = f"ONNX int8 embedding model {model_name}"
+                loader = lambda: OnnxEmbedder(model_name, cache_dir=cache_dir)
+            else:
+                name = f"embedding model {model_name}"
+                loader = lambda: SentenceTransformer(model_name)
+            _models[key] = create_holder(name, loader, idle_timeout=env_idle_timeout())
+        return _models[key]
+
+
+def get_chroma_client(persist_directory: str, generation: Optional[int] = None):
+    """
+    프로세스 공용 ChromaDB 클라이언트 (저장 경로별 1개, 0.4+ 호환)
+    
+    클라이언트는 열 때의 HNSW 세그먼트를 메모리에 유지하므로, 다른 프로세스가 쓴 뒤의
+    generation을 요청하면 시스템 캐시를 비우고 디스크에서 다시 연다.
+    이 프로세스가 쓴 generation은 mark_chroma_generation으로 기록되어 다시 열지 않는다.
+    """
+    path = str(Path(persist_directory).resolve())
+    with _shared_lock:
+        cached = _clients.get(path)
+        if cached is not None and (generation is None or cached[0] == generation):
+            return cached[1]
+        if cached is not None:
+            # 같은 경로의 PersistentClient는 chromadb 내부에서 시스템을 공유하므로 캐시를 비워야 새로 열림
+            clear_cache = getattr(cached[1], "clear_system_cache", None)
+            if clear_cache is not None:
+                clear_cache()
+        try:
+            # ChromaDB 0.4+ 방식 (PersistentClient)
+            client = chromadb.PersistentClient(path=path)
+        except (TypeError, AttributeError):
+            # 구버전 fallback (0.3.x)
+            client = chromadb.Client(Settings(
+                chroma_db_impl="duckdb+parquet",
+                persist_directory=path,
+                anonymized_telemetry=False
+            ))
+        _clients[path] = (generation, client)
+        return client
+
+
+def mark_chroma_generation(persist_directory: str, generation: int):
+    """이 프로세스의 쓰기로 바뀐 generation 기록 (공유 클라이언트는 이미 최신)"""
+    path = str(Path(persist_directory).resolve())
+    with _shared_lock:
+        cached = _clients.get(path)
+        if cached is not None:
+            _clients[path] = (generation, cached[1])
+
+
+def get_write_lock(persist_directory: str) -> InterProcessLock:
+    """저장 경로별 쓰기 락 (같은 경로의 모든 컬렉션이 공유 - ChromaDB는 경로당 DB 1개)"""
+    path = str(Path(persist_directory).resolve())
+    with _shared_lock:
+        if path not in _write_locks:
+            _write_locks[path] = InterProcessLock(str(Path(path) / LOCK_FILENAME))
+        return _write_locks[path]
+
+
+def get_write_queue(persist_directory: str) -> IndexWriteQueue:
+    """저장 경로별 쓰기 스레드 (API의 upsert/sync 요청을 순서대로 처리)"""
+    path = str(Path(persist_directory).resolve())
+    with _shared_lock:
+        if path not in _write_queues:
+            _write_queues[path] = IndexWriteQueue(Path(path).name)
+        return _write_queues[path]
+
+
+def _retriever_config(options: Dict[str, Any]) -> Dict[str, Any]:
+    """비교용 생성 인자 (loader는 인스턴스 대신 타입 + 속성으로 비교, 기본값은 BenefitLoader)"""
+    config = dict(options)
+    loader = config.pop("loader", None) or BenefitLoader()
+    config["loader"] = (type(loader), getattr(loader, "__dict__", {}))
+    return config
+
+
+def _check_config(key: tuple, config: Dict[str, Any]):
+    existing = _configs.get(key)
+    if existing is not None and existing != config:
+        changed = sorted(k for k in existing.keys() | config.keys() if existing.get(k) != config.get(k))
+        raise ValueError(
+            f"Retriever for '{key[0]}' is already registered with a different configuration "
+            f"(differs in: {', '.join(changed)}); use another collection name"
+        )
+
+
+def _get_or_create(key: tuple, **options) -> BenefitRetriever:
+    """
+    키별 공용 검색기 (없으면 생성)
+    
+    이미 있는 키를 다른 loader/옵션으로 요청하면 조용히 이전 검색기를 돌려주지 않고 ValueError.
+    """
+    config = _retriever_config(options)
+    with _registry_lock:
+        retriever = _retrievers.get(key)
+        if retriever is not None:
+            _check_config(key, config)
+            return retriever
+        key_lock = _creation_locks.setdefault(key, threading.Lock())
+    
+    # 생성(모델 로드·인덱싱)은 키별 락에서 - 다른 설정의 검색기 요청은 첫 인덱스 빌드를 기다리지 않음
+    with key_lock:
+        retriever = _retrievers.get(key)
+        if retriever is None:
+            retriever = BenefitRetriever(**options)
+            with _registry_lock:
+                _retrievers[key] = retriever
+                _configs[key] = config
+        else:
+            _check_config(key, config)
+        return retriever
+
+
+def get_retriever(
+    collection_name: str = "benefits",
+    persist_directory: str = None,
+    embedding_model: str = "jhgan/ko-sbert-nli",
+    embedding_backend: str = None,
+    role: str = None
+) -> BenefitRetriever:
+    """
+    프로세스 공용 BenefitRetriever 반환 (없으면 생성)
+    
+    embedding_backend 미지정 시 RAG_EMBEDDING_BACKEND 환경변수 (기본 "torch")
+    role 미지정 시 RAG_INDEX_ROLE 환경변수 (기본 "reader" - 쓰기는 API 프로세스만 명시적으로 "writer")
+    """
+    embedding_backend = embedding_backend or os.getenv("RAG_EMBEDDING_BACKEND", "torch")
+    role = role or os.getenv("RAG_INDEX_ROLE", "reader")
+    return _get_or_create(
+        (collection_name, persist_directory, embedding_model, embedding_backend, role),
+        collection_name=collection_name,
+        persist_directory=persist_directory,
+        embedding_model=embedding_model,
+        embedding_backend=embedding_backend,
+        role=role
+    )
+
+
+def registry_status() -> List[Dict[str, Any]]:
+    """등록된 검색기들의 모델 로드 상태 (생성 중인 검색기를 기다리지 않도록 락 없이 조회)"""
+    return [r.status() for r in list(_retrievers.values())]
+
+
 if __name__ == "__main__":
-    retriever = BenefitRetriever()
+    retriever = get_retriever()
     
     # 테스트 검색
     print("=== 검색: '청년 월세 지원' ===")
@@ -0,0 +1,423 @@
+"""
+Vector Index - NumPy 기반 exact 벡터 인덱스
+ChromaDB 없이도 의미 기반 검색이 가능하도록 하는 소규모 배포용 인덱스
+
+- 정규화된 벡터를 memmap 행렬(float32/float16)로 저장, 행 단위로 증분 추가
+- 메타데이터는 스냅샷(index.json) + 추가 전용 로그(index.log): 쓰기 비용은 바뀐 행 수에 비례
+- 삭제된 행 비율이나 로그 길이가 커지면 스냅샷으로 합치고, 필요하면 행렬도 압축(compact)
+- 검색은 블록 단위 행렬-벡터 곱 + argpartition top-k (cosine, 행렬 전체를 float32로 복사하지 않음)
+- ChromaDB Collection의 count/add/upsert/update/get/query/delete 일부를 같은 형태로 제공
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+_OPERATORS = {
+    "$eq": lambda a, b: a == b,
+    "$ne": lambda a, b: a != b,
+    "$gt": lambda a, b: a is not None and a > b,
+    "$gte": lambda a, b: a is not None and a >= b,
+    "$lt": lambda a, b: a is not None and a < b,
+    "$lte": lambda a, b: a is not None and a <= b,
+    "$in": lambda a, b: a in b,
+    "$nin": lambda a, b: a not in b,
+}
+
+
+def matches_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """ChromaDB where 필터 문법의 부분 구현 ($and/$or + 비교 연산자)"""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, c) for c in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, c) for c in condition):
+                return False
+        elif isinstance(condition, dict):
+            # 키가 없는 문서는 조건을 만족하지 않음 (ChromaDB와 동일)
+            if key not in metadata:
+                return False
+            value = metadata[key]
+            if not all(_OPERATORS[op](value, operand) for op, operand in condition.items()):
+                return False
+        elif metadata.get(key, object()) != condition:
+            return False
+    return True
+
+
+class VectorIndex:
+    """
+    memmap 행렬 + id 맵 기반 exact cosine 인덱스
+
+    Args:
+        directory: 저장 경로 (None이면 메모리 전용)
+        dtype: 행렬 저장 타입 ("float32" 또는 "float16")
+    """
+
+    _INITIAL_CAPACITY = 64
+    _COMPACT_RATIO = 0.25  # 삭제된 행이 이 비율을 넘으면 행렬 압축
+    _COMPACT_MIN_ROWS = 64  # 삭제된 행이 이보다 적으면 압축하지 않음
+    _QUERY_BLOCK_ROWS = 16384  # 검색 시 한 번에 float32로 변환하는 행 수
+
+    def __init__(self, directory: str = None, dtype: str = "float32"):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for VectorIndex")
+
+        self.directory = Path(directory) if directory else None
+        self.dtype = np.dtype(dtype)
+        self.dim: Optional[int] = None
+
+        self._ids: List[Optional[str]] = []  # 행 번호 -> id (삭제된 행은 None)
+        self._rows: Dict[str, int] = {}  # id -> 행 번호
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        self._matrix = None  # (capacity, dim)
+        self._valid = None  # 삭제되지 않은 행 마스크
+
+        # 스냅샷 세대: 로그 항목은 자기 세대의 스냅샷에만 적용 (합친 뒤 남은 이전 로그는 무시)
+        self._epoch = 0
+        self._matrix_file = "vectors.bin"
+        self._log_rows = 0  # 현재 세대 로그에 기록된 행 수
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    # ----- 저장/로드 -----
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.directory / "index.json"
+
+    @property
+    def _log_path(self) -> Path:
+        return self.directory / "index.log"
+
+    @property
+    def _matrix_path(self) -> Path:
+        return self.directory / self._matrix_file
+
+    def _load(self):
+        # 다른 프로세스가 압축하며 이전 행렬 파일을 지웠으면 새 스냅샷으로 다시 읽음
+        for attempt in range(3):
+            try:
+                return self._load_once()
+            except FileNotFoundError:
+                if attempt == 2:
+                    raise
+
+    def _load_once(self):
+        if not self._meta_path.exists():
+            return
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.dim = meta["dim"]
+        self.dtype = np.dtype(meta["dtype"])
+        self._epoch = meta.get("epoch", 0)
+        self._matrix_file = meta.get("matrix", "vectors.bin")
+        self._ids = meta["ids"]
+        self._documents = meta["documents"]
+        self._metadatas = meta["metadatas"]
+        self._rows = {doc_id: i for i, doc_id in enumerate(self._ids) if doc_id is not None}
+        self._log_rows = 0
+        for entry in self._read_log():
+            if entry["op"] == "upsert":
+                self._apply_upsert(entry["rows"], entry["ids"], entry["documents"], entry["metadatas"])
+            elif entry["op"] == "update":
+                self._apply_update(entry["ids"], entry["metadatas"])
+            else:
+                self._apply_delete(entry["ids"])
+            self._log_rows += len(entry["ids"])
+
+        # 행렬 크기는 파일에서 (쓰는 쪽은 로그를 남기기 전에 파일을 먼저 늘림)
+        capacity = max(self._matrix_path.stat().st_size // (self.dim * self.dtype.itemsize), len(self._ids), 1)
+        self._matrix = np.memmap(self._matrix_path, dtype=self.dtype, mode="r+", shape=(capacity, self.dim))
+        self._valid = np.zeros(capacity, dtype=bool)
+        self._valid[[i for i, doc_id in enumerate(self._ids) if doc_id is not None]] = True
+
+    def _read_log(self) -> List[Dict[str, Any]]:
+        """현재 세대의 로그 항목 (쓰는 도중 잘린 줄은 건너뜀)"""
+        if not self._log_path.exists():
+            return []
+        entries = []
+        with open(self._log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("epoch") == self._epoch:
+                    entries.append(entry)
+        return entries
+
+    def _write_snapshot(self):
+        """메타데이터 전체를 새 세대 스냅샷으로 쓰고 로그를 비움"""
+        self._epoch += 1
+        meta = {
+            "dim": self.dim,
+            "dtype": self.dtype.name,
+            "epoch": self._epoch,
+            "matrix": self._matrix_file,
+            "ids": self._ids,
+            "documents": self._documents,
+            "metadatas": self._metadatas,
+        }
+        # 원자적 교체 (쓰는 도중 읽어도 깨진 파일을 보지 않도록)
+        tmp_path = self._meta_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, self._meta_path)
+        # 이전 세대 로그 항목은 새 스냅샷에 들어갔으므로 비움 (남아 있어도 세대가 달라 무시됨)
+        open(self._log_path, "w").close()
+        self._log_rows = 0
+
+    def _append_log(self, entry: Dict[str, Any]):
+        with open(self._log_path, "a+b") as f:
+            # 이전 쓰기가 중간에 끊겼으면 줄을 바꿔 새 항목이 깨진 줄에 붙지 않도록
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write((json.dumps({**entry, "epoch": self._epoch}, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    def _save(self, entry: Dict[str, Any]):
+        """바뀐 행만 로그에 추가 (로그가 인덱스보다 길어지면 스냅샷으로 합치고, 삭제 행이 많으면 압축)"""
+        deleted = len(self._ids) - len(self._rows)
+        if deleted >= self._COMPACT_MIN_ROWS and deleted > self._COMPACT_RATIO * len(self._ids):
+            self.compact()
+            return
+        if self.directory is None:
+            return
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+
+        self._log_rows += len(entry["ids"])
+        if not self._meta_path.exists() or self._log_rows > max(len(self._ids), self._INITIAL_CAPACITY):
+            self._write_snapshot()
+        else:
+            self._append_log(entry)
+
+    def compact(self):
+        """삭제된 행을 없애고 남은 행을 앞으로 모아 새 행렬 파일 + 스냅샷으로 다시 씀"""
+        if self.dim is None:
+            return
+        keep = np.array([row for row, doc_id in enumerate(self._ids) if doc_id is not None], dtype=int)
+        capacity = max(self._INITIAL_CAPACITY, len(keep))
+
+        if self.directory is not None:
+            old_path = self._matrix_path
+            # 읽는 프로세스가 이전 행렬을 쓰고 있을 수 있으므로 새 파일에 씀 (세대별 파일명)
+            self._matrix_file = f"vectors.{self._epoch + 1}.bin"
+            matrix = np.memmap(self._matrix_path, dtype=self.dtype, mode="w+", shape=(capacity, self.dim))
+        else:
+            old_path = None
+            matrix = np.zeros((capacity, self.dim), dtype=self.dtype)
+        for start in range(0, len(keep), self._QUERY_BLOCK_ROWS):
+            block = keep[start:start + self._QUERY_BLOCK_ROWS]
+            matrix[start:start + len(block)] = self._matrix[block]
+
+        self._ids = [self._ids[r] for r in keep]
+        self._documents = [self._documents[r] for r in keep]
+        self._metadatas = [self._metadatas[r] for r in keep]
+        self._rows = {doc_id: i for i, doc_id in enumerate(self._ids)}
+        self._matrix = matrix
+        self._valid = np.zeros(capacity, dtype=bool)
+        self._valid[:len(keep)] = True
+
+        if old_path is not None:
+            matrix.flush()
+            self._write_snapshot()
+            if old_path != self._matrix_path:
+                old_path.unlink(missing_ok=True)
+
+    def _ensure_capacity(self, needed: int):
+        """행렬 용량 확보 (부족하면 2배씩 확장 후 다시 매핑)"""
+        capacity = 0 if self._valid is None else len(self._valid)
+        if needed <= capacity:
+            return
+
+        new_capacity = max(self._INITIAL_CAPACITY, capacity)
+        while new_capacity < needed:
+            new_capacity *= 2
+
+        if self.directory is not None:
+            if isinstance(self._matrix, np.memmap):
+                self._matrix.flush()
+                del self._matrix
+            # 파일 크기만 늘리고 기존 행은 그대로 둔 채 다시 매핑
+            with open(self._matrix_path, "ab") as f:
+                f.truncate(new_capacity * self.dim * self.dtype.itemsize)
+            matrix = np.memmap(self._matrix_path, dtype=self.dtype, mode="r+", shape=(new_capacity, self.dim))
+        else:
+            matrix = np.zeros((new_capacity, self.dim), dtype=self.dtype)
+            if self._matrix is not None:
+                matrix[:capacity] = self._matrix
+
+        valid = np.zeros(new_capacity, dtype=bool)
+        if self._valid is not None:
+            valid[:capacity] = self._valid
+
+        self._matrix = matrix
+        self._valid = valid
+
+    def _apply_upsert(self, rows: List[int], ids: List[str], documents: List, metadatas: List):
+        """행 번호가 정해진 id/문서/메타데이터 반영 (쓰기와 로그 재생 공용)"""
+        for row, doc_id, document, metadata in zip(rows, ids, documents, metadatas):
+            while len(self._ids) <= row:
+                self._ids.append(None)
+                self._documents.append(None)
+                self._metadatas.append(None)
+            self._ids[row] = doc_id
+            self._rows[doc_id] = row
+            self._documents[row] = document
+            self._metadatas[row] = metadata
+
+    def _apply_update(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> List[str]:
+        """메타데이터만 반영 -> 갱신된 id"""
+        updated = []
+        for doc_id, metadata in zip(ids, metadatas):
+            row = self._rows.get(doc_id)
+            if row is None:
+                continue
+            self._metadatas[row] = metadata
+            updated.append(doc_id)
+        return updated
+
+    def _apply_delete(self, ids: List[str]) -> List[int]:
+        """id 삭제 반영 -> 비운 행 번호"""
+        rows = []
+        for doc_id in ids:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                continue
+            self._ids[row] = None
+            self._documents[row] = None
+            self._metadatas[row] = None
+            rows.append(row)
+        return rows
+
+    # ----- 쓰기 -----
+
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]] = None,
+        documents: List[str] = None
+    ):
+        """벡터 추가/갱신 (기존 id는 같은 행을 덮어쓰고, 새 id는 끝에 추가)"""
+        if not ids:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+
+        # cosine 검색을 내적으로 처리하기 위해 저장 시 정규화
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        metadatas = metadatas or [None] * len(ids)
+        documents = documents or [None] * len(ids)
+
+        new_ids = [doc_id for doc_id in dict.fromkeys(ids) if doc_id not in self._rows]
+        self._ensure_capacity(len(self._ids) + len(new_ids))
+        for offset, doc_id in enumerate(new_ids):
+            self._rows[doc_id] = len(self._ids) + offset
+
+        rows = [self._rows[doc_id] for doc_id in ids]
+        self._matrix[rows] = vectors.astype(self.dtype)
+        self._valid[rows] = True
+        self._apply_upsert(rows, ids, documents, metadatas)
+
+        self._save({"op": "upsert", "rows": rows, "ids": ids, "documents": documents, "metadatas": metadatas})
+
+    add = upsert
+
+    def update(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        """메타데이터만 갱신 (벡터/문서는 그대로, 없는 id는 무시)"""
+        updated = self._apply_update(ids, metadatas)
+        if not updated:
+            return
+        self._save({"op": "update", "ids": list(ids), "metadatas": list(metadatas)})
+
+    def delete(self, ids: List[str]):
+        """벡터 삭제 (행은 마스크만 해제, 삭제 행이 쌓이면 compact)"""
+        rows = self._apply_delete(ids)
+        if not rows:
+            return
+        self._valid[rows] = False
+        self._save({"op": "delete", "ids": list(ids)})
+
+    # ----- 읽기 -----
+
+    def count(self) -> int:
+        return len(self._rows)
+
+    def get(self, ids: List[str] = None, where: Dict[str, Any] = None) -> Dict[str, List]:
+        rows = [self._rows[i] for i in ids if i in self._rows] if ids else sorted(self._rows.values())
+        rows = [r for r in rows if matches_where(self._metadatas[r] or {}, where)]
+        return {
+            "ids": [self._ids[r] for r in rows],
+            "documents": [self._documents[r] for r in rows],
+            "metadatas": [self._metadatas[r] for r in rows],
+        }
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Dict[str, Any] = None
+    ) -> Dict[str, List[List]]:
+        """다중 쿼리 exact top-k 검색 (ChromaDB query와 같은 결과 형태)"""
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        if self.count() == 0:
+            for key in results:
+                results[key] = [[] for _ in query_embeddings]
+            return results
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.where(norms == 0, 1, norms)
+
+        mask = self._valid.copy()
+        if where:
+            for row in np.flatnonzero(mask):
+                if not matches_where(self._metadatas[row] or {}, where):
+                    mask[row] = False
+        candidates = int(mask.sum())
+        k = min(n_results, candidates)
+
+        # (n_queries, 사용 중인 행) 유사도 - 블록마다 float32로 변환 (float32 저장이면 복사 없음), 제외 행은 -inf
+        used = len(self._ids)
+        similarities = np.empty((len(queries), used), dtype=np.float32)
+        for start in range(0, used, self._QUERY_BLOCK_ROWS):
+            block = self._matrix[start:min(start + self._QUERY_BLOCK_ROWS, used)]
+            similarities[:, start:start + len(block)] = queries @ block.astype(np.float32, copy=False).T
+        similarities[:, ~mask[:used]] = -np.inf
+
+        for sims in similarities:
+            if k == 0:
+                top = np.array([], dtype=int)
+            else:
+                top = np.argpartition(-sims, k - 1)[:k]
+                top = top[np.argsort(-sims[top])]
+            results["ids"].append([self._ids[r] for r in top])
+            results["documents"].append([self._documents[r] for r in top])
+            results["metadatas"].append([self._metadatas[r] for r in top])
+            results["distances"].append([float(1 - sims[r]) for r in top])
+
+        return results
@@ -0,0 +1,44 @@
+"""
+pytest 공용 설정
+- 프로젝트 루트를 import 경로에 추가 (src.*, api.* 패키지)
+- sentence-transformers 없이 NumPy 인덱스를 쓰기 위한 해시 임베딩 모델
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class HashEmbedder:
+    """토큰 해시 bag-of-words 임베딩 (SentenceTransformer.encode와 같은 형태)"""
+
+    DIM = 64
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        vectors = []
+        for text in [texts] if single else texts:
+            vector = np.zeros(self.DIM, dtype=np.float32)
+            for token in text.split():
+                vector[int(hashlib.md5(token.encode("utf-8")).hexdigest(), 16) % self.DIM] += 1
+            vectors.append(vector)
+        vectors = np.array(vectors)
+        return vectors[0] if single else vectors
+
+
+@pytest.fixture
+def hash_embeddings(monkeypatch):
+    """BenefitRetriever가 실제 모델 대신 HashEmbedder를 쓰도록 (NumPy 백엔드 사용 가능)"""
+    import src.rag.retriever as retriever_module
+
+    monkeypatch.setattr(retriever_module, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+    monkeypatch.setattr(retriever_module, "SentenceTransformer", HashEmbedder, raising=False)
+    return HashEmbedder
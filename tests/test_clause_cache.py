@@ -0,0 +1,63 @@
+import sqlite3
+import unicodedata
+
+from src.legal.clause_cache import ClauseExplanationCache
+
+
+CLAUSE = "임차인은 계약 종료 시 원상복구 비용을 전액 부담한다."
+
+
+def test_get_put_keyed_by_language_and_version(tmp_path):
+    cache = ClauseExplanationCache(tmp_path / "cache.db")
+    cache.put(CLAUSE, "KO", "v1", "해석 v1")
+    cache.put(CLAUSE, "EN", "v1", "explanation v1")
+
+    assert cache.get(CLAUSE, "KO", "v1") == "해석 v1"
+    assert cache.get(CLAUSE, "EN", "v1") == "explanation v1"
+    assert cache.get(CLAUSE, "KO", "v2") is None
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+    # 덮어쓰기
+    cache.put(CLAUSE, "KO", "v1", "수정된 해석")
+    assert cache.get(CLAUSE, "KO", "v1") == "수정된 해석"
+    assert len(cache) == 2
+
+
+def test_whitespace_and_unicode_normalization(tmp_path):
+    cache = ClauseExplanationCache(tmp_path / "cache.db")
+    cache.put(CLAUSE, "KO", "v1", "해석")
+    variant = "  임차인은 계약 종료 시\n원상복구 비용을   전액 부담한다. "
+    assert cache.get(variant, "KO", "v1") == "해석"
+    # NFD(자모 분리)로 입력된 같은 문장
+    assert cache.get(unicodedata.normalize("NFD", CLAUSE), "KO", "v1") == "해석"
+
+
+def test_prune_removes_other_versions(tmp_path):
+    cache = ClauseExplanationCache(tmp_path / "cache.db")
+    cache.put(CLAUSE, "KO", "old", "이전 해석")
+    cache.put("다른 조항", "KO", "old", "이전 해석")
+    cache.put(CLAUSE, "KO", "new", "새 해석")
+
+    assert cache.prune("new") == 2
+    assert len(cache) == 1
+    assert cache.get(CLAUSE, "KO", "new") == "새 해석"
+
+
+def test_unversioned_table_is_dropped(tmp_path):
+    path = tmp_path / "cache.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE clause_explanations (clause_hash TEXT, language TEXT, clause TEXT, explanation TEXT, "
+        "PRIMARY KEY (clause_hash, language))"
+    )
+    conn.execute("INSERT INTO clause_explanations VALUES ('h', 'KO', 'c', 'e')")
+    conn.commit()
+    conn.close()
+
+    cache = ClauseExplanationCache(path)
+    assert len(cache) == 0
+    cache.put(CLAUSE, "KO", "v1", "해석")
+    assert cache.get(CLAUSE, "KO", "v1") == "해석"
+
+    # 이미 버전 컬럼이 있으면 다시 열어도 유지
+    assert ClauseExplanationCache(path).get(CLAUSE, "KO", "v1") == "해석"
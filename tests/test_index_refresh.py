@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from src.rag.loader import BenefitLoader, eligibility_filter
+from src.rag.locking import GENERATION_FILENAME, bump_generation, read_generation
+from src.rag.retriever import BenefitRetriever
+
+
+BENEFITS = [
+    {
+        "id": "benefit_001",
+        "name": "청년 월세 지원",
+        "category": "주거",
+        "provider": "국토교통부",
+        "description": "청년 월세 지원금",
+        "eligibility": {"age_min": 19, "age_max": 34},
+        "benefit": {"amount": 200000, "unit": "원/월"},
+    },
+    {
+        "id": "benefit_002",
+        "name": "전세자금 대출",
+        "category": "금융",
+        "provider": "주택도시기금",
+        "description": "청년 전세 대출 금리 우대",
+        "eligibility": {},
+        "benefit": {"loan_max": 20000},
+    },
+]
+
+
+def test_generation_counter(tmp_path):
+    assert read_generation(str(tmp_path)) is None
+    assert bump_generation(str(tmp_path)) == 1
+    assert bump_generation(str(tmp_path)) == 2
+    assert read_generation(str(tmp_path)) == 2
+
+    (tmp_path / GENERATION_FILENAME).write_text("")
+    assert read_generation(str(tmp_path)) is None
+
+
+@pytest.fixture
+def retrievers(tmp_path, hash_embeddings):
+    data_path = tmp_path / "benefits.json"
+    data_path.write_text(json.dumps(BENEFITS, ensure_ascii=False), encoding="utf-8")
+    options = dict(
+        persist_directory=str(tmp_path / "index"),
+        collection_name="benefits",
+        embedding_model="test-hash-model",
+        index_backend="numpy",
+        use_embedding_cache=False,
+        loader=BenefitLoader(str(data_path)),
+        refresh_interval=0,
+    )
+    writer = BenefitRetriever(role="writer", **options)
+    reader = BenefitRetriever(role="reader", **options)
+    return writer, reader
+
+
+def test_reader_sees_writer_upserts(retrievers):
+    writer, reader = retrievers
+    assert writer.backend == reader.backend == "numpy"
+    assert not reader.refresh()
+
+    writer.upsert_documents(["notice_1"], ["행복주택 입주자 모집 공고"], [{"id": "notice_1"}])
+    assert read_generation(writer.persist_directory) == writer._seen_generation
+
+    assert reader.refresh()
+    assert not reader.refresh()
+    hits = reader.search("행복주택 입주자 모집 공고", n_results=1)
+    assert hits[0]["metadata"]["id"] == "notice_1"
+    # upsert 시점에 자격 기본값이 채워져 필터 검색에서도 보임
+    filters = eligibility_filter(age=40, status="직장인")
+    assert reader.search("행복주택 입주자 모집 공고", n_results=1, filters=filters)[0]["metadata"]["id"] == "notice_1"
+
+
+def test_reader_sees_writer_deletes(retrievers):
+    writer, reader = retrievers
+    writer.delete_documents(["benefit_001"])
+
+    assert reader.refresh()
+    ids = {benefit["id"] for benefit in reader.get_all_benefits()}
+    assert ids == {"benefit_002"}
+
+
+def test_reader_rejects_writes(retrievers):
+    _, reader = retrievers
+    with pytest.raises(PermissionError):
+        reader.upsert_documents(["notice_2"], ["공고"], [{"id": "notice_2"}])
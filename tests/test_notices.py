@@ -0,0 +1,71 @@
+from datetime import date
+
+import pytest
+
+from src.legal.notices import NOTICE_TYPES, missing_fields, render_notice
+
+
+ISSUED_ON = date(2025, 3, 1)
+
+
+def test_amount_field_formatting():
+    details = {"deposit_amount": 200000000, "contract_end_date": "2025-01-31", "deadline": "2025-02-14"}
+    notice = render_notice("보증금반환", "홍길동", details, issued_on=ISSUED_ON)
+    assert notice.startswith("[임대차보증금 반환 청구서]")
+    assert "보증금 200,000,000원" in notice
+    assert "주택임대차보호법 제3조의2" in notice
+    assert "2025년 3월 1일" in notice and "발신인 홍길동 (인)" in notice
+
+    english = render_notice("보증금반환", "Hong", details, language="EN", issued_on=ISSUED_ON)
+    assert "KRW 200,000,000" in english
+    assert "March 01, 2025" in english
+
+
+@pytest.mark.parametrize("unit, expected", [("만원", "증액 5만원"), ("%", "증액 5%"), ("원", "증액 5원")])
+def test_requested_increase_unit(unit, expected):
+    details = {"requested_increase": 5, "requested_increase_unit": unit, "legal_limit": 5}
+    notice = render_notice("증액거부", "홍길동", details, issued_on=ISSUED_ON)
+    assert expected in notice
+    assert "법정 상한인 5%" in notice
+
+
+def test_requested_increase_without_unit_is_unformatted():
+    notice = render_notice("증액거부", "홍길동", {"requested_increase": "월 10만원", "legal_limit": 5}, issued_on=ISSUED_ON)
+    assert "증액 월 10만원" in notice
+
+
+def test_unknown_unit_rejected():
+    with pytest.raises(ValueError, match="Unknown unit"):
+        render_notice("증액거부", "홍길동", {"requested_increase": 5, "requested_increase_unit": "달러", "legal_limit": 5})
+
+
+def test_percent_out_of_range_rejected():
+    with pytest.raises(ValueError, match="between 0 and 100"):
+        render_notice("증액거부", "홍길동", {"requested_increase": 5, "legal_limit": 500})
+
+
+def test_missing_fields():
+    assert missing_fields("수리요청", {"repair_items": [], "urgency": "높음"}) == ["repair_items"]
+    with pytest.raises(ValueError, match="repair_items"):
+        render_notice("수리요청", "홍길동", {"urgency": "높음"})
+
+
+@pytest.mark.parametrize("language", ["EN", "VI", "ZH"])
+def test_non_korean_uses_english_template(language):
+    notice = render_notice(
+        "수리요청",
+        "Nguyen",
+        {"repair_items": ["보일러", "창문"], "urgency": "high", "address": "서울시 마포구"},
+        language=language,
+        issued_on=ISSUED_ON
+    )
+    assert notice.startswith("[Request for Repairs]")
+    assert "Items: 보일러, 창문" in notice
+    assert "Property: 서울시 마포구" in notice
+    assert NOTICE_TYPES["수리요청"]["legal_basis_en"] in notice
+    assert "민법" not in notice
+
+
+def test_every_notice_type_has_english_legal_basis():
+    for template in NOTICE_TYPES.values():
+        assert template["legal_basis_en"]
@@ -0,0 +1,110 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.rag.vector_index import VectorIndex
+
+
+def _vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+def _fill(index, n, dim=8):
+    ids = [f"doc{i}" for i in range(n)]
+    index.upsert(
+        ids=ids,
+        embeddings=_vectors(n, dim).tolist(),
+        metadatas=[{"n": i} for i in range(n)],
+        documents=[f"text {i}" for i in ids]
+    )
+    return ids
+
+
+def test_reload_replays_log(tmp_path):
+    index = VectorIndex(str(tmp_path))
+    _fill(index, 10)
+    # 스냅샷 이후의 쓰기는 로그에만 남음
+    index.upsert(ids=["doc0"], embeddings=_vectors(1, seed=1).tolist(), metadatas=[{"n": 100}], documents=["new"])
+    index.update(ids=["doc1"], metadatas=[{"n": 101}])
+    index.delete(ids=["doc2"])
+    assert (tmp_path / "index.log").stat().st_size > 0
+
+    reloaded = VectorIndex(str(tmp_path))
+    assert reloaded.count() == 9
+    assert reloaded.get(ids=["doc0", "doc1", "doc2"]) == {
+        "ids": ["doc0", "doc1"],
+        "documents": ["new", "text doc1"],
+        "metadatas": [{"n": 100}, {"n": 101}],
+    }
+    query = _vectors(1, seed=1).tolist()
+    assert reloaded.query(query, n_results=1)["ids"] == [["doc0"]]
+
+
+def test_reload_skips_torn_log_line(tmp_path):
+    index = VectorIndex(str(tmp_path))
+    _fill(index, 4)
+    index.delete(ids=["doc0"])
+    # 쓰는 도중 끊긴 로그 항목
+    with open(tmp_path / "index.log", "a", encoding="utf-8") as f:
+        f.write('{"op": "delete", "ids": ["doc1"')
+
+    reloaded = VectorIndex(str(tmp_path))
+    assert sorted(reloaded.get()["ids"]) == ["doc1", "doc2", "doc3"]
+
+    # 다음 항목은 깨진 줄 뒤 새 줄에 기록되어 읽힘
+    reloaded.delete(ids=["doc3"])
+    assert sorted(VectorIndex(str(tmp_path)).get()["ids"]) == ["doc1", "doc2"]
+
+
+def test_compaction_rewrites_matrix_and_ignores_old_log(tmp_path):
+    index = VectorIndex(str(tmp_path))
+    ids = _fill(index, 200)
+    epoch = json.loads((tmp_path / "index.json").read_text())["epoch"]
+
+    deleted = ids[:100]
+    index.delete(ids=deleted)
+
+    meta = json.loads((tmp_path / "index.json").read_text())
+    assert meta["epoch"] > epoch
+    assert meta["ids"] == ids[100:]
+    assert meta["matrix"] != "vectors.bin"
+    assert not (tmp_path / "vectors.bin").exists()
+    assert (tmp_path / "index.log").stat().st_size == 0
+
+    # 압축 전 세대의 로그 항목이 남아 있어도 무시
+    with open(tmp_path / "index.log", "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "delete", "ids": ids[100:150], "epoch": epoch}) + "\n")
+
+    reloaded = VectorIndex(str(tmp_path))
+    assert reloaded.count() == 100
+    vectors = _vectors(200)
+    assert reloaded.query([vectors[150].tolist()], n_results=1)["ids"] == [["doc150"]]
+    assert reloaded.get(ids=["doc150"])["metadatas"] == [{"n": 150}]
+    assert reloaded.query([vectors[10].tolist()], n_results=5)["ids"][0][0] not in deleted
+
+
+def test_loads_legacy_snapshot_without_epoch(tmp_path):
+    index = VectorIndex(str(tmp_path))
+    _fill(index, 5)
+    meta_path = tmp_path / "index.json"
+    meta = json.loads(meta_path.read_text())
+    del meta["epoch"], meta["matrix"]
+    meta_path.write_text(json.dumps(meta))
+
+    reloaded = VectorIndex(str(tmp_path))
+    assert reloaded.count() == 5
+    assert reloaded.query([_vectors(5)[3].tolist()], n_results=1)["ids"] == [["doc3"]]
+
+    reloaded.delete(ids=["doc3"])
+    assert VectorIndex(str(tmp_path)).count() == 4
+
+
+def test_where_filter_and_dimension_check():
+    index = VectorIndex()
+    _fill(index, 6)
+    result = index.query(_vectors(1, seed=5).tolist(), n_results=10, where={"n": {"$gte": 4}})
+    assert sorted(result["ids"][0]) == ["doc4", "doc5"]
+
+    with pytest.raises(ValueError):
+        index.upsert(ids=["bad"], embeddings=[[1.0, 0.0]])